@@ -4,21 +4,37 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 import logging
+import multiprocessing
+import os
+import re
 import sys
 from pathlib import Path
+from typing import Any, TextIO
 
 import click
 
+from opossum_lib.core.entities.ingest_filter import IngestFilter
 from opossum_lib.core.services.generate_impl import (
+    check_generate_options,
     generate_impl,
 )
 from opossum_lib.core.services.input_reader import InputReader
+from opossum_lib.core.services.patch_impl import patch_impl
+from opossum_lib.daemon import GenerateJob
+from opossum_lib.daemon import serve as serve_impl
+from opossum_lib.daemon import submit as submit_impl
+from opossum_lib.input_formats.opossum.services.diff_opossum_files import (
+    diff_opossum_files,
+)
 from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
     OpossumFileReader,
 )
 from opossum_lib.input_formats.scancode.services.scancode_file_reader import (
     ScancodeFileReader,
 )
+from opossum_lib.shared.constants import INDEX_DB_NAME
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+from opossum_lib.shared.services.validate_model import DEFAULT_SAMPLE_PERCENTAGE
 
 
 @click.group()
@@ -26,22 +42,41 @@ def opossum_file() -> None:
     pass
 
 
+class ByteSize(click.ParamType):
+    name = "size"
+    units = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+    def convert(
+        self, value: Any, param: click.Parameter | None, ctx: click.Context | None
+    ) -> int:
+        if isinstance(value, int):
+            return value
+        match = re.fullmatch(r"\s*(\d+)\s*([KMGT]?)i?B?\s*", str(value).upper())
+        if match is None:
+            self.fail(f"{value!r} is not a valid size like 512M or 2G.", param, ctx)
+        number, unit = match.groups()
+        return int(number) * self.units[unit]
+
+
 @opossum_file.command()
 @click.option(
     "--opossum",
     "opossum_files",
     help="Specify a path to a .opossum file that you would like to "
-    + "include in the final output. Option can be repeated.",
+    + "include in the final output. Use - to read from standard input. "
+    + "Option can be repeated.",
     multiple=True,
-    type=click.Path(exists=True),
+    type=click.Path(exists=True, allow_dash=True),
 )
 @click.option(
     "--scan-code-json",
     "scancode_json_files",
     help="Specify a path to a .json file generated by ScanCode that you would like to "
-    + "include in the final output. Option can be repeated.",
+    + "include in the final output. Files in the JSON Lines format (--json-lines) "
+    + "and files compressed with gzip, bzip2 or xz are detected automatically. "
+    + "Use - to read from standard input. Option can be repeated.",
     multiple=True,
-    type=click.Path(exists=True),
+    type=click.Path(exists=True, allow_dash=True),
 )
 @click.option(
     "--outfile",
@@ -50,12 +85,158 @@ def opossum_file() -> None:
     show_default=True,
     help="The file path to write the generated opossum document to. "
     'If appropriate, the extension ".opossum" is appended. '
-    "If the output file already exists, it is overwritten.",
+    "If the output file already exists, it is replaced once the new file has "
+    "been written completely. Use - to write to standard output.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of workers used for the conversion and for compressing the "
+    "output. The result does not depend on the number of workers.",
+)
+@click.option(
+    "--mmap",
+    "use_mmap",
+    is_flag=True,
+    help="Memory-map .opossum input files and decompress their entries "
+    "directly from the mapped file instead of using buffered reads.",
+)
+@click.option(
+    "--skip-unchanged",
+    is_flag=True,
+    help="Do not rewrite the output file if it already has the same content.",
+)
+@click.option(
+    "--max-memory",
+    type=ByteSize(),
+    help="Convert the input as a stream of resources without building the "
+    "resource tree and move the resource paths and attributions to a temporary "
+    "file on disk once they exceed the given size, e.g. 512M or 2G. Lowers the "
+    "peak memory usage for large scans. Without this option, the complete "
+    "resource tree is built in memory. --hoist-attributions still builds the "
+    "tree. Cannot be combined with --skip-unchanged, --with-index or sharding.",
+)
+@click.option(
+    "--with-index",
+    is_flag=True,
+    help=f"Add an sqlite database '{INDEX_DB_NAME}' to the output that indexes "
+    "the resources and attributions for queries without parsing the whole file.",
+)
+@click.option(
+    "--shard",
+    is_flag=True,
+    help="Write one .opossum file per top-level directory instead of a single "
+    "file. The files are named like the outfile with a number appended and are "
+    "listed in a manifest (<outfile>.manifest.json). Attribution ids are "
+    "consistent across all files.",
+)
+@click.option(
+    "--shard-max-nodes",
+    type=click.IntRange(min=1),
+    help="Like --shard, but split directories and combine small ones so that "
+    "each file contains at most this number of resources where possible.",
+)
+@click.option(
+    "--validation",
+    type=click.Choice([policy.value for policy in ValidationPolicy]),
+    default=ValidationPolicy.FULL.value,
+    show_default=True,
+    help="How the resources and their assigned attributions in .opossum files "
+    "are validated. 'sample' only validates a random share of them, 'trusted' "
+    "skips their validation. Use 'trusted' only for inputs written by trusted "
+    "tools, as invalid inputs can lead to errors or invalid output files. "
+    "ScanCode files are always validated completely.",
+)
+@click.option(
+    "--sample-percentage",
+    default=DEFAULT_SAMPLE_PERCENTAGE,
+    show_default=True,
+    type=click.FloatRange(min=0, max=100),
+    help="Percentage of the resources and their assigned attributions that are "
+    "validated with --validation sample.",
+)
+@click.option(
+    "--deduplicate",
+    is_flag=True,
+    help="Convert ScanCode files with the same content hash and license "
+    "detections only once and share their attributions. Speeds up scans with "
+    "many vendored copies of the same files.",
+)
+@click.option(
+    "--hoist-attributions",
+    "hoist",
+    is_flag=True,
+    help="Move attributions that all children of a folder have in common to the "
+    "folder. This shrinks the output for scans with many identically attributed "
+    "files. Attribution breakpoints are respected.",
+)
+@click.option(
+    "--compact-ids",
+    is_flag=True,
+    help="Renumber the attributions with short ids instead of UUIDs to shrink "
+    "large outputs. The ids follow the order of the resources and the review "
+    "results are updated accordingly.",
+)
+@click.option(
+    "--include",
+    "include_paths",
+    multiple=True,
+    metavar="GLOB",
+    help="Only read resources whose path or one of its folders matches the "
+    "pattern, e.g. 'project/src/**'. Paths are matched without leading slash "
+    "and ** matches any number of folders. Option can be repeated.",
+)
+@click.option(
+    "--exclude",
+    "exclude_paths",
+    multiple=True,
+    metavar="GLOB",
+    help="Do not read resources whose path or one of its folders matches the "
+    "pattern, e.g. '**/node_modules/**/test/**'. Option can be repeated.",
+)
+@click.option(
+    "--min-score",
+    type=click.FloatRange(min=0, max=100),
+    help="Do not read attributions with a lower ScanCode match score, i.e. "
+    "attribution confidence.",
+)
+@click.option(
+    "--allow-license",
+    "allowed_licenses",
+    multiple=True,
+    help="Only read attributions with this license expression. Option can be repeated.",
+)
+@click.option(
+    "--deny-license",
+    "denied_licenses",
+    multiple=True,
+    help="Do not read attributions with this license expression. Option can be "
+    "repeated.",
 )
 def generate(
     scancode_json_files: list[Path],
     opossum_files: list[Path],
     outfile: Path,
+    workers: int,
+    use_mmap: bool,
+    skip_unchanged: bool,
+    max_memory: int | None,
+    with_index: bool,
+    shard: bool,
+    shard_max_nodes: int | None,
+    validation: str,
+    sample_percentage: float,
+    deduplicate: bool,
+    hoist: bool,
+    compact_ids: bool,
+    include_paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    min_score: float | None,
+    allowed_licenses: tuple[str, ...],
+    denied_licenses: tuple[str, ...],
 ) -> None:
     """
     Generate an Opossum file from various other file formats.
@@ -73,12 +254,412 @@ def generate(
     if total_number_of_files > 1:
         logging.error("Merging of multiple files not yet supported!")
         sys.exit(1)
+    options_error = check_generate_options(
+        Path(outfile),
+        skip_unchanged=skip_unchanged,
+        max_memory=max_memory,
+        with_index=with_index,
+        shard=shard,
+        shard_max_nodes=shard_max_nodes,
+        validation=ValidationPolicy(validation),
+        has_scancode_input=bool(scancode_json_files),
+    )
+    if options_error is not None:
+        logging.error(options_error)
+        sys.exit(1)
+    validation_policy = ValidationPolicy(validation)
+    active_ingest_filter = _create_ingest_filter(
+        include_paths, exclude_paths, min_score, allowed_licenses, denied_licenses
+    )
     input_readers: list[InputReader] = []
-    input_readers += [ScancodeFileReader(path=path) for path in scancode_json_files]
-    input_readers += [OpossumFileReader(path=path) for path in opossum_files]
+    input_readers += [
+        ScancodeFileReader(
+            path=path,
+            workers=workers,
+            deduplicate=deduplicate,
+            ingest_filter=active_ingest_filter,
+        )
+        for path in scancode_json_files
+    ]
+    input_readers += [
+        OpossumFileReader(
+            path=path,
+            use_mmap=use_mmap,
+            validation=validation_policy,
+            sample_percentage=sample_percentage,
+            ingest_filter=active_ingest_filter,
+        )
+        for path in opossum_files
+    ]
 
-    generate_impl(input_readers=input_readers, output_file=Path(outfile))
+    generate_impl(
+        input_readers=input_readers,
+        output_file=Path(outfile),
+        workers=workers,
+        skip_unchanged=skip_unchanged,
+        max_memory=max_memory,
+        with_index=with_index,
+        shard=shard,
+        shard_max_nodes=shard_max_nodes,
+        hoist=hoist,
+        compact_ids=compact_ids,
+    )
 
 
-if __name__ == "__main__":
+def _create_ingest_filter(
+    include_paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    min_score: float | None,
+    allowed_licenses: tuple[str, ...],
+    denied_licenses: tuple[str, ...],
+) -> IngestFilter | None:
+    # None if the options do not filter anything
+    ingest_filter = IngestFilter(
+        include_paths=include_paths,
+        exclude_paths=exclude_paths,
+        min_score=min_score,
+        allowed_licenses=allowed_licenses,
+        denied_licenses=denied_licenses,
+    )
+    return ingest_filter if ingest_filter.is_active else None
+
+
+@opossum_file.command()
+@click.option(
+    "--opossum",
+    "opossum_file_path",
+    help="Specify a path to the existing .opossum file that should be updated.",
+    required=True,
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--scan-code-json",
+    "scancode_json_file",
+    help="Specify a path to a .json file generated by ScanCode that only contains "
+    + "the changed and added files.",
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--deleted-paths",
+    help="Specify a path to a text file listing the deleted files and folders, "
+    + "one path per line.",
+    type=click.File("r"),
+)
+@click.option(
+    "--outfile",
+    "-o",
+    help="The file path to write the updated opossum document to. "
+    'If appropriate, the extension ".opossum" is appended. '
+    "By default, the existing .opossum file is overwritten. The output file "
+    "is replaced atomically, so it keeps its previous content if the update "
+    "fails.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of workers used for the conversion and for compressing the output.",
+)
+def patch(
+    opossum_file_path: Path,
+    scancode_json_file: Path | None,
+    deleted_paths: TextIO | None,
+    outfile: Path | None,
+    workers: int,
+) -> None:
+    """
+    Update an Opossum file with a partial ScanCode scan.
+
+    Resources of the changed files replace the existing ones, deleted paths are
+    removed. All other resources and the review results are kept.
+    """
+    if scancode_json_file is None and deleted_paths is None:
+        logging.warning("No changes provided. Exiting.")
+        sys.exit(1)
+    changes_reader = None
+    if scancode_json_file is not None:
+        changes_reader = ScancodeFileReader(path=scancode_json_file, workers=workers)
+    patch_impl(
+        base_reader=OpossumFileReader(path=opossum_file_path),
+        changes_reader=changes_reader,
+        deleted_paths=deleted_paths.readlines() if deleted_paths else [],
+        output_file=Path(outfile or opossum_file_path),
+        workers=workers,
+    )
+
+
+@opossum_file.command("compact-ids")
+@click.option(
+    "--opossum",
+    "opossum_file_path",
+    help="Specify a path to the .opossum file whose ids should be compacted.",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--outfile",
+    "-o",
+    default="output.opossum",
+    show_default=True,
+    help="The file path to write the compacted opossum document to. "
+    'If appropriate, the extension ".opossum" is appended. '
+    "If the output file already exists, it is overwritten.",
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of workers used for compressing the output.",
+)
+def compact_ids(opossum_file_path: Path, outfile: Path, workers: int) -> None:
+    """
+    Renumber the attributions of an Opossum file with short ids.
+
+    Replaces the ids of the attributions, which are usually UUIDs, with short
+    ids in the order of the resources. The references in the review results are
+    updated accordingly. Equal to generate --opossum with --compact-ids.
+    """
+    generate_impl(
+        input_readers=[OpossumFileReader(path=Path(opossum_file_path))],
+        output_file=Path(outfile),
+        workers=workers,
+        compact_ids=True,
+    )
+
+
+@opossum_file.command()
+@click.option(
+    "--old",
+    "old_path",
+    help="Specify a path to the earlier .opossum file.",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--new",
+    "new_path",
+    help="Specify a path to the later .opossum file.",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--outfile",
+    "-o",
+    default="-",
+    show_default=True,
+    type=click.File("w"),
+    help="The file to write the report to. By default, it is written to stdout.",
+)
+def diff(old_path: str, new_path: str, outfile: TextIO) -> None:
+    """
+    Compare the scan results of two Opossum files.
+
+    Writes a JSON line for every added or removed attribution and for every
+    added, removed or changed resource. Attributions are identified by a hash
+    of their content, as the ids in the files are arbitrary. Resources are
+    changed if their type or their attributions differ.
+    """
+    for entry in diff_opossum_files(Path(old_path), Path(new_path)):
+        outfile.write(
+            entry.model_dump_json(by_alias=True, exclude_defaults=True) + "\n"
+        )
+
+
+@opossum_file.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    help="Listen for jobs on this Unix socket instead of reading them from stdin.",
+    type=click.Path(dir_okay=False),
+)
+@click.option(
+    "--workers",
+    "-w",
+    default=os.cpu_count() or 1,
+    show_default="number of CPUs",
+    type=click.IntRange(min=1),
+    help="Number of jobs that are converted in parallel.",
+)
+def serve(socket_path: Path | None, workers: int) -> None:
+    """
+    Run a server that converts submitted generate jobs.
+
+    The server keeps a pool of workers alive, so the startup costs are only
+    paid once instead of once per file.
+
+    Each job is a line with a JSON object with the fields opossum_files,
+    scancode_json_files and outfile and optionally id and the options of
+    generate (use_mmap, skip_unchanged, max_memory, with_index, shard,
+    shard_max_nodes, validation, sample_percentage, deduplicate, hoist and
+    compact_ids) as
+    well as ingest_filter, an object with the fields include_paths,
+    exclude_paths, min_score, allowed_licenses and denied_licenses.
+    For every job a JSON line with the id and the outfile or an error is
+    written.
+    """
+    serve_impl(Path(socket_path) if socket_path else None, workers)
+
+
+@opossum_file.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    help="The Unix socket of a running 'opossum-file serve --socket'.",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--opossum",
+    "opossum_files",
+    help="Specify a path to a .opossum file that should be converted.",
+    multiple=True,
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--scan-code-json",
+    "scancode_json_files",
+    help="Specify a path to a .json file generated by ScanCode that should be "
+    + "converted.",
+    multiple=True,
+    type=click.Path(exists=True),
+)
+@click.option(
+    "--outfile",
+    "-o",
+    default="output.opossum",
+    show_default=True,
+    help="The file path to write the generated opossum document to.",
+)
+@click.option("--mmap", "use_mmap", is_flag=True, help="See generate --mmap.")
+@click.option("--skip-unchanged", is_flag=True, help="See generate --skip-unchanged.")
+@click.option("--max-memory", type=ByteSize(), help="See generate --max-memory.")
+@click.option("--with-index", is_flag=True, help="See generate --with-index.")
+@click.option("--shard", is_flag=True, help="See generate --shard.")
+@click.option(
+    "--shard-max-nodes",
+    type=click.IntRange(min=1),
+    help="See generate --shard-max-nodes.",
+)
+@click.option(
+    "--validation",
+    type=click.Choice([policy.value for policy in ValidationPolicy]),
+    default=ValidationPolicy.FULL.value,
+    show_default=True,
+    help="See generate --validation.",
+)
+@click.option(
+    "--sample-percentage",
+    default=DEFAULT_SAMPLE_PERCENTAGE,
+    show_default=True,
+    type=click.FloatRange(min=0, max=100),
+    help="See generate --sample-percentage.",
+)
+@click.option("--deduplicate", is_flag=True, help="See generate --deduplicate.")
+@click.option(
+    "--hoist-attributions",
+    "hoist",
+    is_flag=True,
+    help="See generate --hoist-attributions.",
+)
+@click.option("--compact-ids", is_flag=True, help="See generate --compact-ids.")
+@click.option(
+    "--include",
+    "include_paths",
+    multiple=True,
+    metavar="GLOB",
+    help="See generate --include.",
+)
+@click.option(
+    "--exclude",
+    "exclude_paths",
+    multiple=True,
+    metavar="GLOB",
+    help="See generate --exclude.",
+)
+@click.option(
+    "--min-score",
+    type=click.FloatRange(min=0, max=100),
+    help="See generate --min-score.",
+)
+@click.option(
+    "--allow-license",
+    "allowed_licenses",
+    multiple=True,
+    help="See generate --allow-license.",
+)
+@click.option(
+    "--deny-license",
+    "denied_licenses",
+    multiple=True,
+    help="See generate --deny-license.",
+)
+def submit(
+    socket_path: Path,
+    opossum_files: list[str],
+    scancode_json_files: list[str],
+    outfile: str,
+    use_mmap: bool,
+    skip_unchanged: bool,
+    max_memory: int | None,
+    with_index: bool,
+    shard: bool,
+    shard_max_nodes: int | None,
+    validation: str,
+    sample_percentage: float,
+    deduplicate: bool,
+    hoist: bool,
+    compact_ids: bool,
+    include_paths: tuple[str, ...],
+    exclude_paths: tuple[str, ...],
+    min_score: float | None,
+    allowed_licenses: tuple[str, ...],
+    denied_licenses: tuple[str, ...],
+) -> None:
+    """
+    Submit a generate job to a running server.
+
+    Waits for the job to finish and prints the path of the output file.
+    """
+    # the server may run in a different working directory
+    job = GenerateJob(
+        opossum_files=[str(Path(path).absolute()) for path in opossum_files],
+        scancode_json_files=[
+            str(Path(path).absolute()) for path in scancode_json_files
+        ],
+        outfile=str(Path(outfile).absolute()),
+        use_mmap=use_mmap,
+        skip_unchanged=skip_unchanged,
+        max_memory=max_memory,
+        with_index=with_index,
+        shard=shard,
+        shard_max_nodes=shard_max_nodes,
+        validation=ValidationPolicy(validation),
+        sample_percentage=sample_percentage,
+        deduplicate=deduplicate,
+        hoist=hoist,
+        compact_ids=compact_ids,
+        ingest_filter=_create_ingest_filter(
+            include_paths, exclude_paths, min_score, allowed_licenses, denied_licenses
+        ),
+    )
+    result = submit_impl(Path(socket_path), job)
+    if result.error is not None:
+        logging.error(result.error)
+        sys.exit(1)
+    click.echo(result.outfile)
+
+
+def main() -> None:
+    # Required for worker processes in frozen executables. It has to run
+    # before the arguments are parsed, as worker processes are started with
+    # their own arguments.
+    multiprocessing.freeze_support()
     opossum_file()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from pathlib import PurePath
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from opossum_lib.shared.entities.cached_value import CachedValue
+
+
+class IngestFilter(BaseModel):
+    # Selects the resources and attributions that are read from the inputs.
+    # The readers apply it before creating resources and packages, so the
+    # excluded data is never converted.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    # Glob patterns like **/node_modules/**/test/** for the paths of the
+    # resources without leading slash. A resource is excluded if it or one of
+    # its folders matches an exclude pattern or, if there are include
+    # patterns, neither it nor one of its folders matches an include pattern.
+    # Patterns ending with /** also match the folder itself.
+    include_paths: tuple[str, ...] = ()
+    exclude_paths: tuple[str, ...] = ()
+    # attributions with a lower confidence, i.e. ScanCode match score
+    min_score: float | None = None
+    # license expressions of the attributions that are kept or dropped
+    allowed_licenses: tuple[str, ...] = ()
+    denied_licenses: tuple[str, ...] = ()
+
+    # results for the folders, which are shared by many paths
+    _folder_matches: CachedValue[dict[tuple[bool, PurePath], bool]] = PrivateAttr(
+        default_factory=CachedValue
+    )
+
+    @property
+    def is_active(self) -> bool:
+        return self.filters_paths or self.filters_attributions
+
+    @property
+    def filters_paths(self) -> bool:
+        return bool(self.include_paths or self.exclude_paths)
+
+    @property
+    def filters_attributions(self) -> bool:
+        return bool(
+            self.min_score is not None or self.allowed_licenses or self.denied_licenses
+        )
+
+    def includes_path(self, path: PurePath | str) -> bool:
+        return not self.matches_exclude_paths(path) and self.matches_include_paths(path)
+
+    def matches_exclude_paths(self, path: PurePath | str) -> bool:
+        if not self.exclude_paths:
+            return False
+        return self._matches(PurePath(str(path).strip("/")), exclude=True)
+
+    def matches_include_paths(self, path: PurePath | str) -> bool:
+        # also true without include patterns
+        if not self.include_paths:
+            return True
+        return self._matches(PurePath(str(path).strip("/")), exclude=False)
+
+    def includes_attribution(
+        self, license_name: str | None, score: float | None
+    ) -> bool:
+        if self.min_score is not None and score is not None and score < self.min_score:
+            return False
+        if self.allowed_licenses and license_name not in self.allowed_licenses:
+            return False
+        return license_name not in self.denied_licenses
+
+    def _matches(self, path: PurePath, exclude: bool) -> bool:
+        # whether the path or one of its folders matches, the folders are
+        # resolved from the top and cached
+        cache = self._folder_matches.get(None, dict)
+        unresolved = []
+        folder = path.parent
+        while folder.parts and (exclude, folder) not in cache:
+            unresolved.append(folder)
+            folder = folder.parent
+        matches = cache.get((exclude, folder), False)
+        for folder in reversed(unresolved):
+            matches = matches or self._matches_directly(folder, exclude)
+            cache[exclude, folder] = matches
+        return matches or self._matches_directly(path, exclude)
+
+    def _matches_directly(self, path: PurePath, exclude: bool) -> bool:
+        patterns = self.exclude_paths if exclude else self.include_paths
+        return any(
+            path.full_match(pattern)
+            or (pattern.endswith("/**") and path.full_match(pattern[:-3]))
+            for pattern in patterns
+        )
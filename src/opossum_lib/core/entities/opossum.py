@@ -9,6 +9,10 @@ from pydantic import BaseModel, ConfigDict
 from opossum_lib.core.entities.scan_results import ScanResults
 from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
 from opossum_lib.shared.entities.opossum_output_file_model import OpossumOutputFileModel
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+from opossum_lib.shared.services.compact_attribution_ids import compact_output_file_ids
 
 type OpossumPackageIdentifier = str
 type ResourcePath = str
@@ -17,10 +21,37 @@ type ResourcePath = str
 class Opossum(BaseModel):
     model_config = ConfigDict(frozen=True, extra="forbid")
     scan_results: ScanResults
-    review_results: OpossumOutputFileModel | None = None
+    review_results: OpossumOutputFileModel | RawOpossumOutputFileModel | None = None
 
-    def to_opossum_file_model(self) -> OpossumFileModel:
+    def to_opossum_file_model(self, compact_ids: bool = False) -> OpossumFileModel:
+        if compact_ids:
+            return self.with_compact_ids().to_opossum_file_model()
         return OpossumFileModel(
             input_file=self.scan_results.to_opossum_file_model(),
             output_file=self.review_results,
         )
+
+    def with_compact_ids(self) -> Opossum:
+        # renumbers the attributions of the scan results and rewrites the
+        # references of the review results accordingly
+        scan_results = self.scan_results.with_compact_ids()
+        review_results = self.review_results
+        if review_results is not None:
+            review_results = compact_output_file_ids(
+                review_results,
+                renumbered_attribution_ids(self.scan_results, scan_results),
+                first_manual_number=len(scan_results.attribution_to_id),
+            )
+        return Opossum(scan_results=scan_results, review_results=review_results)
+
+
+def renumbered_attribution_ids(
+    original: ScanResults, renumbered: ScanResults
+) -> dict[str, str]:
+    # the new id for every original id, attributions without an original id
+    # are skipped
+    return {
+        original.attribution_to_id[attribution]: id
+        for attribution, id in renumbered.attribution_to_id.items()
+        if attribution in original.attribution_to_id
+    }
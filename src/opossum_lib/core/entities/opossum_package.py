@@ -4,11 +4,13 @@
 
 from __future__ import annotations
 
+import hashlib
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from opossum_lib.core.entities.source_info import SourceInfo
+from opossum_lib.shared.entities.cached_value import CachedValue
 from opossum_lib.shared.entities.opossum_input_file_model import OpossumPackageModel
 
 
@@ -35,6 +37,14 @@ class OpossumPackage(BaseModel):
     criticality: Literal["high"] | Literal["medium"] | None = None
     was_preferred: bool | None = None
 
+    _digest: CachedValue[bytes] = PrivateAttr(default_factory=CachedValue)
+
+    def content_digest(self) -> bytes:
+        # identifies the content of this package, which cannot change
+        return self._digest.get(
+            None, lambda: hashlib.sha256(self.model_dump_json().encode()).digest()
+        )
+
     def to_opossum_file_model(self) -> OpossumPackageModel:
         return OpossumPackageModel(
             source=self.source.to_opossum_file_model(),
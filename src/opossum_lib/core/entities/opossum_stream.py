@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import PurePath
+
+from pydantic import BaseModel, ConfigDict
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.shared.entities.opossum_output_file_model import OpossumOutputFileModel
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+
+
+class OpossumStream(BaseModel):
+    # An Opossum whose resources are produced one after the other instead of
+    # being kept as a tree. The scan results hold everything except the
+    # resources, e.g. the metadata and the unassigned attributions, which are
+    # complete once the resources are exhausted.
+    # Each resource is a single path with its attributions but without
+    # children. Every path occurs at most once, but the folders of a path may
+    # be missing or come after it, and are then created as plain folders.
+    # The resources can only be iterated once.
+    model_config = ConfigDict(frozen=True, extra="forbid", arbitrary_types_allowed=True)
+    scan_results: ScanResults
+    resources: Iterator[Resource]
+    review_results: OpossumOutputFileModel | RawOpossumOutputFileModel | None = None
+
+    @classmethod
+    def from_opossum(cls, opossum: Opossum) -> OpossumStream:
+        return cls(
+            scan_results=opossum.scan_results.model_copy(update={"resources": []}),
+            resources=_flatten(opossum.scan_results.resources),
+            review_results=opossum.review_results,
+        )
+
+    def collect(self) -> Opossum:
+        # builds the tree of all resources
+        roots: dict[str, Resource] = {}
+        resources_by_path: dict[PurePath, Resource] = {}
+
+        def get_or_create(path: PurePath) -> Resource:
+            # the missing folders are created from the top
+            missing = []
+            while path not in resources_by_path and path.parts:
+                missing.append(path)
+                path = path.parent
+            for missing_path in reversed(missing):
+                resource = Resource(path=missing_path, type=ResourceType.FOLDER)
+                if len(missing_path.parts) == 1:
+                    roots[missing_path.name] = resource
+                else:
+                    parent = resources_by_path[missing_path.parent]
+                    parent.children[missing_path.name] = resource
+                resources_by_path[missing_path] = resource
+            return resources_by_path[missing[0] if missing else path]
+
+        for flat_resource in self.resources:
+            resource = get_or_create(flat_resource.path)
+            resource.type = flat_resource.type
+            resource.attributions = flat_resource.attributions
+        return Opossum(
+            scan_results=self.scan_results.model_copy(
+                update={"resources": list(roots.values())}
+            ),
+            review_results=self.review_results,
+        )
+
+
+def _flatten(resources: list[Resource]) -> Iterator[Resource]:
+    # in the order of the tree, i.e. folders before their children
+    stack = list(reversed(resources))
+    while stack:
+        resource = stack.pop()
+        yield Resource(
+            path=resource.path,
+            type=resource.type,
+            attributions=resource.attributions,
+        )
+        stack.extend(reversed(resource.children.values()))
@@ -5,17 +5,21 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+import hashlib
+from collections.abc import Callable, Iterable
 from enum import Enum, auto
+from functools import wraps
 from pathlib import PurePath
+from typing import Any, SupportsIndex
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.shared.entities.cached_value import CachedValue
 from opossum_lib.shared.entities.opossum_input_file_model import ResourceInFileModel
 
 
-def _convert_path_to_str(path: PurePath) -> str:
+def convert_path_to_str(path: PurePath) -> str:
     return str(path).replace("\\", "/")
 
 
@@ -24,6 +28,71 @@ class ResourceType(Enum):
     FOLDER = auto()
 
 
+# the fields that make up the content of a resource and its digest
+CONTENT_FIELDS = ("type", "attributions", "children")
+
+
+class _TrackedList[T](list[T]):
+    # The attributions of a resource, which mark the resource as modified when
+    # they are changed in place. Copies do not belong to any resource until
+    # their resource computes its digest.
+    resource: Resource | None = None
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple[Any, ...]:
+        return type(self), (list(self),)
+
+
+class _TrackedDict[K, V](dict[K, V]):
+    # the children of a resource, like _TrackedList
+    resource: Resource | None = None
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple[Any, ...]:
+        return type(self), (dict(self),)
+
+
+def _marking_modified(method: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(method)
+    def wrapper(
+        self: _TrackedList[Any] | _TrackedDict[Any, Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        result = method(self, *args, **kwargs)
+        if self.resource is not None:
+            self.resource.mark_modified()
+        return result
+
+    return wrapper
+
+
+_LIST_MODIFIERS = (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+)
+_DICT_MODIFIERS = (
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "clear",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+)
+for _name in _LIST_MODIFIERS:
+    setattr(_TrackedList, _name, _marking_modified(getattr(list, _name)))
+for _name in _DICT_MODIFIERS:
+    setattr(_TrackedDict, _name, _marking_modified(getattr(dict, _name)))
+
+
 class Resource(BaseModel):
     model_config = ConfigDict(frozen=False, extra="forbid")
     path: PurePath
@@ -31,10 +100,102 @@ class Resource(BaseModel):
     attributions: list[OpossumPackage] = []
     children: dict[str, Resource] = {}
 
+    # Digest of the type, the attributions and the named children of this
+    # resource, but not of its own path. It is cleared together with the
+    # digests of all ancestors when the resource is modified, so a resource
+    # with digest only has descendants with digest.
+    _digest: CachedValue[bytes] = PrivateAttr(default_factory=CachedValue)
+    # The parent the resource was last added to or seen under while computing
+    # digests, only used to clear the digests of the ancestors.
+    _parent: CachedValue[Resource] = PrivateAttr(default_factory=CachedValue)
+
+    def model_post_init(self, context: Any) -> None:
+        # the validated containers are not referenced elsewhere yet
+        for name in ("attributions", "children"):
+            self.__dict__[name] = self._tracked(name, self.__dict__[name])
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ("attributions", "children"):
+            value = self._tracked(name, value)
+        super().__setattr__(name, value)
+        if name in CONTENT_FIELDS:
+            self.mark_modified()
+
+    def _tracked(self, name: str, value: Any) -> Any:
+        # a copy of the attributions or children that belongs to this resource
+        tracked = _TrackedDict(value) if name == "children" else _TrackedList(value)
+        tracked.resource = self
+        return tracked
+
+    def _track_content(self) -> None:
+        # Resources with digest need to be told about in-place changes of their
+        # content. This is not the case for copies or resources that are not
+        # validated, whose containers are taken over or replaced here.
+        for name in ("attributions", "children"):
+            value = getattr(self, name)
+            if isinstance(value, _TrackedList | _TrackedDict) and (
+                value.resource is None or value.resource is self
+            ):
+                value.resource = self
+            else:
+                self.__dict__[name] = self._tracked(name, value)
+
+    def mark_modified(self) -> None:
+        # Called when the type, the attributions or the children of this
+        # resource are assigned or changed in place.
+        # Ancestors without digest have no ancestors with digest either.
+        self._digest.clear()
+        parent = self._parent.peek(None)
+        while parent is not None and parent._digest.peek(None) is not None:
+            parent._digest.clear()
+            parent = parent._parent.peek(None)
+
+    def subtree_digest(self) -> bytes:
+        # computed bottom-up without recursion, reusing the cached digests
+        stack: list[tuple[Resource, bool]] = [(self, False)]
+        while stack:
+            resource, children_done = stack.pop()
+            if resource._digest.peek(None) is not None:
+                continue
+            if children_done:
+                resource._digest.get(None, resource._compute_digest)
+            else:
+                stack.append((resource, True))
+                for child in resource.children.values():
+                    child._parent.set(None, resource)
+                    stack.append((child, False))
+        return self._digest.get(None, self._compute_digest)
+
+    def _compute_digest(self) -> bytes:
+        self._track_content()
+        digest = hashlib.sha256()
+        digest.update(f"{self.type.name if self.type else None}\n".encode())
+        # the order of the attributions does not matter
+        for attribution_digest in sorted(
+            attribution.content_digest() for attribution in self.attributions
+        ):
+            digest.update(attribution_digest)
+        for name, child in sorted(self.children.items()):
+            digest.update(f"\n{name}\0".encode())
+            digest.update(child._digest.get(None, child._compute_digest))
+        return digest.digest()
+
+    def has_same_content(self, other: Resource) -> bool:
+        # compares the subtrees except for their paths, in O(1) for valid digests
+        if self is other:
+            return True
+        if (
+            self.type != other.type
+            or len(self.attributions) != len(other.attributions)
+            or self.children.keys() != other.children.keys()
+        ):
+            return False
+        return self.subtree_digest() == other.subtree_digest()
+
     def to_opossum_file_model(self) -> ResourceInFileModel:
         if self.children or self.type == ResourceType.FOLDER:
             return {
-                _convert_path_to_str(
+                convert_path_to_str(
                     child.path.relative_to(self.path)
                 ): child.to_opossum_file_model()
                 for child in self.children.values()
@@ -42,29 +203,58 @@ class Resource(BaseModel):
         else:
             return 1
 
-    def add_resource(self, resource: Resource) -> None:
+    def add_resource(self, resource: Resource, skip_identical: bool = False) -> None:
+        # The attributions of resources that already exist are extended. With
+        # skip_identical, subtrees that are already contained with the same
+        # content are left as they are instead of duplicating their
+        # attributions.
         if not resource.path.is_relative_to(self.path):
             raise RuntimeError(
                 f"The path {resource.path} is not a child of this node at {self.path}."
             )
         remaining_path_parts = resource.path.relative_to(self.path).parts
         if remaining_path_parts:
-            self._add_resource(resource, remaining_path_parts)
+            self._add_resource(resource, remaining_path_parts, skip_identical)
         else:
-            self._update(resource)
+            self._update(resource, skip_identical)
 
     def _add_resource(
-        self, resource: Resource, remaining_path_parts: Iterable[str]
+        self,
+        resource: Resource,
+        remaining_path_parts: Iterable[str],
+        skip_identical: bool,
     ) -> None:
         if not remaining_path_parts:
-            self._update(resource)
+            self._update(resource, skip_identical)
             return
         next, *rest_parts = remaining_path_parts
         if next not in self.children:
             self.children[next] = Resource(path=self.path / next)
-        self.children[next]._add_resource(resource, rest_parts)
+        self.children[next]._parent.set(None, self)
+        self.children[next]._add_resource(resource, rest_parts, skip_identical)
 
-    def _update(self, other: Resource) -> None:
+    def _update(self, other: Resource, skip_identical: bool) -> None:
+        # the identical subtrees are determined before the merge, as every
+        # modification clears the digests
+        identical = self._find_identical_subtrees(other) if skip_identical else set()
+        self._merge(other, identical)
+
+    def _find_identical_subtrees(self, other: Resource) -> set[int]:
+        identical = set()
+        stack = [(self, other)]
+        while stack:
+            mine, theirs = stack.pop()
+            if mine.path == theirs.path and mine.has_same_content(theirs):
+                identical.add(id(theirs))
+                continue
+            stack.extend(
+                (mine.children[key], child)
+                for key, child in theirs.children.items()
+                if key in mine.children
+            )
+        return identical
+
+    def _merge(self, other: Resource, identical: set[int]) -> None:
         if self.path != other.path:
             raise RuntimeError(
                 "Trying to merge nodes with different paths: "
@@ -75,10 +265,32 @@ class Resource(BaseModel):
                 "Trying to merge incompatible node types. "
                 + f"Current node is {self.type}. Other is {other.type}"
             )
+        if id(other) in identical:
+            return
         self.type = self.type or other.type
         self.attributions.extend(other.attributions)
         for key, child in other.children.items():
             if key in self.children:
-                self.children[key]._update(child)
+                self.children[key]._merge(child, identical)
             else:
                 self.children[key] = child
+                child._parent.set(None, self)
+
+    def remove_resource(self, path: PurePath) -> Resource | None:
+        if not path.is_relative_to(self.path):
+            raise RuntimeError(
+                f"The path {path} is not a child of this node at {self.path}."
+            )
+        remaining_path_parts = path.relative_to(self.path).parts
+        if not remaining_path_parts:
+            raise RuntimeError(f"The node at {self.path} cannot remove itself.")
+        *parent_parts, name = remaining_path_parts
+        parent = self
+        for part in parent_parts:
+            if part not in parent.children:
+                return None
+            parent = parent.children[part]
+        removed = parent.children.pop(name, None)
+        if removed is not None:
+            removed._parent.clear()
+        return removed
@@ -6,10 +6,18 @@ from __future__ import annotations
 
 import uuid
 from collections import defaultdict
+from collections.abc import Iterable
 from copy import deepcopy
 from dataclasses import field
-
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated, Any
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PrivateAttr,
+    ValidatorFunctionWrapHandler,
+    WrapValidator,
+)
 
 from opossum_lib.core.entities.base_url_for_sources import BaseUrlsForSources
 from opossum_lib.core.entities.external_attribution_source import (
@@ -18,19 +26,60 @@ from opossum_lib.core.entities.external_attribution_source import (
 from opossum_lib.core.entities.frequent_license import FrequentLicense
 from opossum_lib.core.entities.metadata import Metadata
 from opossum_lib.core.entities.opossum_package import OpossumPackage
-from opossum_lib.core.entities.resource import Resource, _convert_path_to_str
+from opossum_lib.core.entities.resource import Resource, convert_path_to_str
+from opossum_lib.core.entities.scan_results_index import ScanResultsIndex
+from opossum_lib.shared.entities.cached_value import CachedValue
 from opossum_lib.shared.entities.opossum_input_file_model import (
     OpossumInputFileModel,
     OpossumPackageIdentifierModel,
     OpossumPackageModel,
+    ResourceInFileModel,
     ResourcePathModel,
 )
+from opossum_lib.shared.services.compact_attribution_ids import compact_attribution_id
 
 
-def _default_attribution_id_mapper() -> dict[OpossumPackage, str]:
+def default_attribution_id_mapper() -> dict[OpossumPackage, str]:
     return defaultdict(lambda: str(uuid.uuid4()))
 
 
+def _keep_attribution_id_mapper(
+    value: Any, handler: ValidatorFunctionWrapHandler
+) -> Any:
+    # Mappers like CompactAttributionIds are dicts that assign the ids of
+    # missing attributions when they are looked up. They are checked like
+    # dicts, but kept instead of being converted to plain dicts.
+    validated = handler(value)
+    if isinstance(value, dict) and type(value) is not dict:
+        return value
+    return validated
+
+
+class CompactAttributionIds(dict[OpossumPackage, str]):
+    # Assigns short ids to the attributions in the order they are first looked
+    # up, so the same scan results always get the same ids.
+    def __missing__(self, attribution: OpossumPackage) -> str:
+        id = self[attribution] = compact_attribution_id(len(self))
+        return id
+
+    def add_all(self, attributions: Iterable[OpossumPackage]) -> None:
+        for attribution in attributions:
+            self[attribution]
+
+
+def content_attribution_id(attribution: OpossumPackage) -> str:
+    # the same for attributions with the same content
+    return str(uuid.UUID(bytes=attribution.content_digest()[:16]))
+
+
+class ContentAttributionIds(dict[OpossumPackage, str]):
+    # Derives the ids from the content of the attributions, so that converting
+    # the same input again gives the same ids.
+    def __missing__(self, attribution: OpossumPackage) -> str:
+        id = self[attribution] = content_attribution_id(attribution)
+        return id
+
+
 class ScanResults(BaseModel):
     model_config = ConfigDict(frozen=True, extra="forbid")
     metadata: Metadata
@@ -40,17 +89,78 @@ class ScanResults(BaseModel):
     frequent_licenses: list[FrequentLicense] | None = None
     files_with_children: list[str] | None = None
     base_urls_for_sources: BaseUrlsForSources | None = None
-    attribution_to_id: dict[OpossumPackage, str] = field(
-        default_factory=_default_attribution_id_mapper
-    )
+    attribution_to_id: Annotated[
+        dict[OpossumPackage, str], WrapValidator(_keep_attribution_id_mapper)
+    ] = field(default_factory=default_attribution_id_mapper)
     unassigned_attributions: list[OpossumPackage] = []
+    _index: CachedValue[ScanResultsIndex] = PrivateAttr(default_factory=CachedValue)
+
+    def resources_under(self, path_prefix: str) -> list[Resource]:
+        return self._get_index().resources_under(path_prefix)
 
-    def to_opossum_file_model(self) -> OpossumInputFileModel:
+    def resources_with_license(
+        self, license_name: str | None, path_prefix: str | None = None
+    ) -> list[Resource]:
+        return self._get_index().resources_with_license(license_name, path_prefix)
+
+    def attributions_from_source(self, source_name: str) -> list[OpossumPackage]:
+        return self._get_index().attributions_from_source(source_name)
+
+    def resources_for_attribution(self, attribution: OpossumPackage) -> list[Resource]:
+        return self._get_index().resources_for_attribution(attribution)
+
+    def _get_index(self) -> ScanResultsIndex:
+        # The index is rebuilt lazily whenever a tree has been modified or
+        # resources have been added to or removed from the root list. The
+        # digests of the roots are cached until their tree is modified.
+        key = tuple(
+            (id(resource), resource.subtree_digest()) for resource in self.resources
+        )
+        return self._index.get(key, lambda: ScanResultsIndex(self.resources))
+
+    def to_opossum_file_model(self, compact_ids: bool = False) -> OpossumInputFileModel:
+        # with compact_ids, the attributions are renumbered with short ids
+        # instead of keeping their ids, see compact_attribution_ids
+        if compact_ids:
+            return self.with_compact_ids().to_opossum_file_model()
         external_attributions, resources_to_attributions = (
             self.create_attribution_mapping(self.resources)
         )
         external_attributions.update(self._get_unassigned_attributions())
+        return self.create_opossum_file_model(
+            resources={
+                str(resource.path): resource.to_opossum_file_model()
+                for resource in self.resources
+            },
+            external_attributions=external_attributions,
+            resources_to_attributions=resources_to_attributions,
+        )
 
+    def compact_attribution_ids(self) -> CompactAttributionIds:
+        # in the order in which to_opossum_file_model writes the attributions
+        attribution_ids = CompactAttributionIds()
+        stack = list(reversed(self.resources))
+        while stack:
+            resource = stack.pop()
+            attribution_ids.add_all(resource.attributions)
+            stack.extend(reversed(resource.children.values()))
+        attribution_ids.add_all(self.unassigned_attributions)
+        return attribution_ids
+
+    def with_compact_ids(self) -> ScanResults:
+        # shares the resources with these scan results
+        return self.model_copy(
+            update={"attribution_to_id": self.compact_attribution_ids()}
+        )
+
+    def create_opossum_file_model(
+        self,
+        resources: ResourceInFileModel,
+        external_attributions: dict[OpossumPackageIdentifierModel, OpossumPackageModel],
+        resources_to_attributions: dict[
+            ResourcePathModel, list[OpossumPackageIdentifierModel]
+        ],
+    ) -> OpossumInputFileModel:
         frequent_licenses = None
         if self.frequent_licenses:
             frequent_licenses = [
@@ -68,10 +178,7 @@ class ScanResults(BaseModel):
 
         return OpossumInputFileModel(
             metadata=self.metadata.to_opossum_file_model(),
-            resources={
-                str(resource.path): resource.to_opossum_file_model()
-                for resource in self.resources
-            },
+            resources=resources,
             external_attributions=external_attributions,
             resources_to_attributions=resources_to_attributions,
             attribution_breakpoints=deepcopy(self.attribution_breakpoints),
@@ -87,17 +194,15 @@ class ScanResults(BaseModel):
         if self.unassigned_attributions:
             result = {}
             for unassigned_attribution in self.unassigned_attributions:
-                if unassigned_attribution in self.attribution_to_id:
+                try:
+                    # mappers like ContentAttributionIds assign missing ids
                     package_identifier = self.attribution_to_id[unassigned_attribution]
-                    result[package_identifier] = (
-                        unassigned_attribution.to_opossum_file_model()
-                    )
-                else:
+                except KeyError:
                     package_identifier = str(uuid.uuid4())
                     self.attribution_to_id[unassigned_attribution] = package_identifier
-                    result[package_identifier] = (
-                        unassigned_attribution.to_opossum_file_model()
-                    )
+                result[package_identifier] = (
+                    unassigned_attribution.to_opossum_file_model()
+                )
             return result
         else:
             return {}
@@ -117,7 +222,7 @@ class ScanResults(BaseModel):
         ] = {}
 
         def process_node(node: Resource) -> None:
-            path = _convert_path_to_str(node.path)
+            path = convert_path_to_str(node.path)
             if not path.startswith("/"):
                 # the / is required by OpossumUI
                 path = "/" + path
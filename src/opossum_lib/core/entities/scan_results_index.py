@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict
+
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, convert_path_to_str
+
+
+class ScanResultsIndex:
+    def __init__(self, resources: list[Resource]):
+        self._resources_by_path: dict[str, Resource] = {}
+        self._resources_by_license: defaultdict[str | None, list[Resource]] = (
+            defaultdict(list)
+        )
+        self._attributions_by_source: defaultdict[str, list[OpossumPackage]] = (
+            defaultdict(list)
+        )
+        self._resources_by_attribution: defaultdict[OpossumPackage, list[Resource]] = (
+            defaultdict(list)
+        )
+        self._build(resources)
+        self._sorted_paths = sorted(self._resources_by_path)
+
+    def _build(self, resources: list[Resource]) -> None:
+        # iterative to support arbitrarily deep trees
+        stack = list(reversed(resources))
+        while stack:
+            resource = stack.pop()
+            self._resources_by_path[_to_index_path(resource)] = resource
+            for attribution in resource.attributions:
+                resources_with_attribution = self._resources_by_attribution[attribution]
+                if not resources_with_attribution:
+                    self._attributions_by_source[attribution.source.name].append(
+                        attribution
+                    )
+                # compare by identity, the same attribution may occur twice
+                if (
+                    not resources_with_attribution
+                    or resources_with_attribution[-1] is not resource
+                ):
+                    resources_with_attribution.append(resource)
+            for license_name in {a.license_name for a in resource.attributions}:
+                self._resources_by_license[license_name].append(resource)
+            stack.extend(reversed(resource.children.values()))
+
+    def resources_under(self, path_prefix: str) -> list[Resource]:
+        prefix = _normalize_prefix(path_prefix)
+        if prefix == "/":
+            return [self._resources_by_path[path] for path in self._sorted_paths]
+        result = []
+        if prefix in self._resources_by_path:
+            result.append(self._resources_by_path[prefix])
+        # all paths starting with "<prefix>/" are sorted between "<prefix>/"
+        # and "<prefix>0" as "0" is the character following "/"
+        start = bisect_left(self._sorted_paths, prefix + "/")
+        end = bisect_left(self._sorted_paths, prefix + "0", lo=start)
+        result.extend(
+            self._resources_by_path[path] for path in self._sorted_paths[start:end]
+        )
+        return result
+
+    def resources_with_license(
+        self, license_name: str | None, path_prefix: str | None = None
+    ) -> list[Resource]:
+        resources = self._resources_by_license.get(license_name, [])
+        if path_prefix is None:
+            return list(resources)
+        prefix = _normalize_prefix(path_prefix)
+        return [r for r in resources if _is_under(_to_index_path(r), prefix)]
+
+    def attributions_from_source(self, source_name: str) -> list[OpossumPackage]:
+        return list(self._attributions_by_source.get(source_name, []))
+
+    def resources_for_attribution(self, attribution: OpossumPackage) -> list[Resource]:
+        return list(self._resources_by_attribution.get(attribution, []))
+
+
+def _to_index_path(resource: Resource) -> str:
+    return "/" + convert_path_to_str(resource.path).lstrip("/")
+
+
+def _normalize_prefix(path_prefix: str) -> str:
+    return "/" + path_prefix.strip("/")
+
+
+def _is_under(path: str, prefix: str) -> bool:
+    return prefix == "/" or path == prefix or path.startswith(prefix + "/")
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from opossum_lib.shared.constants import STANDARD_STREAM_PATH
+
+
+@contextmanager
+def atomic_output_file(file_path: Path) -> Iterator[IO[bytes]]:
+    # The content is written to a temporary file in the target directory, which
+    # replaces the target only after it has been completely written to disk.
+    # An interrupted write therefore never leaves a truncated file behind.
+    # The path "-" writes to standard output, which cannot be replaced.
+    if file_path == STANDARD_STREAM_PATH:
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    with tempfile.NamedTemporaryFile(
+        dir=file_path.parent,
+        prefix=f".{file_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as temp_file:
+        temp_path = Path(temp_file.name)
+        try:
+            yield temp_file
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        except BaseException:
+            temp_file.close()
+            temp_path.unlink(missing_ok=True)
+            raise
+    try:
+        _copy_permissions(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    _fsync_directory(file_path.parent)
+
+
+def _copy_permissions(file_path: Path, temp_path: Path) -> None:
+    # temporary files are only accessible by the owner
+    if file_path.exists():
+        shutil.copymode(file_path, temp_path)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+
+
+def _fsync_directory(directory: Path) -> None:
+    # persists the rename, directories cannot be opened on Windows
+    if os.name == "nt":
+        return
+    directory_descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(directory_descriptor)
+    finally:
+        os.close(directory_descriptor)
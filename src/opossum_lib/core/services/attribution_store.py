@@ -0,0 +1,185 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterator, Sequence
+from types import TracebackType
+
+from opossum_lib.shared.entities.opossum_input_file_model import (
+    OpossumPackageIdentifierModel,
+    ResourcePathModel,
+)
+
+# number of rows that are inserted before they are committed
+INSERT_BATCH_SIZE = 10_000
+# the parent of the top level resources
+ROOT_NODE = 0
+
+
+class AttributionStore:
+    # Collects the serialized attributions, the mapping from resource paths to
+    # attribution ids and the tree of resource names in a database. The
+    # database is kept in memory until its data exceeds the given number of
+    # bytes. Then it is moved to a temporary on-disk database, which is
+    # deleted when the store is closed.
+
+    def __init__(self, max_memory: int):
+        self.max_memory = max_memory
+        self._stored_bytes = 0
+        self._uncommitted_rows = 0
+        self._attribution_count = 0
+        self._is_spilled = False
+        # names and nodes of the last added resource path, as the resources
+        # usually come in the order of the tree
+        self._last_path: list[tuple[str, int]] = []
+        self._database = self._create_database(":memory:")
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._is_spilled
+
+    @property
+    def attribution_count(self) -> int:
+        return self._attribution_count
+
+    def get_attribution_id(self, digest: bytes) -> OpossumPackageIdentifierModel | None:
+        # the id of an added attribution by its content digest
+        row = self._database.execute(
+            "SELECT id FROM attributions WHERE digest = ?", (digest,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def add_attribution(
+        self,
+        attribution_id: OpossumPackageIdentifierModel,
+        digest: bytes,
+        serialized: str,
+    ) -> None:
+        cursor = self._database.execute(
+            "INSERT OR IGNORE INTO attributions VALUES (?, ?, ?)",
+            (attribution_id, digest, serialized),
+        )
+        if cursor.rowcount:
+            self._attribution_count += 1
+            self._add_stored_bytes(len(attribution_id) + len(digest) + len(serialized))
+
+    def add_resource_attributions(
+        self,
+        path: ResourcePathModel,
+        attribution_ids: list[OpossumPackageIdentifierModel],
+    ) -> None:
+        serialized_ids = json.dumps(attribution_ids)
+        self._database.execute(
+            "INSERT INTO resources_to_attributions VALUES (?, ?)",
+            (path, serialized_ids),
+        )
+        self._add_stored_bytes(len(path) + len(serialized_ids))
+
+    def add_resource(self, names: Sequence[str], is_folder: bool) -> None:
+        # adds the path of names to the resource tree, missing parents are
+        # created, and like in Resource.to_opossum_file_model, files become
+        # folders once they get children
+        common_length = 0
+        for (last_name, _), name in zip(self._last_path, names, strict=False):
+            if last_name != name:
+                break
+            common_length += 1
+        path = self._last_path[:common_length]
+        node = path[-1][1] if path else ROOT_NODE
+        for index in range(common_length, len(names)):
+            name = names[index]
+            row = self._database.execute(
+                "SELECT id FROM resources WHERE parent = ? AND name = ?", (node, name)
+            ).fetchone()
+            if row is None:
+                is_leaf = index == len(names) - 1
+                cursor = self._database.execute(
+                    "INSERT INTO resources (parent, name, is_folder) VALUES (?, ?, ?)",
+                    (node, name, is_folder and is_leaf),
+                )
+                assert cursor.lastrowid is not None
+                row = (cursor.lastrowid,)
+                self._add_stored_bytes(len(name))
+            node = row[0]
+            path.append((name, node))
+        self._last_path = path
+
+    def resource_children(
+        self, node: int = ROOT_NODE
+    ) -> Iterator[tuple[int, str, bool]]:
+        # the node, name and whether it is a folder for the children of a node
+        # in the order they were added
+        rows = self._database.execute(
+            "SELECT id, name, is_folder OR EXISTS "
+            "(SELECT 1 FROM resources AS child WHERE child.parent = resources.id) "
+            "FROM resources WHERE parent = ? ORDER BY id",
+            (node,),
+        )
+        for child, name, is_folder in rows:
+            yield child, name, bool(is_folder)
+
+    def attributions(self) -> Iterator[tuple[OpossumPackageIdentifierModel, str]]:
+        yield from self._database.execute(
+            "SELECT id, attribution FROM attributions ORDER BY rowid"
+        )
+
+    def resources_to_attributions(
+        self,
+    ) -> Iterator[tuple[ResourcePathModel, list[OpossumPackageIdentifierModel]]]:
+        rows = self._database.execute(
+            "SELECT path, attribution_ids FROM resources_to_attributions ORDER BY rowid"
+        )
+        for path, serialized_ids in rows:
+            yield path, json.loads(serialized_ids)
+
+    def close(self) -> None:
+        self._database.close()
+
+    def __enter__(self) -> AttributionStore:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _add_stored_bytes(self, number_of_bytes: int) -> None:
+        self._stored_bytes += number_of_bytes
+        self._uncommitted_rows += 1
+        if not self._is_spilled and self._stored_bytes > self.max_memory:
+            self._spill()
+        elif self._uncommitted_rows >= INSERT_BATCH_SIZE:
+            self._database.commit()
+            self._uncommitted_rows = 0
+
+    def _spill(self) -> None:
+        # an empty name creates a temporary database that sqlite deletes on close
+        database = sqlite3.connect("")
+        self._database.commit()
+        self._database.backup(database)
+        self._database.close()
+        self._database = database
+        self._uncommitted_rows = 0
+        self._is_spilled = True
+
+    @staticmethod
+    def _create_database(name: str) -> sqlite3.Connection:
+        database = sqlite3.connect(name)
+        database.execute(
+            "CREATE TABLE attributions "
+            "(id TEXT PRIMARY KEY, digest BLOB UNIQUE, attribution TEXT)"
+        )
+        database.execute(
+            "CREATE TABLE resources_to_attributions (path TEXT, attribution_ids TEXT)"
+        )
+        database.execute(
+            "CREATE TABLE resources (id INTEGER PRIMARY KEY, parent INTEGER, "
+            "name TEXT, is_folder INTEGER, UNIQUE (parent, name))"
+        )
+        return database
@@ -1,16 +1,144 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
+import logging
+from concurrent.futures import Executor
+from functools import partial
 from pathlib import Path
 
+from opossum_lib.core.services.hoist_attributions import hoist_attributions
 from opossum_lib.core.services.input_reader import InputReader
+from opossum_lib.core.services.opossum_pipeline import (
+    PipelineStage,
+    hoist_stream_attributions,
+    read_ahead,
+    run_pipeline,
+)
+from opossum_lib.core.services.run_in_executor import run_in_executor
+from opossum_lib.core.services.shard_opossum import shard_opossum
+from opossum_lib.core.services.stream_opossum_file import write_opossum_stream
 from opossum_lib.core.services.write_opossum_file import write_opossum_file
+from opossum_lib.core.services.write_opossum_shards import write_opossum_shards
+from opossum_lib.shared.constants import STANDARD_STREAM_PATH
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
 
 
-def generate_impl(input_readers: list[InputReader], output_file: Path) -> None:
+def check_generate_options(
+    output_file: Path,
+    skip_unchanged: bool = False,
+    max_memory: int | None = None,
+    with_index: bool = False,
+    shard: bool = False,
+    shard_max_nodes: int | None = None,
+    validation: ValidationPolicy = ValidationPolicy.FULL,
+    has_scancode_input: bool = False,
+) -> str | None:
+    # the reason why the options cannot be combined, if they cannot
+    if validation != ValidationPolicy.FULL and has_scancode_input:
+        # the conversion of ScanCode files needs completely validated files
+        return "ScanCode files can only be read with --validation full!"
+    is_sharded = shard or shard_max_nodes is not None
+    if (skip_unchanged or with_index or is_sharded) and max_memory is not None:
+        return (
+            "--skip-unchanged, --with-index and sharding cannot be combined "
+            "with --max-memory!"
+        )
+    if output_file == STANDARD_STREAM_PATH and (skip_unchanged or is_sharded):
+        return (
+            "--skip-unchanged and sharding cannot be combined with writing to "
+            "standard output!"
+        )
+    return None
+
+
+def generate_impl(
+    input_readers: list[InputReader],
+    output_file: Path,
+    workers: int = 1,
+    skip_unchanged: bool = False,
+    max_memory: int | None = None,
+    with_index: bool = False,
+    shard: bool = False,
+    shard_max_nodes: int | None = None,
+    hoist: bool = False,
+    compact_ids: bool = False,
+) -> None:
     # currently this converts only one file (validated in the arguments)
     # for the future a merge step is planned after reading the files
+    if max_memory is not None:
+        # The only conversion that runs as a pipeline, see opossum_pipeline.
+        # The resources are passed from the reader to the writer one after the
+        # other, so the tree is only built if hoisting needs it. With several
+        # workers, readers convert in worker processes while the writer runs,
+        # with one worker the reader runs in a thread.
+        stages: list[PipelineStage] = []
+        if workers == 1:
+            stages.append(read_ahead())
+        if hoist:
+            stages.append(hoist_stream_attributions)
+        stream = run_pipeline(input_readers[0].stream(), stages)
+        write_opossum_stream(
+            stream, output_file, max_memory=max_memory, compact_ids=compact_ids
+        )
+        return
+
     opossum = input_readers[0].read()
 
+    if hoist:
+        removed_references = hoist_attributions(opossum.scan_results)
+        logging.info(f"Hoisting removed {removed_references} attribution references")
+
+    if compact_ids:
+        opossum = opossum.with_compact_ids()
+
+    if shard or shard_max_nodes is not None:
+        write_opossum_shards(
+            shard_opossum(opossum, max_nodes=shard_max_nodes),
+            output_file,
+            workers=workers,
+            skip_unchanged=skip_unchanged,
+            with_index=with_index,
+        )
+        return
     opossum_file_content = opossum.to_opossum_file_model()
-    write_opossum_file(opossum_file_content, output_file)
+    write_opossum_file(
+        opossum_file_content,
+        output_file,
+        workers=workers,
+        skip_unchanged=skip_unchanged,
+        with_index=with_index,
+    )
+
+
+async def generate_impl_async(
+    input_readers: list[InputReader],
+    output_file: Path,
+    executor: Executor | None = None,
+    workers: int = 1,
+    skip_unchanged: bool = False,
+    max_memory: int | None = None,
+    with_index: bool = False,
+    shard: bool = False,
+    shard_max_nodes: int | None = None,
+    hoist: bool = False,
+    compact_ids: bool = False,
+) -> None:
+    # The complete conversion runs in one task of the executor so that no
+    # intermediate results have to be passed between processes. Independent
+    # conversions can be awaited concurrently.
+    await run_in_executor(
+        executor,
+        partial(
+            generate_impl,
+            input_readers,
+            output_file,
+            workers=workers,
+            skip_unchanged=skip_unchanged,
+            max_memory=max_memory,
+            with_index=with_index,
+            shard=shard,
+            shard_max_nodes=shard_max_nodes,
+            hoist=hoist,
+            compact_ids=compact_ids,
+        ),
+    )
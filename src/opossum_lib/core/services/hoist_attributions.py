@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import ScanResults
+
+
+def hoist_attributions(scan_results: ScanResults) -> int:
+    # Moves attributions that all children of a folder have in common to the
+    # folder, bottom-up, so that e.g. a vendored library only needs a single
+    # entry in resourcesToAttributions. Attribution breakpoints neither
+    # receive attributions nor pass them on. Files with children, like
+    # archives, do not receive the attributions of their contents either.
+    # Returns the number of removed references between resources and
+    # attributions.
+    skipped_folders = {
+        _normalize_path(path)
+        for path in scan_results.attribution_breakpoints
+        + (scan_results.files_with_children or [])
+    }
+    removed_references = 0
+    stack = [(resource, False) for resource in scan_results.resources]
+    while stack:
+        resource, children_done = stack.pop()
+        if children_done:
+            removed_references += _hoist_from_children(resource, skipped_folders)
+        else:
+            stack.append((resource, True))
+            stack.extend((child, False) for child in resource.children.values())
+    return removed_references
+
+
+def _hoist_from_children(folder: Resource, skipped_folders: set[PurePath]) -> int:
+    if (
+        not folder.children
+        or folder.attributions
+        or folder.type == ResourceType.FILE
+        or _normalize_path(str(folder.path)) in skipped_folders
+    ):
+        return 0
+    children = list(folder.children.values())
+    shared_attributions = set(children[0].attributions)
+    if not shared_attributions or any(
+        set(child.attributions) != shared_attributions for child in children[1:]
+    ):
+        return 0
+    number_of_references = sum(len(child.attributions) for child in children)
+    folder.attributions = list(children[0].attributions)
+    for child in children:
+        child.attributions = []
+    return number_of_references - len(folder.attributions)
+
+
+def _normalize_path(path: str) -> PurePath:
+    return PurePath(path.replace("\\", "/").strip("/"))
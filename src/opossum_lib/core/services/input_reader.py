@@ -2,11 +2,23 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 from abc import abstractmethod
-from asyncio import Protocol
+from concurrent.futures import Executor
+from typing import Protocol
 
 from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.opossum_stream import OpossumStream
+from opossum_lib.core.services.run_in_executor import run_in_executor
 
 
 class InputReader(Protocol):
     @abstractmethod
     def read(self) -> Opossum: ...
+
+    def stream(self) -> OpossumStream:
+        # readers that can produce their resources one after the other
+        # override this to avoid building the tree
+        return OpossumStream.from_opossum(self.read())
+
+    async def read_async(self, executor: Executor | None = None) -> Opossum:
+        # with a ProcessPoolExecutor the reader and the result are pickled
+        return await run_in_executor(executor, self.read)
@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from itertools import batched
+from queue import Full, Queue
+
+from opossum_lib.core.entities.opossum_stream import OpossumStream
+from opossum_lib.core.services.hoist_attributions import hoist_attributions
+
+# A pipeline starts with the stream of a reader, passes it through a sequence
+# of stages and ends with a writer that consumes the stream. Stages transform
+# the resources lazily, so a pipeline without barriers like hoisting never
+# holds all resources in memory. The readers drop the resources and
+# attributions that are excluded by their IngestFilter.
+# Only generate --max-memory runs as a pipeline. The other conversions need
+# the complete tree, e.g. for sharding or the index, and the ids are
+# compacted by the streaming writer, which assigns them while writing.
+type PipelineStage = Callable[[OpossumStream], OpossumStream]
+
+# number of resources that are passed between threads at once
+READ_AHEAD_BATCH_SIZE = 256
+# number of batches that are buffered before the producing thread waits
+DEFAULT_READ_AHEAD_BATCHES = 64
+# how often a waiting producer checks whether the consumer stopped, in seconds
+_PUT_TIMEOUT = 0.1
+
+
+def run_pipeline(
+    stream: OpossumStream, stages: Iterable[PipelineStage]
+) -> OpossumStream:
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+
+def hoist_stream_attributions(stream: OpossumStream) -> OpossumStream:
+    # a barrier, as the attributions of a folder depend on all its children
+    opossum = stream.collect()
+    removed_references = hoist_attributions(opossum.scan_results)
+    logging.info(f"Hoisting removed {removed_references} attribution references")
+    return OpossumStream.from_opossum(opossum)
+
+
+def read_ahead(max_batches: int = DEFAULT_READ_AHEAD_BATCHES) -> PipelineStage:
+    # Produces the resources of the previous stages in a background thread,
+    # so that reading and decompressing the input overlaps with the following
+    # stages and the writer. At most max_batches batches are buffered.
+    # The previous stages must not start worker processes, as forking from a
+    # thread can deadlock.
+    def stage(stream: OpossumStream) -> OpossumStream:
+        return stream.model_copy(
+            update={"resources": _iterate_in_thread(stream.resources, max_batches)}
+        )
+
+    return stage
+
+
+def _iterate_in_thread[T](items: Iterator[T], max_batches: int) -> Iterator[T]:
+    queue: Queue[tuple[tuple[T, ...] | None, BaseException | None]] = Queue(
+        maxsize=max_batches
+    )
+    stopped = threading.Event()
+
+    def put(entry: tuple[tuple[T, ...] | None, BaseException | None]) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(entry, timeout=_PUT_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for batch in batched(items, READ_AHEAD_BATCH_SIZE, strict=False):
+                if not put((batch, None)):
+                    return
+        except BaseException as error:
+            # e.g. the SystemExit of a reader, raised again in the consumer
+            put((None, error))
+            return
+        put((None, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch, error = queue.get()
+            if error is not None:
+                raise error
+            if batch is None:
+                return
+            yield from batch
+    finally:
+        # lets the producer finish if the consumer stops early
+        stopped.set()
+        thread.join()
@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import Path
+
+from opossum_lib.core.services.input_reader import InputReader
+from opossum_lib.core.services.patch_opossum import patch_opossum
+from opossum_lib.core.services.write_opossum_file import write_opossum_file
+
+
+def patch_impl(
+    base_reader: InputReader,
+    changes_reader: InputReader | None,
+    deleted_paths: list[str],
+    output_file: Path,
+    workers: int = 1,
+) -> None:
+    base = base_reader.read()
+    changed_resources = changes_reader.read().scan_results if changes_reader else None
+
+    opossum = patch_opossum(base, changed_resources, deleted_paths)
+
+    opossum_file_content = opossum.to_opossum_file_model()
+    write_opossum_file(opossum_file_content, output_file, workers=workers)
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from collections.abc import Iterable
+from pathlib import PurePath
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import (
+    ScanResults,
+    default_attribution_id_mapper,
+)
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.services.load_output_file import load_output_file
+
+
+def patch_opossum(
+    base: Opossum,
+    changed_resources: ScanResults | None,
+    deleted_paths: Iterable[str],
+) -> Opossum:
+    deleted = [_normalize_path(path) for path in deleted_paths if path.strip("/ \n")]
+    root = _build_root(base.scan_results.resources)
+
+    for path in deleted:
+        root.remove_resource(path)
+    if changed_resources:
+        for resource in changed_resources.resources:
+            _patch_resource(root, resource)
+
+    # keep the existing ids so that references from output.json stay valid
+    attribution_to_id = default_attribution_id_mapper()
+    attribution_to_id.update(base.scan_results.attribution_to_id)
+    scan_results = base.scan_results.model_copy(
+        update={
+            "resources": list(root.children.values()),
+            "attribution_to_id": attribution_to_id,
+            "attribution_breakpoints": _without_deleted(
+                base.scan_results.attribution_breakpoints, deleted
+            ),
+            "files_with_children": base.scan_results.files_with_children
+            and _without_deleted(base.scan_results.files_with_children, deleted),
+        }
+    )
+    review_results = base.review_results
+    if review_results and (deleted or changed_resources):
+        review_results = _prune_review_results(
+            load_output_file(review_results), deleted, scan_results
+        )
+    return Opossum(scan_results=scan_results, review_results=review_results)
+
+
+def _build_root(resources: list[Resource]) -> Resource:
+    root = Resource(path=PurePath(""))
+    for resource in resources:
+        root.children[resource.path.name] = resource
+    return root
+
+
+def _patch_resource(parent: Resource, changed: Resource) -> None:
+    name = changed.path.name
+    existing = parent.children.get(name)
+    if existing is None:
+        parent.add_resource(changed)
+        return
+    existing.type = changed.type or existing.type
+    if changed.type == ResourceType.FILE:
+        # the new scan replaces all findings for a changed file
+        existing.attributions = list(changed.attributions)
+    for child in changed.children.values():
+        _patch_resource(existing, child)
+
+
+def _prune_review_results(
+    review_results: OpossumOutputFileModel,
+    deleted: list[PurePath],
+    scan_results: ScanResults,
+) -> OpossumOutputFileModel:
+    # drops the review results of deleted paths and the resolved ids of
+    # attributions that were deleted or replaced
+    resources_to_attributions = {
+        path: ids
+        for path, ids in review_results.resources_to_attributions.items()
+        if not _is_deleted(path, deleted)
+    }
+    used_ids = {id for ids in resources_to_attributions.values() for id in ids}
+    removed_ids = {
+        id
+        for ids in review_results.resources_to_attributions.values()
+        for id in ids
+        if id not in used_ids
+    }
+    manual_attributions = {
+        id: attribution
+        for id, attribution in review_results.manual_attributions.items()
+        if id not in removed_ids
+    }
+    resolved_external_attributions = review_results.resolved_external_attributions
+    if resolved_external_attributions is not None:
+        external_attribution_ids = _get_external_attribution_ids(scan_results)
+        resolved_external_attributions = [
+            id
+            for id in resolved_external_attributions
+            if id in external_attribution_ids
+        ]
+    return review_results.model_copy(
+        update={
+            "resources_to_attributions": resources_to_attributions,
+            "manual_attributions": manual_attributions,
+            "resolved_external_attributions": resolved_external_attributions,
+        }
+    )
+
+
+def _get_external_attribution_ids(scan_results: ScanResults) -> set[str]:
+    # the ids of the attributions that are written to externalAttributions
+    attributions = set(scan_results.unassigned_attributions)
+    stack = list(scan_results.resources)
+    while stack:
+        resource = stack.pop()
+        attributions.update(resource.attributions)
+        stack.extend(resource.children.values())
+    return {scan_results.attribution_to_id[attribution] for attribution in attributions}
+
+
+def _without_deleted(paths: list[str], deleted: list[PurePath]) -> list[str]:
+    return [path for path in paths if not _is_deleted(path, deleted)]
+
+
+def _is_deleted(path: str, deleted: list[PurePath]) -> bool:
+    normalized_path = _normalize_path(path)
+    return any(normalized_path.is_relative_to(d) for d in deleted)
+
+
+def _normalize_path(path: str) -> PurePath:
+    # paths in .opossum files have leading and trailing slashes,
+    # the paths in ScanCode files have none
+    return PurePath(path.strip().strip("/"))
@@ -0,0 +1,17 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+
+async def run_in_executor[T](executor: Executor | None, function: Callable[[], T]) -> T:
+    # Runs a blocking function without blocking the event loop. None selects
+    # the default executor of the loop. The readers report errors by exiting,
+    # which must not stop the service that awaits them.
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, function)
+    except SystemExit as e:
+        raise RuntimeError(f"The conversion failed with exit code {e.code}") from e
@@ -0,0 +1,243 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from collections import deque
+from pathlib import PurePath
+
+from pydantic import BaseModel, ConfigDict
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource
+from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.services.load_output_file import load_output_file
+
+
+class OpossumShard(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    # the subtrees that belong to this shard
+    paths: list[PurePath]
+    number_of_resources: int
+    opossum: Opossum
+
+
+def shard_opossum(opossum: Opossum, max_nodes: int | None = None) -> list[OpossumShard]:
+    # Without max_nodes every top-level directory becomes a shard. The
+    # top level is the first level below the common root folders. Otherwise
+    # subtrees are split until they have at most max_nodes resources and
+    # consecutive subtrees are combined into shards of up to max_nodes.
+    scan_results = opossum.scan_results
+    _assign_attribution_ids(scan_results)
+    sizes = _count_subtree_sizes(scan_results.resources)
+    if max_nodes is None:
+        groups = _group_by_top_level(scan_results.resources)
+    else:
+        groups = _group_by_size(scan_results.resources, sizes, max_nodes)
+
+    owners = _get_owners(groups)
+    all_review_results = None
+    if opossum.review_results is not None:
+        all_review_results = load_output_file(opossum.review_results)
+    shards = []
+    for index, group in enumerate(groups):
+        root = Resource(path=PurePath(""))
+        for resource in group:
+            root.add_resource(resource)
+        resources = list(root.children.values())
+        shard_scan_results = _scan_results_for_shard(
+            scan_results, resources, owners, index
+        )
+        review_results = None
+        if all_review_results is not None:
+            review_results = _review_results_for_shard(
+                all_review_results,
+                set(shard_scan_results.attribution_to_id.values()),
+                owners,
+                index,
+            )
+        shards.append(
+            OpossumShard(
+                paths=[resource.path for resource in group],
+                number_of_resources=sum(
+                    sizes.get(id(resource), 1) for resource in group
+                ),
+                opossum=Opossum(
+                    scan_results=shard_scan_results, review_results=review_results
+                ),
+            )
+        )
+    return shards
+
+
+def _assign_attribution_ids(scan_results: ScanResults) -> None:
+    # the ids are assigned before splitting so that all shards use the same ids
+    stack = list(scan_results.resources)
+    while stack:
+        resource = stack.pop()
+        for attribution in resource.attributions:
+            scan_results.get_attribution_key(attribution)
+        stack.extend(resource.children.values())
+    for attribution in scan_results.unassigned_attributions:
+        scan_results.get_attribution_key(attribution)
+
+
+def _count_subtree_sizes(resources: list[Resource]) -> dict[int, int]:
+    sizes: dict[int, int] = {}
+    stack = [(resource, False) for resource in resources]
+    while stack:
+        resource, children_done = stack.pop()
+        if children_done:
+            sizes[id(resource)] = 1 + sum(
+                sizes[id(child)] for child in resource.children.values()
+            )
+        else:
+            stack.append((resource, True))
+            stack.extend((child, False) for child in resource.children.values())
+    return sizes
+
+
+def _shell(resource: Resource) -> Resource:
+    # the resource itself without its children
+    return Resource(
+        path=resource.path, type=resource.type, attributions=resource.attributions
+    )
+
+
+def _group_by_top_level(resources: list[Resource]) -> list[list[Resource]]:
+    rest = []
+    level = resources
+    while len(level) == 1 and level[0].children:
+        if level[0].attributions:
+            rest.append(_shell(level[0]))
+        level = list(level[0].children.values())
+    directories = [[resource] for resource in level if resource.children]
+    rest += [resource for resource in level if not resource.children]
+    # folder attributions and files above the top level form an own shard
+    return ([rest] if rest else []) + directories or [[]]
+
+
+def _group_by_size(
+    resources: list[Resource], sizes: dict[int, int], max_nodes: int
+) -> list[list[Resource]]:
+    groups: list[list[Resource]] = []
+    current: list[Resource] = []
+    current_size = 0
+    pending = deque(resources)
+    while pending:
+        resource = pending.popleft()
+        size = sizes.get(id(resource), 1)
+        if size > max_nodes and resource.children:
+            children = list(resource.children.values())
+            pending.extendleft(reversed(children))
+            if resource.attributions:
+                pending.appendleft(_shell(resource))
+            continue
+        if current and current_size + size > max_nodes:
+            groups.append(current)
+            current, current_size = [], 0
+        current.append(resource)
+        current_size += size
+    return groups + [current] if current or not groups else groups
+
+
+def _get_owners(groups: list[list[Resource]]) -> dict[PurePath, int]:
+    # maps the root of every subtree to its shard
+    return {
+        resource.path: index for index, group in enumerate(groups) for resource in group
+    }
+
+
+def _get_owner(path: str, owners: dict[PurePath, int]) -> int:
+    # The nearest subtree root decides. The children of split resources are
+    # subtrees of their own, so they take precedence over the split resource.
+    # Resources outside of all subtrees, e.g. common root folders, belong
+    # to the first shard.
+    normalized_path = PurePath(path.strip("/"))
+    for candidate in [normalized_path, *normalized_path.parents]:
+        if candidate in owners:
+            return owners[candidate]
+    return 0
+
+
+def _scan_results_for_shard(
+    scan_results: ScanResults,
+    resources: list[Resource],
+    owners: dict[PurePath, int],
+    index: int,
+) -> ScanResults:
+    return scan_results.model_copy(
+        update={
+            "resources": resources,
+            "attribution_to_id": _collect_attribution_ids(scan_results, resources),
+            "attribution_breakpoints": [
+                path
+                for path in scan_results.attribution_breakpoints
+                if _get_owner(path, owners) == index
+            ],
+            "files_with_children": None
+            if scan_results.files_with_children is None
+            else [
+                path
+                for path in scan_results.files_with_children
+                if _get_owner(path, owners) == index
+            ],
+            "unassigned_attributions": scan_results.unassigned_attributions
+            if index == 0
+            else [],
+        }
+    )
+
+
+def _collect_attribution_ids(
+    scan_results: ScanResults, resources: list[Resource]
+) -> dict[OpossumPackage, str]:
+    attribution_to_id = {}
+    stack = list(resources)
+    while stack:
+        resource = stack.pop()
+        for attribution in resource.attributions:
+            attribution_to_id[attribution] = scan_results.attribution_to_id[attribution]
+        stack.extend(resource.children.values())
+    for attribution in scan_results.unassigned_attributions:
+        attribution_to_id[attribution] = scan_results.attribution_to_id[attribution]
+    return attribution_to_id
+
+
+def _review_results_for_shard(
+    review_results: OpossumOutputFileModel,
+    external_attribution_ids: set[str],
+    owners: dict[PurePath, int],
+    index: int,
+) -> OpossumOutputFileModel:
+    resources_to_attributions = {
+        path: ids
+        for path, ids in review_results.resources_to_attributions.items()
+        if _get_owner(path, owners) == index
+    }
+    used_ids = {
+        id for ids in review_results.resources_to_attributions.values() for id in ids
+    }
+    shard_ids = {id for ids in resources_to_attributions.values() for id in ids}
+    manual_attributions = {
+        id: attribution
+        for id, attribution in review_results.manual_attributions.items()
+        # attributions without resources are kept in the first shard
+        if id in shard_ids or (index == 0 and id not in used_ids)
+    }
+    resolved_external_attributions = None
+    if review_results.resolved_external_attributions is not None:
+        resolved_external_attributions = [
+            id
+            for id in review_results.resolved_external_attributions
+            if id in external_attribution_ids
+        ]
+    return review_results.model_copy(
+        update={
+            "resources_to_attributions": resources_to_attributions,
+            "manual_attributions": manual_attributions,
+            "resolved_external_attributions": resolved_external_attributions,
+        }
+    )
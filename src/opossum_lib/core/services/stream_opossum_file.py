@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+from collections.abc import Iterable
+from pathlib import Path
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.opossum_stream import OpossumStream
+from opossum_lib.core.entities.resource import ResourceType, convert_path_to_str
+from opossum_lib.core.entities.scan_results import ScanResults, content_attribution_id
+from opossum_lib.core.services.atomic_output_file import atomic_output_file
+from opossum_lib.core.services.attribution_store import ROOT_NODE, AttributionStore
+from opossum_lib.core.services.write_opossum_file import (
+    combine_entry_hashes,
+    ensure_outfile_suffix,
+    get_entry_hash,
+    serialize_output_file,
+    write_zip_entry,
+)
+from opossum_lib.shared.constants import (
+    COMPRESSION_LEVEL,
+    CONTENT_HASH_COMMENT_PREFIX,
+    INPUT_JSON_NAME,
+    OUTPUT_JSON_NAME,
+)
+from opossum_lib.shared.services.compact_attribution_ids import (
+    compact_attribution_id,
+    compact_output_file_ids,
+)
+from opossum_lib.shared.services.zip_writer import ZipEntryWriter, ZipWriter
+
+# size of the chunks that are passed to the compressor
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# the indentation of write_opossum_file
+INDENT = " " * 4
+
+RESOURCES_KEY = "resources"
+EXTERNAL_ATTRIBUTIONS_KEY = "externalAttributions"
+RESOURCES_TO_ATTRIBUTIONS_KEY = "resourcesToAttributions"
+
+
+class _HashingWriter:
+    def __init__(self, stream: ZipEntryWriter):
+        self._stream = stream
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+
+    def write(self, text: str) -> None:
+        self._buffer += text.encode()
+        if len(self._buffer) >= WRITE_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        self._hash.update(self._buffer)
+        self._stream.write(self._buffer)
+        self._buffer.clear()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def stream_opossum_file(
+    opossum: Opossum, file_path: Path, max_memory: int, compact_ids: bool = False
+) -> None:
+    write_opossum_stream(
+        OpossumStream.from_opossum(opossum), file_path, max_memory, compact_ids
+    )
+
+
+def write_opossum_stream(
+    stream: OpossumStream, file_path: Path, max_memory: int, compact_ids: bool = False
+) -> None:
+    # Writes the same content as write_opossum_file without building the
+    # complete input.json in memory. The resources are consumed one after the
+    # other and collected with their attributions in a store that moves them
+    # to disk once they exceed max_memory bytes.
+    file_path = ensure_outfile_suffix(file_path)
+    scan_results = stream.scan_results
+    with AttributionStore(max_memory) as store:
+        _collect_resources(stream, store, compact_ids)
+        review_results = stream.review_results
+        if compact_ids and review_results:
+            review_results = compact_output_file_ids(
+                review_results,
+                _renumbered_attribution_ids(scan_results, store),
+                first_manual_number=store.attribution_count,
+            )
+        with (
+            atomic_output_file(file_path) as output_file,
+            ZipWriter(output_file) as zip_writer,
+        ):
+            with zip_writer.open(INPUT_JSON_NAME, COMPRESSION_LEVEL) as entry:
+                writer = _HashingWriter(entry)
+                _write_input_json(writer, scan_results, store)
+                writer.flush()
+            entry_hashes = {INPUT_JSON_NAME: writer.hexdigest()}
+            if review_results:
+                output_json = serialize_output_file(review_results)
+                write_zip_entry(zip_writer, OUTPUT_JSON_NAME, output_json)
+                entry_hashes[OUTPUT_JSON_NAME] = get_entry_hash(output_json)
+            zip_writer.comment = (
+                CONTENT_HASH_COMMENT_PREFIX
+                + combine_entry_hashes(entry_hashes).encode()
+            )
+
+
+def _collect_resources(
+    stream: OpossumStream, store: AttributionStore, compact_ids: bool
+) -> None:
+    # same order as ScanResults.create_attribution_mapping for streams of
+    # trees, but without keeping the resources and attributions in memory
+    scan_results = stream.scan_results
+    for resource in stream.resources:
+        store.add_resource(resource.path.parts, resource.type == ResourceType.FOLDER)
+        attribution_ids = {
+            _store_attribution(scan_results, attribution, store, compact_ids): None
+            for attribution in resource.attributions
+        }
+        if attribution_ids:
+            path = convert_path_to_str(resource.path)
+            if not path.startswith("/"):
+                path = "/" + path
+            store.add_resource_attributions(path, list(attribution_ids))
+
+    # the unassigned attributions are only complete after the resources
+    for attribution in scan_results.unassigned_attributions:
+        _store_attribution(scan_results, attribution, store, compact_ids)
+
+
+def _store_attribution(
+    scan_results: ScanResults,
+    attribution: OpossumPackage,
+    store: AttributionStore,
+    compact_ids: bool,
+) -> str:
+    # New ids are not added to scan_results.attribution_to_id, which would
+    # keep every attribution in memory. Instead, the store is asked for the ids
+    # of attributions that were already stored. With compact_ids, the
+    # attributions are numbered as in ScanResults.compact_attribution_ids.
+    digest = attribution.content_digest()
+    attribution_id = store.get_attribution_id(digest)
+    if attribution_id is not None:
+        return attribution_id
+    if compact_ids:
+        attribution_id = compact_attribution_id(store.attribution_count)
+    else:
+        attribution_id = scan_results.attribution_to_id.get(
+            attribution
+        ) or content_attribution_id(attribution)
+    serialized = attribution.to_opossum_file_model().model_dump_json(
+        indent=len(INDENT), exclude_none=True, by_alias=True
+    )
+    store.add_attribution(attribution_id, digest, _indent(serialized, depth=2))
+    return attribution_id
+
+
+def _renumbered_attribution_ids(
+    scan_results: ScanResults, store: AttributionStore
+) -> dict[str, str]:
+    # like renumbered_attribution_ids, for the ids assigned by the store
+    renumbered_ids = {}
+    for attribution, original_id in scan_results.attribution_to_id.items():
+        attribution_id = store.get_attribution_id(attribution.content_digest())
+        if attribution_id is not None:
+            renumbered_ids[original_id] = attribution_id
+    return renumbered_ids
+
+
+def _write_input_json(
+    writer: _HashingWriter, scan_results: ScanResults, store: AttributionStore
+) -> None:
+    # the bulk data is written from the store, everything else is serialized
+    # from a model without resources and attributions
+    input_file = scan_results.create_opossum_file_model(
+        resources={}, external_attributions={}, resources_to_attributions={}
+    ).model_dump(mode="json", exclude_none=True, by_alias=True)
+
+    writer.write("{")
+    for index, (key, value) in enumerate(input_file.items()):
+        if index > 0:
+            writer.write(",")
+        writer.write(f"\n{INDENT}{json.dumps(key)}: ")
+        if key == RESOURCES_KEY:
+            _write_resource_tree(writer, store, ROOT_NODE, depth=1)
+        elif key == EXTERNAL_ATTRIBUTIONS_KEY:
+            _write_object(writer, store.attributions(), depth=1)
+        elif key == RESOURCES_TO_ATTRIBUTIONS_KEY:
+            _write_object(
+                writer,
+                (
+                    (path, _indent(json.dumps(ids, indent=len(INDENT)), depth=2))
+                    for path, ids in store.resources_to_attributions()
+                ),
+                depth=1,
+            )
+        else:
+            serialized = json.dumps(value, ensure_ascii=False, indent=len(INDENT))
+            writer.write(_indent(serialized, depth=1))
+    writer.write("\n}")
+
+
+def _write_resource_tree(
+    writer: _HashingWriter, store: AttributionStore, node: int, depth: int
+) -> None:
+    # folders are objects of their children, files are 1
+    is_empty = True
+    for child, name, is_folder in store.resource_children(node):
+        writer.write("{" if is_empty else ",")
+        writer.write(
+            f"\n{INDENT * (depth + 1)}{json.dumps(name, ensure_ascii=False)}: "
+        )
+        if is_folder:
+            _write_resource_tree(writer, store, child, depth + 1)
+        else:
+            writer.write("1")
+        is_empty = False
+    writer.write("{}" if is_empty else f"\n{INDENT * depth}}}")
+
+
+def _write_object(
+    writer: _HashingWriter, items: Iterable[tuple[str, str]], depth: int
+) -> None:
+    # items are pairs of keys and values that are already serialized for the
+    # depth of the object's items
+    is_empty = True
+    for key, serialized_value in items:
+        writer.write("{" if is_empty else ",")
+        key = json.dumps(key, ensure_ascii=False)
+        writer.write(f"\n{INDENT * (depth + 1)}{key}: {serialized_value}")
+        is_empty = False
+    writer.write("{}" if is_empty else f"\n{INDENT * depth}}}")
+
+
+def _indent(serialized: str, depth: int) -> str:
+    # indents the lines of a value serialized with INDENT, but the first, which
+    # follows its key; JSON strings cannot contain line breaks
+    return serialized.replace("\n", "\n" + INDENT * depth)
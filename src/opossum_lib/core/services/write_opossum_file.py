@@ -1,49 +1,165 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from zipfile import ZIP_DEFLATED, ZipFile
+from zipfile import BadZipFile, ZipFile
 
 from pydantic import BaseModel
 
+from opossum_lib.core.services.atomic_output_file import atomic_output_file
 from opossum_lib.shared.constants import (
     COMPRESSION_LEVEL,
+    CONTENT_HASH_COMMENT_PREFIX,
+    INDEX_DB_NAME,
     INPUT_JSON_NAME,
     OUTPUT_JSON_NAME,
+    STANDARD_STREAM_PATH,
 )
+from opossum_lib.shared.entities.compressed_zip_entry import CompressedZipEntry
 from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+from opossum_lib.shared.services.compressed_zip_entry import (
+    compress_zip_entry,
+    deflate_zip_entry,
+)
+from opossum_lib.shared.services.opossum_index import build_opossum_index
+from opossum_lib.shared.services.zip_writer import ZipWriter
 
 
-def write_opossum_file(opossum_file_model: OpossumFileModel, file_path: Path) -> None:
-    file_path = _ensure_outfile_suffix(file_path)
-    with ZipFile(
-        file_path, "w", compression=ZIP_DEFLATED, compresslevel=COMPRESSION_LEVEL
-    ) as zip_file:
-        _write_input_json(opossum_file_model, zip_file)
-        _write_output_json_if_existing(opossum_file_model, zip_file)
+def write_opossum_file(
+    opossum_file_model: OpossumFileModel,
+    file_path: Path,
+    workers: int = 1,
+    skip_unchanged: bool = False,
+    with_index: bool = False,
+) -> None:
+    file_path = ensure_outfile_suffix(file_path)
+    contents = _serialize_contents(opossum_file_model, workers)
+    if with_index:
+        contents[INDEX_DB_NAME] = build_opossum_index(opossum_file_model.input_file)
+    content_hash = _get_content_hash(contents)
+    if skip_unchanged and _read_content_hash(file_path) == content_hash:
+        logging.info(f"{file_path} is up to date, skipping the rewrite")
+        return
 
+    with (
+        atomic_output_file(file_path) as output_file,
+        ZipWriter(output_file) as zip_writer,
+    ):
+        zip_writer.comment = CONTENT_HASH_COMMENT_PREFIX + content_hash.encode()
+        if workers > 1:
+            _write_contents_in_parallel(zip_writer, contents, workers)
+        else:
+            for sub_file_name, content in contents.items():
+                write_zip_entry(zip_writer, sub_file_name, content)
 
-def _write_output_json_if_existing(
-    opossum_file_model: OpossumFileModel, zip_file: ZipFile
-) -> None:
+
+def _serialize_contents(
+    opossum_file_model: OpossumFileModel, workers: int
+) -> dict[str, bytes | CompressedZipEntry]:
+    models: dict[str, BaseModel] = {INPUT_JSON_NAME: opossum_file_model.input_file}
     if opossum_file_model.output_file:
-        _write_json_to_zip(zip_file, OUTPUT_JSON_NAME, opossum_file_model.output_file)
+        models[OUTPUT_JSON_NAME] = opossum_file_model.output_file
 
+    if workers <= 1:
+        return {name: _serialize_entry(model) for name, model in models.items()}
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        futures = {
+            name: executor.submit(_serialize_entry, model)
+            for name, model in models.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _write_contents_in_parallel(
+    zip_writer: ZipWriter,
+    contents: dict[str, bytes | CompressedZipEntry],
+    workers: int,
+) -> None:
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for sub_file_name, content in contents.items():
+            if not isinstance(content, CompressedZipEntry):
+                content = compress_zip_entry(content, COMPRESSION_LEVEL, executor)
+            zip_writer.write(sub_file_name, content)
+
+
+def write_zip_entry(
+    zip_writer: ZipWriter, sub_file_name: str, content: bytes | CompressedZipEntry
+) -> None:
+    if not isinstance(content, CompressedZipEntry):
+        content = deflate_zip_entry(content, COMPRESSION_LEVEL)
+    zip_writer.write(sub_file_name, content)
 
-def _write_input_json(opossum_file_model: OpossumFileModel, zip_file: ZipFile) -> None:
-    _write_json_to_zip(zip_file, INPUT_JSON_NAME, opossum_file_model.input_file)
 
+def serialize_output_file(
+    output_file: OpossumOutputFileModel | RawOpossumOutputFileModel,
+) -> bytes | CompressedZipEntry:
+    # review results that were read from a .opossum file and not changed are
+    # copied as they are, without parsing and serializing them again
+    if isinstance(output_file, RawOpossumOutputFileModel):
+        return output_file.content
+    return _serialize(output_file)
 
-def _write_json_to_zip(zip_file: ZipFile, sub_file_name: str, model: BaseModel) -> None:
-    zip_file.writestr(
-        sub_file_name,
-        model.model_dump_json(
-            indent=4,
-            exclude_none=True,
-            by_alias=True,
-        ),
+
+def _serialize_entry(model: BaseModel) -> bytes | CompressedZipEntry:
+    if isinstance(model, OpossumOutputFileModel | RawOpossumOutputFileModel):
+        return serialize_output_file(model)
+    return _serialize(model)
+
+
+def _serialize(model: BaseModel) -> bytes:
+    return model.model_dump_json(
+        indent=4,
+        exclude_none=True,
+        by_alias=True,
+    ).encode()
+
+
+def _get_content_hash(contents: dict[str, bytes | CompressedZipEntry]) -> str:
+    return combine_entry_hashes(
+        {
+            sub_file_name: get_entry_hash(content)
+            for sub_file_name, content in contents.items()
+        }
     )
 
 
-def _ensure_outfile_suffix(outfile_path: Path) -> Path:
+def get_entry_hash(content: bytes | CompressedZipEntry) -> str:
+    # entries that are copied deflated are not inflated again, their CRC and
+    # size identify the content of the unchanged entry
+    if isinstance(content, CompressedZipEntry):
+        return f"crc32:{content.crc:08x}:{content.file_size}"
+    return hashlib.sha256(content).hexdigest()
+
+
+def combine_entry_hashes(entry_hashes: dict[str, str]) -> str:
+    # hashing the entries separately allows computing the hash while streaming
+    content_hash = hashlib.sha256()
+    for sub_file_name, entry_hash in sorted(entry_hashes.items()):
+        content_hash.update(f"{sub_file_name}:{entry_hash}\n".encode())
+    return content_hash.hexdigest()
+
+
+def _read_content_hash(file_path: Path) -> str | None:
+    try:
+        with ZipFile(file_path, "r") as zip_file:
+            comment = zip_file.comment
+    except (OSError, BadZipFile):
+        return None
+    if not comment.startswith(CONTENT_HASH_COMMENT_PREFIX):
+        return None
+    return comment.removeprefix(CONTENT_HASH_COMMENT_PREFIX).decode()
+
+
+def ensure_outfile_suffix(outfile_path: Path) -> Path:
+    if outfile_path == STANDARD_STREAM_PATH:
+        return outfile_path
     return outfile_path.with_suffix(".opossum")
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import glob
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.resource import convert_path_to_str
+from opossum_lib.core.services.atomic_output_file import atomic_output_file
+from opossum_lib.core.services.shard_opossum import OpossumShard
+from opossum_lib.core.services.write_opossum_file import (
+    ensure_outfile_suffix,
+    write_opossum_file,
+)
+from opossum_lib.shared.entities.opossum_manifest_model import (
+    OpossumManifestModel,
+    OpossumShardModel,
+)
+
+
+def write_opossum_shards(
+    shards: list[OpossumShard],
+    file_path: Path,
+    workers: int = 1,
+    skip_unchanged: bool = False,
+    with_index: bool = False,
+) -> Path:
+    # Writes <name>-001.opossum, <name>-002.opossum, ... and the manifest
+    # <name>.manifest.json next to the given output file. Returns the path of
+    # the manifest, which is written last.
+    file_path = ensure_outfile_suffix(file_path)
+    shard_paths = [
+        file_path.with_name(f"{file_path.stem}-{index:03d}.opossum")
+        for index in range(1, len(shards) + 1)
+    ]
+    write_shard = partial(
+        _write_shard, skip_unchanged=skip_unchanged, with_index=with_index
+    )
+    opossums = [shard.opossum for shard in shards]
+    if workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            list(executor.map(write_shard, opossums, shard_paths))
+    else:
+        list(map(write_shard, opossums, shard_paths))
+
+    manifest = OpossumManifestModel(
+        metadata=shards[0].opossum.scan_results.metadata.to_opossum_file_model(),
+        shards=[
+            OpossumShardModel(
+                file_name=shard_path.name,
+                paths=["/" + convert_path_to_str(path) for path in shard.paths],
+                number_of_resources=shard.number_of_resources,
+            )
+            for shard, shard_path in zip(shards, shard_paths, strict=True)
+        ],
+    )
+    manifest_path = get_manifest_path(file_path)
+    with atomic_output_file(manifest_path) as manifest_file:
+        manifest_file.write(
+            manifest.model_dump_json(
+                indent=4, exclude_none=True, by_alias=True
+            ).encode()
+        )
+    # shards of a previous run with more shards are no longer referenced
+    _remove_stale_shards(file_path, shard_paths)
+    return manifest_path
+
+
+def get_manifest_path(file_path: Path) -> Path:
+    return ensure_outfile_suffix(file_path).with_suffix(".manifest.json")
+
+
+def _remove_stale_shards(file_path: Path, shard_paths: list[Path]) -> None:
+    shard_name = re.compile(rf"{re.escape(file_path.stem)}-\d{{3,}}\.opossum")
+    for path in file_path.parent.glob(f"{glob.escape(file_path.stem)}-*.opossum"):
+        if shard_name.fullmatch(path.name) and path not in shard_paths:
+            path.unlink(missing_ok=True)
+
+
+def _write_shard(
+    opossum: Opossum, file_path: Path, skip_unchanged: bool, with_index: bool
+) -> None:
+    write_opossum_file(
+        opossum.to_opossum_file_model(),
+        file_path,
+        skip_unchanged=skip_unchanged,
+        with_index=with_index,
+    )
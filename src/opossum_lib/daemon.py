@@ -0,0 +1,222 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import logging
+import signal
+import socket
+import sys
+from collections.abc import AsyncIterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from opossum_lib.core.entities.ingest_filter import IngestFilter
+from opossum_lib.core.services.generate_impl import (
+    check_generate_options,
+    generate_impl,
+)
+from opossum_lib.core.services.input_reader import InputReader
+from opossum_lib.core.services.run_in_executor import run_in_executor
+from opossum_lib.core.services.write_opossum_file import ensure_outfile_suffix
+from opossum_lib.core.services.write_opossum_shards import get_manifest_path
+from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
+    OpossumFileReader,
+)
+from opossum_lib.input_formats.scancode.services.scancode_file_reader import (
+    ScancodeFileReader,
+)
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+from opossum_lib.shared.services.validate_model import DEFAULT_SAMPLE_PERCENTAGE
+
+# maximum size of a single job or result line
+MAX_LINE_SIZE = 16 * 1024 * 1024
+
+
+class GenerateJob(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    id: str | int | None = None
+    opossum_files: list[str] = []
+    scancode_json_files: list[str] = []
+    outfile: str = "output.opossum"
+    use_mmap: bool = False
+    skip_unchanged: bool = False
+    max_memory: int | None = None
+    with_index: bool = False
+    shard: bool = False
+    shard_max_nodes: int | None = None
+    validation: ValidationPolicy = ValidationPolicy.FULL
+    sample_percentage: float = DEFAULT_SAMPLE_PERCENTAGE
+    deduplicate: bool = False
+    hoist: bool = False
+    compact_ids: bool = False
+    ingest_filter: IngestFilter | None = None
+
+
+class JobResult(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    id: str | int | None = None
+    outfile: str | None = None
+    error: str | None = None
+
+
+def run_job(job: GenerateJob) -> JobResult:
+    # runs in a worker process, jobs use a single worker each as the
+    # parallelism comes from running several jobs at once
+    if len(job.opossum_files) + len(job.scancode_json_files) != 1:
+        return JobResult(id=job.id, error="Exactly one input file is required.")
+    options_error = check_generate_options(
+        Path(job.outfile),
+        skip_unchanged=job.skip_unchanged,
+        max_memory=job.max_memory,
+        with_index=job.with_index,
+        shard=job.shard,
+        shard_max_nodes=job.shard_max_nodes,
+        validation=job.validation,
+        has_scancode_input=bool(job.scancode_json_files),
+    )
+    if options_error is not None:
+        return JobResult(id=job.id, error=options_error)
+    input_readers: list[InputReader] = []
+    input_readers += [
+        ScancodeFileReader(
+            Path(path),
+            deduplicate=job.deduplicate,
+            ingest_filter=job.ingest_filter,
+        )
+        for path in job.scancode_json_files
+    ]
+    input_readers += [
+        OpossumFileReader(
+            Path(path),
+            use_mmap=job.use_mmap,
+            validation=job.validation,
+            sample_percentage=job.sample_percentage,
+            ingest_filter=job.ingest_filter,
+        )
+        for path in job.opossum_files
+    ]
+    generate_impl(
+        input_readers=input_readers,
+        output_file=Path(job.outfile),
+        skip_unchanged=job.skip_unchanged,
+        max_memory=job.max_memory,
+        with_index=job.with_index,
+        shard=job.shard,
+        shard_max_nodes=job.shard_max_nodes,
+        hoist=job.hoist,
+        compact_ids=job.compact_ids,
+    )
+    outfile = ensure_outfile_suffix(Path(job.outfile))
+    if job.shard or job.shard_max_nodes is not None:
+        outfile = get_manifest_path(outfile)
+    return JobResult(id=job.id, outfile=str(outfile))
+
+
+async def _process_line(line: bytes, executor: Executor) -> JobResult:
+    try:
+        job = GenerateJob.model_validate_json(line)
+    except ValidationError as e:
+        return JobResult(error=f"Invalid job: {e}")
+    try:
+        return await run_in_executor(executor, partial(run_job, job))
+    except Exception as e:
+        return JobResult(id=job.id, error=str(e))
+
+
+class _ResultWriter:
+    def __init__(self, writer: asyncio.StreamWriter | None = None):
+        self._writer = writer
+
+    async def __call__(self, result: JobResult) -> None:
+        line = result.model_dump_json(exclude_none=True) + "\n"
+        if self._writer is None:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        else:
+            self._writer.write(line.encode())
+            await self._writer.drain()
+
+
+async def _serve_stream(
+    lines: AsyncIterator[bytes], write: _ResultWriter, executor: Executor
+) -> None:
+    # jobs of one stream run concurrently, results are written when done
+    tasks = set()
+    async for line in lines:
+        if not line.strip():
+            continue
+        task = asyncio.create_task(_process_and_write(line, executor, write))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    await asyncio.gather(*tasks)
+
+
+async def _process_and_write(
+    line: bytes, executor: Executor, write: _ResultWriter
+) -> None:
+    await write(await _process_line(line, executor))
+
+
+def serve(socket_path: Path | None, workers: int) -> None:
+    # The worker processes stay alive between jobs, so the modules are only
+    # imported once per process.
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_initialize_worker
+    ) as executor:
+        if socket_path is None:
+            asyncio.run(_serve_stdin(executor))
+        else:
+            asyncio.run(_serve_socket(socket_path, executor))
+
+
+def _initialize_worker() -> None:
+    # stdout carries the results when serving stdin, so output of the
+    # workers is redirected to stderr
+    sys.stdout = sys.stderr
+
+
+async def _serve_stdin(executor: Executor) -> None:
+    await _serve_stream(_read_stdin_lines(), _ResultWriter(), executor)
+
+
+async def _read_stdin_lines() -> AsyncIterator[bytes]:
+    # Standard input is read in a thread, as the event loop can only watch
+    # pipes and sockets, but not regular files, e.g. "serve < jobs.jsonl".
+    while line := await asyncio.to_thread(sys.stdin.buffer.readline, MAX_LINE_SIZE):
+        yield line
+
+
+async def _serve_socket(socket_path: Path, executor: Executor) -> None:
+    async def handle_connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            await _serve_stream(reader, _ResultWriter(writer), executor)
+        finally:
+            writer.close()
+
+    socket_path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(
+        handle_connection, path=socket_path, limit=MAX_LINE_SIZE
+    )
+    logging.info(f"Listening on {socket_path}")
+    stop = asyncio.Event()
+    for stop_signal in [signal.SIGINT, signal.SIGTERM]:
+        asyncio.get_running_loop().add_signal_handler(stop_signal, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        socket_path.unlink(missing_ok=True)
+
+
+def submit(socket_path: Path, job: GenerateJob) -> JobResult:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path))
+        connection.sendall(job.model_dump_json().encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile("rb") as response:
+            return JobResult.model_validate_json(response.readline())
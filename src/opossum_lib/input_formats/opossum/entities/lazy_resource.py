@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import PurePath
+from typing import TYPE_CHECKING, Any
+
+from pydantic import PrivateAttr
+
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.shared.entities.opossum_input_file_model import (
+    ResourceInFileModel,
+    is_file_resource,
+)
+
+type AttributionLookup = Callable[[PurePath], list[OpossumPackage]]
+# decides whether a node of the input file is converted to a resource
+type NodeFilter = Callable[[PurePath, ResourceInFileModel], bool]
+
+LAZY_FIELDS = ("attributions", "children")
+
+
+class LazyResource(Resource):
+    # A resource of a .opossum file whose attributions and children are only
+    # converted on first access, from the nested resources of the input file.
+    # Until then, these fields are not set and the accessor below creates them.
+    # The children are lazy themselves, so only the visited part of the tree
+    # is converted and checked. Loading is not a modification, so it keeps
+    # derived data like the digests valid.
+    _node: ResourceInFileModel = PrivateAttr(default=1)
+    _attribution_lookup: AttributionLookup | None = PrivateAttr(default=None)
+    _node_filter: NodeFilter | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_file_model(
+        cls,
+        path: PurePath,
+        node: ResourceInFileModel,
+        attribution_lookup: AttributionLookup,
+        node_filter: NodeFilter | None = None,
+    ) -> LazyResource:
+        if isinstance(node, dict):
+            resource_type = ResourceType.FOLDER
+        elif is_file_resource(node):
+            resource_type = ResourceType.FILE
+        else:
+            raise RuntimeError(f"Invalid resource at {path}")
+        resource = cls(path=path, type=resource_type)
+        resource._node = node
+        resource._attribution_lookup = attribution_lookup
+        resource._node_filter = node_filter
+        for name in LAZY_FIELDS:
+            del resource.__dict__[name]
+        return resource
+
+    @property
+    def is_loaded(self) -> bool:
+        return all(name in self.__dict__ for name in LAZY_FIELDS)
+
+    if not TYPE_CHECKING:
+        # only called for attributes that are not set, like the lazy fields
+        # before their first access
+        def __getattr__(self, name: str) -> Any:
+            if name == "attributions":
+                value = self._create_attributions()
+            elif name == "children":
+                value = self._create_children()
+            else:
+                return super().__getattr__(name)
+            self.__dict__[name] = self._tracked(name, value)
+            return self.__dict__[name]
+
+    def _create_attributions(self) -> list[OpossumPackage]:
+        if self._attribution_lookup is None:
+            return []
+        return self._attribution_lookup(self.path)
+
+    def _create_children(self) -> dict[str, Resource]:
+        node, node_filter = self._node, self._node_filter
+        # the nested resources are not needed anymore once converted
+        self._node = 1
+        if not isinstance(node, dict) or self._attribution_lookup is None:
+            return {}
+        return {
+            name: LazyResource.from_file_model(
+                self.path / name, child, self._attribution_lookup, node_filter
+            )
+            for name, child in node.items()
+            if node_filter is None or node_filter(self.path / name, child)
+        }
+
+    def _load_subtree(self) -> None:
+        stack: list[Resource] = [self]
+        while stack:
+            resource = stack.pop()
+            _ = resource.attributions
+            stack.extend(resource.children.values())
+
+    # pydantic compares and serializes the fields that are set, so these load
+    # them first
+
+    def __eq__(self, other: object) -> bool:
+        # equal to eagerly converted resources with the same content
+        if not isinstance(other, Resource):
+            return NotImplemented
+        return (self.path, self.type, self.attributions, self.children) == (
+            other.path,
+            other.type,
+            other.attributions,
+            other.children,
+        )
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        self._load_subtree()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        self._load_subtree()
+        return super().model_dump_json(**kwargs)
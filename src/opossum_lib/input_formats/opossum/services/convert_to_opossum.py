@@ -2,7 +2,9 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+from collections.abc import Callable, Iterator
 from copy import deepcopy
+from functools import partial
 from pathlib import PurePath
 
 from opossum_lib.core.entities.base_url_for_sources import BaseUrlsForSources
@@ -10,18 +12,21 @@ from opossum_lib.core.entities.external_attribution_source import (
     ExternalAttributionSource,
 )
 from opossum_lib.core.entities.frequent_license import FrequentLicense
+from opossum_lib.core.entities.ingest_filter import IngestFilter
 from opossum_lib.core.entities.metadata import Metadata
 from opossum_lib.core.entities.opossum import (
     Opossum,
 )
 from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.opossum_stream import OpossumStream
 from opossum_lib.core.entities.resource import (
     Resource,
     ResourceType,
-    _convert_path_to_str,
+    convert_path_to_str,
 )
 from opossum_lib.core.entities.scan_results import ScanResults
 from opossum_lib.core.entities.source_info import SourceInfo
+from opossum_lib.input_formats.opossum.entities.lazy_resource import LazyResource
 from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
 from opossum_lib.shared.entities.opossum_input_file_model import (
     ExternalAttributionSourceModel as FileExternalAttributionSource,
@@ -35,24 +40,86 @@ from opossum_lib.shared.entities.opossum_input_file_model import (
     ResourceInFileModel,
     ResourcePathModel,
     SourceInfoModel,
+    is_file_resource,
 )
 
+# converts the resources of a file with the filtered attributions and returns
+# them with the ids of the attributions that are used
+type _ResourceConverter[R] = Callable[
+    [
+        ResourceInFileModel,
+        dict[OpossumPackageIdentifierModel, OpossumPackageModel],
+        dict[ResourcePathModel, list[OpossumPackageIdentifierModel]],
+        IngestFilter | None,
+    ],
+    tuple[R, set[OpossumPackageIdentifierModel]],
+]
+
 
-def convert_to_opossum(opossum_file_model: OpossumFileModel) -> Opossum:
+def convert_to_opossum(
+    opossum_file_model: OpossumFileModel,
+    lazy: bool = False,
+    ingest_filter: IngestFilter | None = None,
+) -> Opossum:
     opossum = Opossum(
-        scan_results=_convert_to_scan_results(opossum_file_model.input_file),
+        scan_results=_convert_to_scan_results(
+            opossum_file_model.input_file, lazy, ingest_filter
+        ),
         review_results=opossum_file_model.output_file,
     )
     return opossum
 
 
+def convert_to_opossum_stream(
+    opossum_file_model: OpossumFileModel,
+    ingest_filter: IngestFilter | None = None,
+) -> OpossumStream:
+    scan_results, resources = _convert_scan_results_and_resources(
+        opossum_file_model.input_file, _convert_to_resource_stream, ingest_filter
+    )
+    return OpossumStream(
+        scan_results=scan_results,
+        resources=resources,
+        review_results=opossum_file_model.output_file,
+    )
+
+
 def _convert_to_scan_results(
     opossum_input_file_model: OpossumInputFileModel,
+    lazy: bool = False,
+    ingest_filter: IngestFilter | None = None,
 ) -> ScanResults:
-    resources, used_attribution_ids = _convert_to_resource_tree(
-        resources=opossum_input_file_model.resources,
-        external_attributions=opossum_input_file_model.external_attributions,
-        resources_to_attributions=opossum_input_file_model.resources_to_attributions,
+    convert_resources = (
+        _convert_to_lazy_resource_tree if lazy else _convert_to_resource_tree
+    )
+    scan_results, resources = _convert_scan_results_and_resources(
+        opossum_input_file_model, convert_resources, ingest_filter
+    )
+    return scan_results.model_copy(update={"resources": resources})
+
+
+def _convert_scan_results_and_resources[R](
+    opossum_input_file_model: OpossumInputFileModel,
+    convert_resources: _ResourceConverter[R],
+    ingest_filter: IngestFilter | None = None,
+) -> tuple[ScanResults, R]:
+    # the scan results are returned without resources
+    external_attributions = opossum_input_file_model.external_attributions
+    resources_to_attributions = opossum_input_file_model.resources_to_attributions
+    excluded_attribution_ids: set[OpossumPackageIdentifierModel] = set()
+    if ingest_filter is not None:
+        external_attributions, resources_to_attributions, excluded_attribution_ids = (
+            _filter_attributions(
+                ingest_filter, external_attributions, resources_to_attributions
+            )
+        )
+        if not ingest_filter.filters_paths:
+            ingest_filter = None
+    resources, used_attribution_ids = convert_resources(
+        opossum_input_file_model.resources,
+        external_attributions,
+        resources_to_attributions,
+        ingest_filter,
     )
     frequent_licenses = (
         opossum_input_file_model.frequent_licenses
@@ -72,12 +139,10 @@ def _convert_to_scan_results(
         for name, attribution_source in file_attribution_sources.items()
     }
 
-    attribution_with_id = _convert_to_attribution_with_id(
-        opossum_input_file_model.external_attributions
-    )
-    return ScanResults(
+    attribution_with_id = _convert_to_attribution_with_id(external_attributions)
+    scan_results = ScanResults(
         metadata=_convert_to_metadata(opossum_input_file_model.metadata),
-        resources=resources,
+        resources=[],
         attribution_breakpoints=deepcopy(
             opossum_input_file_model.attribution_breakpoints
         ),
@@ -87,9 +152,64 @@ def _convert_to_scan_results(
         base_urls_for_sources=base_urls_for_sources,
         attribution_to_id=attribution_with_id,
         unassigned_attributions=_get_unassigned_attributions(
-            used_attribution_ids, opossum_input_file_model.external_attributions
+            used_attribution_ids | excluded_attribution_ids, external_attributions
         ),
     )
+    return scan_results, resources
+
+
+def _filter_attributions(
+    ingest_filter: IngestFilter,
+    external_attributions: dict[OpossumPackageIdentifierModel, OpossumPackageModel],
+    resources_to_attributions: dict[
+        ResourcePathModel, list[OpossumPackageIdentifierModel]
+    ],
+) -> tuple[
+    dict[OpossumPackageIdentifierModel, OpossumPackageModel],
+    dict[ResourcePathModel, list[OpossumPackageIdentifierModel]],
+    set[OpossumPackageIdentifierModel],
+]:
+    # Drops the attributions and the assignments to paths that are excluded
+    # before anything is converted. The attributions of excluded paths are
+    # returned as well, so that they are not kept as unassigned attributions.
+    if ingest_filter.filters_attributions:
+        external_attributions = {
+            id: package
+            for id, package in external_attributions.items()
+            if ingest_filter.includes_attribution(
+                package.license_name, package.attribution_confidence
+            )
+        }
+    filtered_resources_to_attributions = {}
+    excluded_attribution_ids = set()
+    for path, attribution_ids in resources_to_attributions.items():
+        if not ingest_filter.includes_path(path):
+            excluded_attribution_ids.update(attribution_ids)
+            continue
+        kept_ids = [id for id in attribution_ids if id in external_attributions]
+        if kept_ids:
+            filtered_resources_to_attributions[path] = kept_ids
+    return (
+        external_attributions,
+        filtered_resources_to_attributions,
+        excluded_attribution_ids,
+    )
+
+
+def _is_node_kept(
+    ingest_filter: IngestFilter, path: PurePath, node: ResourceInFileModel
+) -> bool:
+    # folders that are not included may still contain included resources
+    if ingest_filter.matches_exclude_paths(path):
+        return False
+    return isinstance(node, dict) or ingest_filter.matches_include_paths(path)
+
+
+def _is_optional_folder(ingest_filter: IngestFilter, resource: Resource) -> bool:
+    return (
+        resource.type == ResourceType.FOLDER
+        and not ingest_filter.matches_include_paths(resource.path)
+    )
 
 
 def _get_unassigned_attributions(
@@ -142,63 +262,198 @@ def _convert_to_resource_tree(
         ResourcePathModel,
         list[OpossumPackageIdentifierModel],
     ],
+    ingest_filter: IngestFilter | None = None,
 ) -> tuple[list[Resource], set[OpossumPackageIdentifierModel]]:
+    # The tree is built iteratively and the type of each node is checked on
+    # the way, so deep trees do not exceed the recursion limit. This is the
+    # validation of the resources of files read, without a separate pass.
     used_attribution_ids = set()
+    # folders that are kept only if they contain included resources
+    optional_folders: list[tuple[dict[str, Resource], str]] = []
 
-    def generate_child_resource(
-        current_path: PurePath,
-        to_insert: ResourceInFileModel,
-    ) -> Resource:
-        path = current_path
-        current_path_as_string = _convert_path_to_str(current_path)
-        if not current_path_as_string.startswith("/"):
-            current_path_as_string = "/" + current_path_as_string
-        attributions, attribution_ids = _get_applicable_attributions(
-            current_path_as_string
-        )
+    def get_applicable_attributions(path: PurePath) -> list[OpossumPackage]:
+        path_as_string = convert_path_to_str(path)
+        if not path_as_string.startswith("/"):
+            path_as_string = "/" + path_as_string
+        attribution_ids = resources_to_attributions.get(path_as_string, [])
         used_attribution_ids.update(attribution_ids)
-        if isinstance(to_insert, int):
-            resource_type = ResourceType.FILE
-            return Resource(
-                type=resource_type,
-                path=path,
-                attributions=attributions,
-            )
-        else:
-            resource_type = ResourceType.FOLDER
-            return Resource(
+        return [_convert_package(external_attributions[id]) for id in attribution_ids]
+
+    def create_children(
+        parent_path: PurePath, node: dict[str, ResourceInFileModel]
+    ) -> list[tuple[str, Resource, ResourceInFileModel]]:
+        children = []
+        for name, child in node.items():
+            # like parent_path / name, but joining the string of the parent
+            # keeps converting the paths of deep trees to strings fast
+            path = PurePath(str(parent_path), name)
+            if ingest_filter is not None and not _is_node_kept(
+                ingest_filter, path, child
+            ):
+                continue
+            if isinstance(child, dict):
+                resource_type = ResourceType.FOLDER
+            elif is_file_resource(child):
+                resource_type = ResourceType.FILE
+            else:
+                raise RuntimeError(f"Invalid resource at {path}")
+            resource = Resource(
                 type=resource_type,
                 path=path,
-                attributions=attributions,
-                children={
-                    relative_path: generate_child_resource(
-                        current_path / relative_path, child
-                    )
-                    for relative_path, child in to_insert.items()
-                },
+                attributions=get_applicable_attributions(path),
             )
+            children.append((name, resource, child))
+        return children
+
+    if not isinstance(resources, dict):
+        raise RuntimeError("Root node must not be of file type")
+    roots: dict[str, Resource] = {}
+    stack: list[tuple[dict[str, Resource], PurePath, ResourceInFileModel]] = [
+        (roots, PurePath(""), resources)
+    ]
+    while stack:
+        children, parent_path, node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+        for name, child, child_node in create_children(parent_path, node):
+            children[name] = child
+            stack.append((child.children, child.path, child_node))
+            if ingest_filter is not None and _is_optional_folder(ingest_filter, child):
+                optional_folders.append((children, name))
+    # the folders were added top-down, so nested empty folders are removed first
+    for children, name in reversed(optional_folders):
+        if not children[name].children:
+            del children[name]
+    return list(roots.values()), used_attribution_ids
+
 
-    def _get_applicable_attributions(
-        current_path_as_string: str,
-    ) -> tuple[list[OpossumPackage], set[OpossumPackageIdentifierModel]]:
+class _AttributionLookup:
+    # Converts the attributions of a path on request, each attribution only
+    # once. A class instead of a closure, so that lazy resources can be pickled.
+    def __init__(
+        self,
+        external_attributions: dict[
+            OpossumPackageIdentifierModel,
+            OpossumPackageModel,
+        ],
+        resources_to_attributions: dict[
+            ResourcePathModel,
+            list[OpossumPackageIdentifierModel],
+        ],
+    ):
+        self._external_attributions = external_attributions
+        self._resources_to_attributions = resources_to_attributions
+        self._packages: dict[OpossumPackageIdentifierModel, OpossumPackage] = {}
+
+    def __call__(self, path: PurePath) -> list[OpossumPackage]:
+        path_as_string = convert_path_to_str(path)
+        if not path_as_string.startswith("/"):
+            path_as_string = "/" + path_as_string
         attributions = []
-        attribution_ids: list[str] = []
-        if current_path_as_string in resources_to_attributions:
-            attribution_ids = resources_to_attributions[current_path_as_string]
-            attributions = [
-                _convert_package(external_attributions[id]) for id in attribution_ids
-            ]
-        return attributions, set(attribution_ids)
-
-    root_path = PurePath("")
-
-    if isinstance(resources, dict):
-        return [
-            generate_child_resource(root_path / relative_path, child)
-            for relative_path, child in resources.items()
-        ], used_attribution_ids
-    else:
+        for id in self._resources_to_attributions.get(path_as_string, []):
+            if id not in self._packages:
+                self._packages[id] = _convert_package(self._external_attributions[id])
+            attributions.append(self._packages[id])
+        return attributions
+
+
+def _convert_to_lazy_resource_tree(
+    resources: ResourceInFileModel,
+    external_attributions: dict[
+        OpossumPackageIdentifierModel,
+        OpossumPackageModel,
+    ],
+    resources_to_attributions: dict[
+        ResourcePathModel,
+        list[OpossumPackageIdentifierModel],
+    ],
+    ingest_filter: IngestFilter | None = None,
+) -> tuple[list[Resource], set[OpossumPackageIdentifierModel]]:
+    # the attributions are assumed to be used if they are assigned to any path,
+    # the resources are not traversed to check that the paths exist
+    used_attribution_ids = {
+        id
+        for attribution_ids in resources_to_attributions.values()
+        for id in attribution_ids
+    }
+    get_attributions = _AttributionLookup(
+        external_attributions, resources_to_attributions
+    )
+    # Without loading the whole subtree, it is unknown whether a folder that
+    # is not included contains included resources, so such folders are kept
+    # and may appear empty.
+    node_filter = (
+        None if ingest_filter is None else partial(_is_node_kept, ingest_filter)
+    )
+    if not isinstance(resources, dict):
+        raise RuntimeError("Root node must not be of file type")
+    return [
+        LazyResource.from_file_model(
+            PurePath("") / name, child, get_attributions, node_filter
+        )
+        for name, child in resources.items()
+        if node_filter is None or node_filter(PurePath("") / name, child)
+    ], used_attribution_ids
+
+
+def _convert_to_resource_stream(
+    resources: ResourceInFileModel,
+    external_attributions: dict[
+        OpossumPackageIdentifierModel,
+        OpossumPackageModel,
+    ],
+    resources_to_attributions: dict[
+        ResourcePathModel,
+        list[OpossumPackageIdentifierModel],
+    ],
+    ingest_filter: IngestFilter | None = None,
+) -> tuple[Iterator[Resource], set[OpossumPackageIdentifierModel]]:
+    # Like the lazy tree, the attributions are assumed to be used if they are
+    # assigned to any path. The resources are converted in the order of the
+    # tree while they are consumed. Folders that are not included are left
+    # out, they are recreated if they contain included resources.
+    used_attribution_ids = {
+        id
+        for attribution_ids in resources_to_attributions.values()
+        for id in attribution_ids
+    }
+    get_attributions = _AttributionLookup(
+        external_attributions, resources_to_attributions
+    )
+
+    def stream_resources(
+        root_children: dict[str, ResourceInFileModel],
+    ) -> Iterator[Resource]:
+        stack = [
+            (PurePath(name), child) for name, child in reversed(root_children.items())
+        ]
+        while stack:
+            path, node = stack.pop()
+            if ingest_filter is not None and not _is_node_kept(
+                ingest_filter, path, node
+            ):
+                continue
+            if isinstance(node, dict):
+                resource_type = ResourceType.FOLDER
+                # like parent_path / name, see _convert_to_resource_tree
+                stack.extend(
+                    (PurePath(str(path), name), child)
+                    for name, child in reversed(node.items())
+                )
+            elif is_file_resource(node):
+                resource_type = ResourceType.FILE
+            else:
+                raise RuntimeError(f"Invalid resource at {path}")
+            if ingest_filter is None or ingest_filter.matches_include_paths(path):
+                yield Resource(
+                    path=path,
+                    type=resource_type,
+                    attributions=get_attributions(path),
+                )
+
+    if not isinstance(resources, dict):
         raise RuntimeError("Root node must not be of file type")
+    return stream_resources(resources), used_attribution_ids
 
 
 def _convert_to_attribution_with_id(
@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from collections.abc import Iterator
+from contextlib import closing
+from itertools import batched
+from pathlib import Path
+from typing import Any
+from zipfile import ZipFile
+
+from opossum_lib.core.services.attribution_store import INSERT_BATCH_SIZE
+from opossum_lib.shared.constants import INPUT_JSON_NAME
+from opossum_lib.shared.entities.opossum_diff_model import (
+    DiffChangeModel,
+    OpossumDiffEntryModel,
+)
+
+DIFF_SCHEMA = """
+CREATE TABLE attributions (
+    id TEXT PRIMARY KEY,
+    attribution TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE resources (
+    path TEXT PRIMARY KEY,
+    is_file INTEGER,
+    attribution_ids TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+type _Row = tuple[Any, ...]
+
+
+def diff_opossum_files(
+    old_path: Path, new_path: Path
+) -> Iterator[OpossumDiffEntryModel]:
+    # Each input.json is reduced to its paths and the content hashes of their
+    # attributions in a temporary on-disk database, one file after the other.
+    # The databases are then compared by a merge of their sorted rows, so only
+    # one parsed file is in memory at a time.
+    with (
+        closing(_create_diff_database(old_path)) as old,
+        closing(_create_diff_database(new_path)) as new,
+    ):
+        yield from _diff_attributions(old, new)
+        yield from _diff_resources(old, new)
+
+
+def _create_diff_database(path: Path) -> sqlite3.Connection:
+    input_json = _read_input_json(path)
+    database = sqlite3.connect("")
+    database.executescript(DIFF_SCHEMA)
+
+    content_ids = {}
+    attribution_rows = []
+    for attribution_id, attribution in input_json.get(
+        "externalAttributions", {}
+    ).items():
+        serialized = json.dumps(attribution, sort_keys=True, separators=(",", ":"))
+        content_id = hashlib.sha256(serialized.encode()).hexdigest()
+        content_ids[attribution_id] = content_id
+        attribution_rows.append((content_id, serialized))
+    _insert(
+        database, "INSERT OR IGNORE INTO attributions VALUES (?, ?)", attribution_rows
+    )
+
+    resources_to_attributions = {
+        _normalize_path(path): ids
+        for path, ids in input_json.get("resourcesToAttributions", {}).items()
+    }
+
+    def to_row(path: str, is_file: bool | None) -> _Row:
+        ids = resources_to_attributions.pop(path, [])
+        attribution_ids = sorted({content_ids[id] for id in ids if id in content_ids})
+        return path, is_file, ",".join(attribution_ids)
+
+    def resource_rows() -> Iterator[_Row]:
+        stack = [("", input_json.get("resources", {}))]
+        while stack:
+            parent_path, children = stack.pop()
+            for name, child in children.items():
+                path = f"{parent_path}/{name}"
+                is_file = not isinstance(child, dict)
+                yield to_row(path, is_file)
+                if not is_file:
+                    stack.append((path, child))
+        # attributions of paths that are missing in the resources
+        for path in list(resources_to_attributions):
+            yield to_row(path, None)
+
+    _insert(
+        database, "INSERT OR REPLACE INTO resources VALUES (?, ?, ?)", resource_rows()
+    )
+    return database
+
+
+def _read_input_json(path: Path) -> Any:
+    with ZipFile(path, "r") as zip_file:
+        if INPUT_JSON_NAME not in zip_file.namelist():
+            logging.error(
+                f"Opossum file {path} is corrupt and does not contain "
+                f"'{INPUT_JSON_NAME}'"
+            )
+            sys.exit(1)
+        with zip_file.open(INPUT_JSON_NAME) as input_file:
+            return json.load(input_file)
+
+
+def _insert(database: sqlite3.Connection, statement: str, rows: Any) -> None:
+    for batch in batched(rows, INSERT_BATCH_SIZE, strict=False):
+        database.executemany(statement, batch)
+    database.commit()
+
+
+def _normalize_path(path: str) -> str:
+    return "/" + path.strip("/")
+
+
+def _diff_attributions(
+    old: sqlite3.Connection, new: sqlite3.Connection
+) -> Iterator[OpossumDiffEntryModel]:
+    query = "SELECT id, attribution FROM attributions ORDER BY id"
+    for old_row, new_row in _merge(old.execute(query), new.execute(query)):
+        if old_row is None and new_row is not None:
+            yield _attribution_entry(DiffChangeModel.ADDED, new_row)
+        elif new_row is None and old_row is not None:
+            yield _attribution_entry(DiffChangeModel.REMOVED, old_row)
+
+
+def _attribution_entry(change: DiffChangeModel, row: _Row) -> OpossumDiffEntryModel:
+    attribution_id, attribution = row
+    return OpossumDiffEntryModel(
+        change=change,
+        attribution_id=attribution_id,
+        attribution=json.loads(attribution),
+    )
+
+
+def _diff_resources(
+    old: sqlite3.Connection, new: sqlite3.Connection
+) -> Iterator[OpossumDiffEntryModel]:
+    query = "SELECT path, is_file, attribution_ids FROM resources ORDER BY path"
+    for old_row, new_row in _merge(old.execute(query), new.execute(query)):
+        old_ids = _split_ids(old_row)
+        new_ids = _split_ids(new_row)
+        if old_row is None:
+            change = DiffChangeModel.ADDED
+        elif new_row is None:
+            change = DiffChangeModel.REMOVED
+        elif old_row[1] != new_row[1] or old_ids != new_ids:
+            change = DiffChangeModel.CHANGED
+        else:
+            continue
+        row = new_row if new_row is not None else old_row
+        assert row is not None
+        path, is_file, _ = row
+        yield OpossumDiffEntryModel(
+            change=change,
+            path=path if is_file is not False else path + "/",
+            is_file=None if is_file is None else bool(is_file),
+            added_attribution_ids=sorted(new_ids - old_ids),
+            removed_attribution_ids=sorted(old_ids - new_ids),
+        )
+
+
+def _split_ids(row: _Row | None) -> set[str]:
+    if row is None or not row[2]:
+        return set()
+    return set(row[2].split(","))
+
+
+def _merge(
+    old_rows: Iterator[_Row], new_rows: Iterator[_Row]
+) -> Iterator[tuple[_Row | None, _Row | None]]:
+    # pairs the rows of two iterators sorted by their first column
+    old_row = next(old_rows, None)
+    new_row = next(new_rows, None)
+    while old_row is not None or new_row is not None:
+        if new_row is None or (old_row is not None and old_row[0] < new_row[0]):
+            yield old_row, None
+            old_row = next(old_rows, None)
+        elif old_row is None or new_row[0] < old_row[0]:
+            yield None, new_row
+            new_row = next(new_rows, None)
+        else:
+            yield old_row, new_row
+            old_row = next(old_rows, None)
+            new_row = next(new_rows, None)
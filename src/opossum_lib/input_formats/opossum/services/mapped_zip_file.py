@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import IO, cast
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile, ZipInfo
+
+from opossum_lib.shared.services.compressed_zip_entry import (
+    ENCRYPTED_FLAG,
+    LOCAL_FILE_HEADER_SIGNATURE,
+    LOCAL_FILE_HEADER_SIZE,
+)
+
+
+# Read-only zip archive that inflates its entries straight from a memory map
+# into a single bytes object, avoiding the intermediate buffers of regular file
+# reads. Other compression methods and encrypted entries use the regular path.
+class MappedZipFile(ZipFile):
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            # the memory map keeps its own handle to the file
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            super().__init__(cast(IO[bytes], self._buffer), "r")
+        except Exception:
+            self._buffer.close()
+            raise
+        self.filename = str(path)
+
+    @property
+    def buffer(self) -> IO[bytes]:
+        # the memory map of the complete file
+        return cast(IO[bytes], self._buffer)
+
+    def read(self, name: str | ZipInfo, pwd: bytes | None = None) -> bytes:
+        info = name if isinstance(name, ZipInfo) else self.getinfo(name)
+        if (
+            info.compress_type not in (ZIP_STORED, ZIP_DEFLATED)
+            or info.flag_bits & ENCRYPTED_FLAG
+        ):
+            return super().read(name, pwd)
+
+        start = self._get_data_offset(info)
+        with (
+            memoryview(self._buffer) as view,
+            view[start : start + info.compress_size] as data,
+        ):
+            if info.compress_type == ZIP_DEFLATED:
+                content = zlib.decompress(data, -zlib.MAX_WBITS, info.file_size)
+            else:
+                content = bytes(data)
+
+        if zlib.crc32(content) != info.CRC:
+            raise BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+        return content
+
+    def close(self) -> None:
+        super().close()
+        self._buffer.close()
+
+    def _get_data_offset(self, info: ZipInfo) -> int:
+        header_end = info.header_offset + LOCAL_FILE_HEADER_SIZE
+        header = self._buffer[info.header_offset : header_end]
+        if header[:4] != LOCAL_FILE_HEADER_SIGNATURE:
+            raise BadZipFile(f"Bad local file header for file {info.filename!r}")
+        name_length: int
+        extra_length: int
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        return header_end + name_length + extra_length
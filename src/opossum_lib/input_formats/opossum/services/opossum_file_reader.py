@@ -1,72 +1,191 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
+import io
 import json
 import logging
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO, Any, NoReturn
 from zipfile import ZipFile
 
+from opossum_lib.core.entities.ingest_filter import IngestFilter
 from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.opossum_stream import OpossumStream
+from opossum_lib.core.entities.resource import Resource
 from opossum_lib.core.services.input_reader import InputReader
 from opossum_lib.input_formats.opossum.services.convert_to_opossum import (
     convert_to_opossum,
+    convert_to_opossum_stream,
+)
+from opossum_lib.input_formats.opossum.services.mapped_zip_file import MappedZipFile
+from opossum_lib.shared.constants import (
+    INPUT_JSON_NAME,
+    OUTPUT_JSON_NAME,
+    STANDARD_STREAM_PATH,
 )
-from opossum_lib.shared.constants import INPUT_JSON_NAME, OUTPUT_JSON_NAME
 from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
 from opossum_lib.shared.entities.opossum_input_file_model import OpossumInputFileModel
-from opossum_lib.shared.entities.opossum_output_file_model import OpossumOutputFileModel
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+from opossum_lib.shared.services.compressed_zip_entry import read_compressed_zip_entry
+from opossum_lib.shared.services.load_output_file import load_output_file
+from opossum_lib.shared.services.validate_model import (
+    DEFAULT_SAMPLE_PERCENTAGE,
+    validate_model,
+)
 
 
 class OpossumFileReader(InputReader):
     path: Path
+    use_mmap: bool
+    lazy: bool
+    validation: ValidationPolicy
+    sample_percentage: float
+    ingest_filter: IngestFilter | None
 
-    def __init__(self, path: Path):
+    def __init__(
+        self,
+        path: Path,
+        use_mmap: bool = False,
+        lazy: bool = False,
+        validation: ValidationPolicy = ValidationPolicy.FULL,
+        sample_percentage: float = DEFAULT_SAMPLE_PERCENTAGE,
+        ingest_filter: IngestFilter | None = None,
+    ):
         self.path = path
+        self.use_mmap = use_mmap
+        # convert resources and their attributions only when they are accessed
+        self.lazy = lazy
+        self.validation = validation
+        self.sample_percentage = sample_percentage
+        self.ingest_filter = ingest_filter
 
     def read(self) -> Opossum:
         opossum_input_file = self._read_opossum_file()
-        return convert_to_opossum(opossum_input_file)
+        # invalid resources are found while converting them
+        try:
+            return convert_to_opossum(
+                opossum_input_file, lazy=self.lazy, ingest_filter=self.ingest_filter
+            )
+        except RuntimeError as e:
+            self._exit_on_invalid_resources(e)
+
+    def stream(self) -> OpossumStream:
+        # the input.json is parsed completely, but the resources are only
+        # converted while they are consumed
+        opossum_input_file = self._read_opossum_file()
+        try:
+            opossum_stream = convert_to_opossum_stream(
+                opossum_input_file, ingest_filter=self.ingest_filter
+            )
+        except RuntimeError as e:
+            self._exit_on_invalid_resources(e)
+        return opossum_stream.model_copy(
+            update={"resources": self._check_resources(opossum_stream.resources)}
+        )
+
+    def _check_resources(self, resources: Iterator[Resource]) -> Iterator[Resource]:
+        try:
+            yield from resources
+        except RuntimeError as e:
+            self._exit_on_invalid_resources(e)
+
+    def _exit_on_invalid_resources(self, error: RuntimeError) -> NoReturn:
+        logging.error(f"Error reading file {self.path}: {error}")
+        sys.exit(1)
 
     def _read_opossum_file(self) -> OpossumFileModel:
         logging.info(f"Converting opossum to opossum {self.path}")
 
         try:
-            with (
-                ZipFile(self.path, "r") as zip_file,
-            ):
+            with self._open_zip_file() as (zip_file, source):
                 self._validate_zip_file_contents(zip_file)
                 input_file = self._read_input_json(zip_file)
                 return OpossumFileModel(
                     input_file=input_file,
-                    output_file=self._read_output_json_if_exists(zip_file),
+                    output_file=self._read_output_json_if_exists(zip_file, source),
                 )
         except Exception as e:
-            print(f"Error reading file {self.path}: {e}")
+            # logged, as the output may be written to standard output
+            logging.error(f"Error reading file {self.path}: {e}")
             sys.exit(1)
 
+    @contextmanager
+    def _open_zip_file(self) -> Iterator[tuple[ZipFile, IO[bytes]]]:
+        # the source gives access to the deflated entries of the zip file
+        if Path(self.path) == STANDARD_STREAM_PATH:
+            # the directory of a zip file is at its end, so standard input is
+            # read into memory, which also rules out memory-mapping
+            source: IO[bytes] = io.BytesIO(sys.stdin.buffer.read())
+            with ZipFile(source, "r") as zip_file:
+                yield zip_file, source
+        elif self.use_mmap:
+            with MappedZipFile(self.path) as mapped_zip_file:
+                yield mapped_zip_file, mapped_zip_file.buffer
+        else:
+            with open(self.path, "rb") as source, ZipFile(source, "r") as zip_file:
+                yield zip_file, source
+
     def _read_input_json(self, zip_file: ZipFile) -> OpossumInputFileModel:
-        with zip_file.open(INPUT_JSON_NAME) as input_json_file:
-            input_json = json.load(input_json_file)
-            input_file = OpossumInputFileModel.model_validate(input_json)
+        input_json = self._read_json(zip_file, INPUT_JSON_NAME)
+        resources = None
+        if isinstance(input_json, dict) and "resources" in input_json:
+            # the conversion checks each node of the tree, so the resources are
+            # not walked a second time here. Lazy resources are only checked
+            # when they are visited.
+            resources = input_json["resources"]
+            input_json = {**input_json, "resources": {}}
+        input_file = validate_model(
+            OpossumInputFileModel,
+            input_json,
+            self.validation,
+            self.sample_percentage,
+            record_fields=("resources", "resources_to_attributions"),
+        )
+        if resources is not None:
+            input_file = input_file.model_copy(update={"resources": resources})
         return input_file
 
     def _read_output_json_if_exists(
         self,
         input_zip_file: ZipFile,
-    ) -> OpossumOutputFileModel | None:
-        if OUTPUT_JSON_NAME in input_zip_file.namelist():
-            with input_zip_file.open(OUTPUT_JSON_NAME) as output_json_file:
-                output_json = json.load(output_json_file)
-                output_file = OpossumOutputFileModel.model_validate(output_json)
-        else:
-            output_file = None
+        source: IO[bytes],
+    ) -> RawOpossumOutputFileModel | None:
+        if OUTPUT_JSON_NAME not in input_zip_file.namelist():
+            return None
+        # The review results are usually written back unchanged, so they are
+        # kept as read, if possible still deflated, and only parsed when they
+        # are read or modified.
+        content = read_compressed_zip_entry(
+            source, input_zip_file.getinfo(OUTPUT_JSON_NAME)
+        ) or input_zip_file.read(OUTPUT_JSON_NAME)
+        output_file = RawOpossumOutputFileModel(
+            content=content,
+            validation=self.validation,
+            sample_percentage=self.sample_percentage,
+        )
+        if self.validation == ValidationPolicy.FULL:
+            # invalid files are reported while reading
+            load_output_file(output_file)
         return output_file
 
+    @staticmethod
+    def _read_json(zip_file: ZipFile, sub_file_name: str) -> Any:
+        if isinstance(zip_file, MappedZipFile):
+            # parse directly from the inflated bytes
+            return json.loads(zip_file.read(sub_file_name))
+        with zip_file.open(sub_file_name) as json_file:
+            return json.load(json_file)
+
     def _validate_zip_file_contents(self, input_zip_file: ZipFile) -> None:
         if INPUT_JSON_NAME not in input_zip_file.namelist():
             logging.error(
-                f"Opossum file {input_zip_file.filename} is corrupt"
+                f"Opossum file {self.path} is corrupt"
                 f" and does not contain '{INPUT_JSON_NAME}'"
             )
             sys.exit(1)
@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import sys
+from pathlib import Path
+from zipfile import ZipFile
+
+from opossum_lib.shared.constants import INDEX_DB_NAME
+from opossum_lib.shared.services.opossum_index import OpossumIndex
+
+
+def read_opossum_index(path: Path) -> OpossumIndex:
+    # only the index entry is decompressed, input.json is not read
+    with ZipFile(path, "r") as zip_file:
+        if INDEX_DB_NAME not in zip_file.namelist():
+            logging.error(
+                f"Opossum file {path} does not contain an index '{INDEX_DB_NAME}'. "
+                "Generate it with --with-index."
+            )
+            sys.exit(1)
+        return OpossumIndex(zip_file.read(INDEX_DB_NAME))
@@ -3,3 +3,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 SCANCODE_SOURCE_NAME = "SC"
+# each worker gets several shards so that unevenly expensive shards balance out
+SHARDS_PER_WORKER = 4
+# upper bound for the shard size, also used if the number of files is unknown
+MAX_FILES_PER_SHARD = 1000
+# the first line of a --json-lines file only contains the headers,
+# longer first lines indicate a regular json file
+MAX_JSON_LINES_HEADER_SIZE = 16 * 1024 * 1024
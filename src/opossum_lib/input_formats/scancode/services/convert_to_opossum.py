@@ -2,20 +2,36 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
 import logging
 import sys
 import uuid
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import batched
+from math import ceil
 from pathlib import PurePath
 
+from opossum_lib.core.entities.ingest_filter import IngestFilter
 from opossum_lib.core.entities.metadata import Metadata
 from opossum_lib.core.entities.opossum import (
     Opossum,
 )
 from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.opossum_stream import OpossumStream
 from opossum_lib.core.entities.resource import Resource, ResourceType
-from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.core.entities.scan_results import (
+    ContentAttributionIds,
+    ScanResults,
+)
 from opossum_lib.core.entities.source_info import SourceInfo
-from opossum_lib.input_formats.scancode.constants import SCANCODE_SOURCE_NAME
+from opossum_lib.input_formats.scancode.constants import (
+    MAX_FILES_PER_SHARD,
+    SCANCODE_SOURCE_NAME,
+    SHARDS_PER_WORKER,
+)
 from opossum_lib.input_formats.scancode.entities.scancode_model import (
     FileModel,
     FileTypeModel,
@@ -23,45 +39,263 @@ from opossum_lib.input_formats.scancode.entities.scancode_model import (
     ScancodeModel,
 )
 
+type _PendingShard = tuple[tuple[FileModel, ...], Future[list[list[OpossumPackage]]]]
+# the content hash and the license detections of a file
+type _FileKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+def convert_to_opossum(
+    scancode_data: ScancodeModel,
+    workers: int = 1,
+    deduplicate: bool = False,
+    ingest_filter: IngestFilter | None = None,
+) -> Opossum:
+    return convert_file_stream_to_opossum(
+        scancode_data.headers,
+        scancode_data.files,
+        workers=workers,
+        deduplicate=deduplicate,
+        ingest_filter=ingest_filter,
+    )
+
+
+def convert_file_stream_to_opossum(
+    headers: list[HeaderModel],
+    files: Iterable[FileModel],
+    workers: int = 1,
+    deduplicate: bool = False,
+    ingest_filter: IngestFilter | None = None,
+) -> Opossum:
+    resources = _extract_opossum_resources(files, workers, deduplicate, ingest_filter)
+    return Opossum(scan_results=_create_scan_results(headers, resources))
+
+
+def convert_file_stream_to_opossum_stream(
+    headers: list[HeaderModel],
+    files: Iterable[FileModel],
+    workers: int = 1,
+    deduplicate: bool = False,
+    ingest_filter: IngestFilter | None = None,
+) -> OpossumStream:
+    # the files are only converted while the resources are consumed
+    return OpossumStream(
+        scan_results=_create_scan_results(headers, resources=[]),
+        resources=_stream_opossum_resources(files, workers, deduplicate, ingest_filter),
+    )
 
-def convert_to_opossum(scancode_data: ScancodeModel) -> Opossum:
-    resources = _extract_opossum_resources(scancode_data)
 
-    scancode_header = _extract_scancode_header(scancode_data)
+def _create_scan_results(
+    headers: list[HeaderModel], resources: list[Resource]
+) -> ScanResults:
+    scancode_header = _extract_scancode_header(headers)
     metadata = Metadata(
-        project_id=str(uuid.uuid4()),
+        project_id=_get_project_id(scancode_header),
         file_creation_date=scancode_header.end_timestamp,
         project_title="ScanCode file",
     )
-
-    return Opossum(
-        scan_results=ScanResults(
-            metadata=metadata,
-            resources=resources,
-        )
+    # converting the same scan again gives the same .opossum file
+    return ScanResults(
+        metadata=metadata,
+        resources=resources,
+        attribution_to_id=ContentAttributionIds(),
     )
 
 
-def _extract_scancode_header(scancode_data: ScancodeModel) -> HeaderModel:
-    if len(scancode_data.headers) != 1:
+def _get_project_id(scancode_header: HeaderModel) -> str:
+    # the header identifies the scan by its options and timestamps, it is the
+    # only part of the scan known before the files are streamed
+    header_digest = hashlib.sha256(scancode_header.model_dump_json().encode())
+    return str(uuid.UUID(bytes=header_digest.digest()[:16]))
+
+
+def _extract_scancode_header(headers: list[HeaderModel]) -> HeaderModel:
+    if len(headers) != 1:
         logging.error("Headers of ScanCode file are invalid.")
         sys.exit(1)
-    return scancode_data.headers[0]
+    return headers[0]
 
 
 def _extract_opossum_resources(
-    scancode_data: ScancodeModel,
+    files: Iterable[FileModel],
+    workers: int = 1,
+    deduplicate: bool = False,
+    ingest_filter: IngestFilter | None = None,
 ) -> list[Resource]:
     temp_root = Resource(path=PurePath(""))
-    for file in scancode_data.files:
-        resource = Resource(
+    for resource in _stream_opossum_resources(
+        files, workers, deduplicate, ingest_filter
+    ):
+        temp_root.add_resource(resource)
+
+    return list(temp_root.children.values())
+
+
+def _stream_opossum_resources(
+    files: Iterable[FileModel],
+    workers: int = 1,
+    deduplicate: bool = False,
+    ingest_filter: IngestFilter | None = None,
+) -> Iterator[Resource]:
+    if ingest_filter is not None and ingest_filter.filters_paths:
+        # excluded files are dropped before they are converted, directories
+        # that are not included may still be the folders of included files
+        files = (
+            file
+            for file in files
+            if ingest_filter.includes_path(file.path)
+            or (
+                file.type == FileTypeModel.DIRECTORY
+                and not ingest_filter.matches_exclude_paths(file.path)
+            )
+        )
+    if deduplicate:
+        attribution_infos = _get_deduplicated_attribution_infos(
+            files, workers, ingest_filter
+        )
+    else:
+        attribution_infos = _get_attribution_infos(
+            files, workers, ingest_filter=ingest_filter
+        )
+    resources: Iterator[Resource] = (
+        Resource(
             path=PurePath(file.path),
-            attributions=_get_attribution_info(file),
+            attributions=attributions,
             type=_convert_resource_type(file.type),
         )
-        temp_root.add_resource(resource)
+        for file, attributions in attribution_infos
+    )
+    if ingest_filter is not None and ingest_filter.filters_paths:
+        resources = _keep_folders_of_included_resources(resources, ingest_filter)
+    yield from resources
 
-    return list(temp_root.children.values())
+
+def _keep_folders_of_included_resources(
+    resources: Iterable[Resource], ingest_filter: IngestFilter
+) -> Iterator[Resource]:
+    # Directories that are not included are only kept as the folders of
+    # included resources, so that these folders keep their type. They are
+    # held back until such a resource comes, or passed on right away if one
+    # came before them.
+    held_back: dict[PurePath, Resource] = {}
+    used_folders: set[PurePath] = set()
+    for resource in resources:
+        if not ingest_filter.includes_path(resource.path):
+            if resource.path in used_folders:
+                yield resource
+            else:
+                held_back[resource.path] = resource
+            continue
+        for folder in reversed(resource.path.parents):
+            if folder in held_back:
+                yield held_back.pop(folder)
+            used_folders.add(folder)
+        yield resource
+
+
+def _get_deduplicated_attribution_infos(
+    files: Iterable[FileModel], workers: int, ingest_filter: IngestFilter | None
+) -> Iterator[tuple[FileModel, list[OpossumPackage]]]:
+    # Files with the same content and license detections, e.g. vendored copies
+    # of a library, have the same attributions. Only the first copy is
+    # converted, in the main process before dispatching to the workers, and
+    # all copies share its package objects.
+    converted: dict[_FileKey, list[OpossumPackage]] = {}
+    # all files in input order, with the keys of the copies that are skipped
+    queued: deque[tuple[FileModel, _FileKey | None]] = deque()
+
+    def files_to_convert() -> Iterator[FileModel]:
+        seen = set()
+        for file in files:
+            key = _get_file_key(file)
+            if key is not None and key in seen:
+                queued.append((file, key))
+                continue
+            if key is not None:
+                seen.add(key)
+            queued.append((file, None))
+            yield file
+
+    def skipped_copies() -> Iterator[tuple[FileModel, list[OpossumPackage]]]:
+        # the original of a copy always comes first, so it is already converted
+        while queued and (key := queued[0][1]) is not None:
+            yield queued.popleft()[0], list(converted[key])
+
+    number_of_files = len(files) if isinstance(files, Sequence) else None
+    for file, attributions in _get_attribution_infos(
+        files_to_convert(), workers, number_of_files, ingest_filter
+    ):
+        yield from skipped_copies()
+        queued.popleft()
+        key = _get_file_key(file)
+        if key is not None:
+            converted[key] = attributions
+        yield file, attributions
+    yield from skipped_copies()
+
+
+def _get_file_key(file: FileModel) -> _FileKey | None:
+    if file.type == FileTypeModel.DIRECTORY:
+        return None
+    for algorithm, content_hash in [
+        ("sha256", file.sha256),
+        ("sha1", file.sha1),
+        ("md5", file.md5),
+    ]:
+        if content_hash:
+            license_detections = tuple(
+                (detection.identifier, detection.license_expression_spdx)
+                for detection in file.license_detections
+            )
+            return algorithm, content_hash, license_detections
+    return None
+
+
+def _get_attribution_infos(
+    files: Iterable[FileModel],
+    workers: int,
+    number_of_files: int | None = None,
+    ingest_filter: IngestFilter | None = None,
+) -> Iterator[tuple[FileModel, list[OpossumPackage]]]:
+    if workers <= 1:
+        for file in files:
+            yield file, _get_attribution_info(file, ingest_filter)
+        return
+
+    if number_of_files is None and isinstance(files, Sequence):
+        number_of_files = len(files)
+    shard_size = MAX_FILES_PER_SHARD
+    if number_of_files is not None:
+        shard_size = min(
+            shard_size, ceil(number_of_files / (workers * SHARDS_PER_WORKER)) or 1
+        )
+    max_pending_shards = workers * SHARDS_PER_WORKER
+    convert_shard = partial(
+        _get_attribution_infos_for_shard, ingest_filter=ingest_filter
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # shards are collected in submission order, which keeps the result
+        # independent of the worker scheduling. Limiting the number of pending
+        # shards keeps the memory flat if the files are streamed.
+        pending: deque[_PendingShard] = deque()
+        for shard in batched(files, shard_size, strict=False):
+            future = executor.submit(convert_shard, shard)
+            pending.append((shard, future))
+            if len(pending) >= max_pending_shards:
+                yield from _collect_shard(*pending.popleft())
+        while pending:
+            yield from _collect_shard(*pending.popleft())
+
+
+def _collect_shard(
+    shard: tuple[FileModel, ...], future: Future[list[list[OpossumPackage]]]
+) -> Iterator[tuple[FileModel, list[OpossumPackage]]]:
+    return zip(shard, future.result(), strict=True)
+
+
+def _get_attribution_infos_for_shard(
+    files: tuple[FileModel, ...], ingest_filter: IngestFilter | None = None
+) -> list[list[OpossumPackage]]:
+    return [_get_attribution_info(file, ingest_filter) for file in files]
 
 
 def _convert_resource_type(file_type: FileTypeModel) -> ResourceType:
@@ -71,7 +305,9 @@ def _convert_resource_type(file_type: FileTypeModel) -> ResourceType:
         return ResourceType.FOLDER
 
 
-def _get_attribution_info(file: FileModel) -> list[OpossumPackage]:
+def _get_attribution_info(
+    file: FileModel, ingest_filter: IngestFilter | None = None
+) -> list[OpossumPackage]:
     if file.type == FileTypeModel.DIRECTORY:
         return []
     copyright = "\n".join(c.copyright for c in file.copyrights)
@@ -81,6 +317,10 @@ def _get_attribution_info(file: FileModel) -> list[OpossumPackage]:
     for license_detection in file.license_detections:
         license_name = license_detection.license_expression_spdx
         max_score = max(m.score for m in license_detection.matches)
+        if ingest_filter is not None and not ingest_filter.includes_attribution(
+            license_name, max_score
+        ):
+            continue
         attribution_confidence = int(max_score)
 
         package = OpossumPackage(
@@ -5,44 +5,189 @@
 import json
 import logging
 import sys
+from collections.abc import Iterable, Iterator
+from itertools import chain
 from pathlib import Path
+from typing import Any, TextIO
 
+from opossum_lib.core.entities.ingest_filter import IngestFilter
 from opossum_lib.core.entities.opossum import (
     Opossum,
 )
+from opossum_lib.core.entities.opossum_stream import OpossumStream
 from opossum_lib.core.services.input_reader import InputReader
+from opossum_lib.input_formats.scancode.constants import (
+    MAX_JSON_LINES_HEADER_SIZE,
+)
 from opossum_lib.input_formats.scancode.entities.scancode_model import (
+    FileModel,
+    HeaderModel,
     ScancodeModel,
 )
 from opossum_lib.input_formats.scancode.services.convert_to_opossum import (
+    convert_file_stream_to_opossum,
+    convert_file_stream_to_opossum_stream,
     convert_to_opossum,
 )
+from opossum_lib.shared.services.open_decompressed import (
+    DECOMPRESSION_ERRORS,
+    open_decompressed,
+)
 
 
 class ScancodeFileReader(InputReader):
     path: Path
+    workers: int
+    deduplicate: bool
+    ingest_filter: IngestFilter | None
 
-    def __init__(self, path: Path):
+    def __init__(
+        self,
+        path: Path,
+        workers: int = 1,
+        deduplicate: bool = False,
+        ingest_filter: IngestFilter | None = None,
+    ):
         self.path = path
+        self.workers = workers
+        # convert files with the same content and license detections only once
+        self.deduplicate = deduplicate
+        self.ingest_filter = ingest_filter
 
     def read(self) -> Opossum:
         logging.info(f"Converting scancode to opossum {self.path}")
 
-        scancode_data = self._load_scancode_json()
+        # the file is only read once, so that it can also be a stream
+        with open_decompressed(self.path) as input_file:
+            first_line = self._read_first_line(input_file)
+            if self._is_json_lines(first_line):
+                return self._read_json_lines(first_line, input_file)
+            scancode_data = self._load_scancode_json(first_line, input_file)
+
+        return convert_to_opossum(
+            scancode_data,
+            workers=self.workers,
+            deduplicate=self.deduplicate,
+            ingest_filter=self.ingest_filter,
+        )
+
+    def stream(self) -> OpossumStream:
+        logging.info(f"Streaming scancode to opossum {self.path}")
+
+        input_file = open_decompressed(self.path)
+        first_line = self._read_first_line(input_file)
+        if self._is_json_lines(first_line):
+            # the file stays open until all files have been read from it
+            headers, files = self._parse_json_lines(first_line, input_file)
+            return convert_file_stream_to_opossum_stream(
+                headers,
+                self._close_when_done(files, input_file),
+                workers=self.workers,
+                deduplicate=self.deduplicate,
+                ingest_filter=self.ingest_filter,
+            )
+        with input_file:
+            scancode_data = self._load_scancode_json(first_line, input_file)
+        return convert_file_stream_to_opossum_stream(
+            scancode_data.headers,
+            scancode_data.files,
+            workers=self.workers,
+            deduplicate=self.deduplicate,
+            ingest_filter=self.ingest_filter,
+        )
+
+    @staticmethod
+    def _close_when_done(
+        files: Iterator[FileModel], input_file: TextIO
+    ) -> Iterator[FileModel]:
+        with input_file:
+            yield from files
 
-        return convert_to_opossum(scancode_data)
+    def _read_first_line(self, input_file: TextIO) -> str:
+        try:
+            return input_file.readline(MAX_JSON_LINES_HEADER_SIZE)
+        except UnicodeDecodeError:
+            logging.error(f"Error decoding json for file {self.path}.")
+            sys.exit(1)
+        except DECOMPRESSION_ERRORS:
+            logging.error(f"Error decompressing file {self.path}.")
+            sys.exit(1)
 
-    def _load_scancode_json(self) -> ScancodeModel:
+    def _load_scancode_json(self, first_line: str, input_file: TextIO) -> ScancodeModel:
         try:
-            with open(self.path) as input_file:
-                json_data = json.load(input_file)
+            json_data = json.loads(first_line + input_file.read())
         except json.JSONDecodeError as e:
             logging.error(f"Error decoding json for file {self.path}. Message: {e.msg}")
             sys.exit(1)
         except UnicodeDecodeError:
             logging.error(f"Error decoding json for file {self.path}.")
             sys.exit(1)
+        except DECOMPRESSION_ERRORS:
+            logging.error(f"Error decompressing file {self.path}.")
+            sys.exit(1)
 
         scancode_data = ScancodeModel.model_validate(json_data)
 
         return scancode_data
+
+    @staticmethod
+    def _is_json_lines(first_line: str) -> bool:
+        # Both formats start with the headers. In the JSON Lines format (created
+        # with --json-lines) the first line is a complete object containing only
+        # the headers, while the first line of a pretty printed file is just "{"
+        # and a compact file contains the files in the same line.
+        try:
+            first_record = json.loads(first_line)
+        except json.JSONDecodeError:
+            return False
+        return (
+            isinstance(first_record, dict)
+            and "headers" in first_record
+            and "files" not in first_record
+        )
+
+    def _read_json_lines(self, first_line: str, input_file: TextIO) -> Opossum:
+        headers, files = self._parse_json_lines(first_line, input_file)
+        return convert_file_stream_to_opossum(
+            headers,
+            files,
+            workers=self.workers,
+            deduplicate=self.deduplicate,
+            ingest_filter=self.ingest_filter,
+        )
+
+    def _parse_json_lines(
+        self, first_line: str, input_file: TextIO
+    ) -> tuple[list[HeaderModel], Iterator[FileModel]]:
+        # only the headers are read, the files are parsed on iteration
+        records = self._iterate_json_lines(chain([first_line], input_file))
+        headers = [
+            HeaderModel.model_validate(header)
+            for header in next(records, {}).get("headers", [])
+        ]
+        files = (
+            FileModel.model_validate(file)
+            for record in records
+            for file in record.get("files", [])
+        )
+        return headers, files
+
+    def _iterate_json_lines(self, lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+        try:
+            for line_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logging.error(
+                        f"Error decoding json in line {line_number} "
+                        f"of file {self.path}. Message: {e.msg}"
+                    )
+                    sys.exit(1)
+        except UnicodeDecodeError:
+            logging.error(f"Error decoding json for file {self.path}.")
+            sys.exit(1)
+        except DECOMPRESSION_ERRORS:
+            logging.error(f"Error decompressing file {self.path}.")
+            sys.exit(1)
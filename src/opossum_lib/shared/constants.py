@@ -1,6 +1,16 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
+from pathlib import Path
+
 COMPRESSION_LEVEL = 5
 INPUT_JSON_NAME = "input.json"
 OUTPUT_JSON_NAME = "output.json"
+# size of the blocks that are compressed independently when writing in parallel
+COMPRESSION_BLOCK_SIZE = 4 * 1024 * 1024
+# prefix of the zip comment that stores the hash of the archive content
+CONTENT_HASH_COMMENT_PREFIX = b"opossum-file-sha256:"
+# optional sqlite database that indexes the content of input.json
+INDEX_DB_NAME = "index.sqlite"
+# reads from standard input or writes to standard output instead of a file
+STANDARD_STREAM_PATH = Path("-")
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+
+class CachedValue[T]:
+    # Holds data derived from a model, e.g. as a pydantic private attribute.
+    # The cached data is not part of the value of the model: all caches compare
+    # equal, and deep copies or pickles of a model start with an empty cache.
+
+    def __init__(self) -> None:
+        self._value: T | None = None
+        self._key: object = None
+
+    def get(self, key: object, compute: Callable[[], T]) -> T:
+        if self._value is None or self._key != key:
+            self._value = compute()
+            self._key = key
+        return self._value
+
+    def peek(self, key: object) -> T | None:
+        # the cached data if it is valid for the key, without computing it
+        if self._key != key:
+            return None
+        return self._value
+
+    def set(self, key: object, value: T) -> None:
+        self._value = value
+        self._key = key
+
+    def clear(self) -> None:
+        self._value = None
+        self._key = None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CachedValue)
+
+    def __hash__(self) -> int:
+        return 0
+
+    def __copy__(self) -> CachedValue[T]:
+        return CachedValue()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> CachedValue[T]:
+        return CachedValue()
+
+    def __reduce__(self) -> tuple[type[CachedValue[T]], tuple[()]]:
+        return CachedValue, ()
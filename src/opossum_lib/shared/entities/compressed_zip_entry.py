@@ -0,0 +1,23 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import zlib
+from zipfile import BadZipFile
+
+from pydantic import BaseModel, ConfigDict
+
+
+class CompressedZipEntry(BaseModel):
+    # the deflated content of a zip entry with the CRC and size of the content
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    compressed_content: bytes
+    crc: int
+    file_size: int
+
+    def decompress(self) -> bytes:
+        content = zlib.decompress(
+            self.compressed_content, -zlib.MAX_WBITS, self.file_size
+        )
+        if zlib.crc32(content) != self.crc:
+            raise BadZipFile("Bad CRC-32 for compressed entry")
+        return content
@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any
+
+from opossum_lib.shared.entities.camel_base_model import CamelBaseModel
+
+
+class DiffChangeModel(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+class OpossumDiffEntryModel(CamelBaseModel):
+    # One line of the report of `opossum-file diff`. Attributions are identified
+    # by a hash of their content, as the ids in the files are arbitrary.
+    change: DiffChangeModel
+    # for resources, folders end with a slash
+    path: str | None = None
+    is_file: bool | None = None
+    added_attribution_ids: list[str] = []
+    removed_attribution_ids: list[str] = []
+    # for attributions
+    attribution_id: str | None = None
+    attribution: dict[str, Any] | None = None
@@ -7,8 +7,11 @@ from pydantic import BaseModel
 
 from opossum_lib.shared.entities.opossum_input_file_model import OpossumInputFileModel
 from opossum_lib.shared.entities.opossum_output_file_model import OpossumOutputFileModel
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
 
 
 class OpossumFileModel(BaseModel):
     input_file: OpossumInputFileModel
-    output_file: OpossumOutputFileModel | None = None
+    output_file: OpossumOutputFileModel | RawOpossumOutputFileModel | None = None
@@ -4,9 +4,9 @@
 from __future__ import annotations
 
 from dataclasses import field
-from typing import Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import ConfigDict, model_serializer
+from pydantic import ConfigDict, PlainValidator, model_serializer
 
 from opossum_lib.shared.entities.camel_base_model import CamelBaseModel
 
@@ -15,9 +15,37 @@ type ResourcePathModel = str
 type ResourceInFileModel = dict[str, ResourceInFileModel] | int
 
 
+def is_file_resource(node: Any) -> bool:
+    # folders are dicts and files are ints, but not bools
+    return isinstance(node, int) and not isinstance(node, bool)
+
+
+def validate_resource_tree(resources: Any) -> Any:
+    # Checks the nested resources in a single iterative pass. It replaces the
+    # recursive validation of the union type by pydantic, which is slow for
+    # large trees and exceeds the recursion limit for deep ones. The input is
+    # returned as it is.
+    if is_file_resource(resources):
+        return resources
+    stack = [("", resources)]
+    while stack:
+        path, node = stack.pop()
+        if not isinstance(node, dict):
+            raise ValueError(
+                f"Invalid resource {path or '/'}: expected a dict for folders "
+                f"or an int for files, got {type(node).__name__}"
+            )
+        for name, child in node.items():
+            if not isinstance(name, str):
+                raise ValueError(f"Invalid resource name {name!r} in {path or '/'}")
+            if not is_file_resource(child):
+                stack.append((f"{path}/{name}", child))
+    return resources
+
+
 class OpossumInputFileModel(CamelBaseModel):
     metadata: MetadataModel
-    resources: ResourceInFileModel
+    resources: Annotated[ResourceInFileModel, PlainValidator(validate_resource_tree)]
     external_attributions: dict[OpossumPackageIdentifierModel, OpossumPackageModel]
     resources_to_attributions: dict[
         ResourcePathModel, list[OpossumPackageIdentifierModel]
@@ -0,0 +1,20 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+from opossum_lib.shared.entities.camel_base_model import CamelBaseModel
+from opossum_lib.shared.entities.opossum_input_file_model import MetadataModel
+
+
+class OpossumManifestModel(CamelBaseModel):
+    metadata: MetadataModel
+    shards: list[OpossumShardModel]
+
+
+class OpossumShardModel(CamelBaseModel):
+    # relative to the directory of the manifest
+    file_name: str
+    # roots of the resource subtrees contained in the shard
+    paths: list[str]
+    number_of_resources: int
@@ -0,0 +1,25 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+from opossum_lib.shared.entities.cached_value import CachedValue
+from opossum_lib.shared.entities.compressed_zip_entry import CompressedZipEntry
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+
+
+class RawOpossumOutputFileModel(BaseModel):
+    # The output.json of a .opossum file as it was read, deflated if possible.
+    # It is written back unchanged and only parsed with load_output_file by
+    # the services that read or modify the review results. The parsed model
+    # is kept, so the content is parsed at most once.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    content: CompressedZipEntry | bytes
+    validation: ValidationPolicy
+    sample_percentage: float
+    _loaded: CachedValue[OpossumOutputFileModel] = PrivateAttr(
+        default_factory=CachedValue
+    )
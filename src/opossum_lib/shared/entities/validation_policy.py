@@ -0,0 +1,16 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from enum import Enum
+
+
+class ValidationPolicy(Enum):
+    # The policies apply to the records of plain JSON data in .opossum files,
+    # like the resources. Everything else is always validated.
+
+    # validate every record of the input
+    FULL = "full"
+    # validate a random share of the records
+    SAMPLE = "sample"
+    # use the records without validation, for inputs from trusted sources
+    TRUSTED = "trusted"
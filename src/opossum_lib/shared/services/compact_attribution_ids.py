@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import logging
+import string
+from collections.abc import Mapping
+
+from opossum_lib.shared.entities.opossum_output_file_model import OpossumOutputFileModel
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+from opossum_lib.shared.services.load_output_file import load_output_file
+
+# compact ids are numbers in base 36, i.e. at most 4 characters for 1.6M ids
+# instead of the 36 characters of a UUID
+COMPACT_ID_ALPHABET = string.digits + string.ascii_lowercase
+
+
+def compact_attribution_id(number: int) -> str:
+    digits = []
+    while True:
+        number, digit = divmod(number, len(COMPACT_ID_ALPHABET))
+        digits.append(COMPACT_ID_ALPHABET[digit])
+        if number == 0:
+            return "".join(reversed(digits))
+
+
+def compact_output_file_ids(
+    output_file: OpossumOutputFileModel | RawOpossumOutputFileModel,
+    external_ids: Mapping[str, str],
+    first_manual_number: int,
+) -> OpossumOutputFileModel:
+    # Replaces the ids of the external attributions that output.json refers to
+    # with the given new ids and renumbers the manual attributions starting at
+    # first_manual_number, so that they do not clash with the external ones.
+    # References to attributions that do not exist are dropped, as they could
+    # otherwise refer to a renumbered attribution. For the same reason, fields
+    # of output.json without a schema are dropped. The checksum of the input
+    # file is dropped as well, as the input file changes with its ids.
+    output_file = load_output_file(output_file)
+    if output_file.model_extra:
+        logging.warning(
+            "Dropping unknown fields of output.json when compacting ids: "
+            + ", ".join(output_file.model_extra)
+        )
+    manual_ids = {
+        id: compact_attribution_id(first_manual_number + index)
+        for index, id in enumerate(output_file.manual_attributions)
+    }
+    resolved_external_attributions = output_file.resolved_external_attributions
+    if resolved_external_attributions is not None:
+        resolved_external_attributions = [
+            external_ids[id]
+            for id in resolved_external_attributions
+            if id in external_ids
+        ]
+    return OpossumOutputFileModel(
+        metadata=output_file.metadata.model_copy(
+            update={"input_file_md5_checksum": None}
+        ),
+        manual_attributions={
+            manual_ids[id]: attribution
+            for id, attribution in output_file.manual_attributions.items()
+        },
+        resources_to_attributions={
+            path: [manual_ids[id] for id in ids if id in manual_ids]
+            for path, ids in output_file.resources_to_attributions.items()
+        },
+        resolved_external_attributions=resolved_external_attributions,
+    )
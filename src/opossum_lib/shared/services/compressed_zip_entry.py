@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import struct
+import zlib
+from concurrent.futures import Executor
+from itertools import repeat
+from typing import IO
+from zipfile import ZIP_DEFLATED, BadZipFile, ZipInfo
+
+from opossum_lib.shared.constants import COMPRESSION_BLOCK_SIZE
+from opossum_lib.shared.entities.compressed_zip_entry import CompressedZipEntry
+
+LOCAL_FILE_HEADER_SIGNATURE = b"PK\x03\x04"
+LOCAL_FILE_HEADER_SIZE = 30
+ENCRYPTED_FLAG = 0x1
+
+
+def compress_zip_entry(
+    content: bytes,
+    compresslevel: int,
+    executor: Executor,
+    block_size: int = COMPRESSION_BLOCK_SIZE,
+) -> CompressedZipEntry:
+    # The blocks are deflated independently and concatenated. All but the last
+    # block end with a sync flush, so that the result is a single valid deflate
+    # stream. zlib releases the GIL, so the blocks are compressed in parallel.
+    view = memoryview(content)
+    blocks = [view[i : i + block_size] for i in range(0, len(content), block_size)]
+    blocks = blocks or [view]
+    is_last_block = [index == len(blocks) - 1 for index in range(len(blocks))]
+    crc = executor.submit(zlib.crc32, content)
+    compressed_blocks = executor.map(
+        _deflate_block, blocks, is_last_block, repeat(compresslevel)
+    )
+    return CompressedZipEntry(
+        compressed_content=b"".join(compressed_blocks),
+        crc=crc.result(),
+        file_size=len(content),
+    )
+
+
+def deflate_zip_entry(content: bytes, compresslevel: int) -> CompressedZipEntry:
+    return CompressedZipEntry(
+        compressed_content=_deflate_block(memoryview(content), True, compresslevel),
+        crc=zlib.crc32(content),
+        file_size=len(content),
+    )
+
+
+def _deflate_block(block: memoryview, is_last_block: bool, compresslevel: int) -> bytes:
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    flush_mode = zlib.Z_FINISH if is_last_block else zlib.Z_SYNC_FLUSH
+    return compressor.compress(block) + compressor.flush(flush_mode)
+
+
+def read_compressed_zip_entry(
+    file: IO[bytes], zip_info: ZipInfo
+) -> CompressedZipEntry | None:
+    # Reads the deflated data of an entry of the zip archive in file without
+    # inflating it, so that it can be copied with ZipWriter.write. Returns None
+    # for other compression methods and encrypted entries.
+    if zip_info.compress_type != ZIP_DEFLATED or zip_info.flag_bits & ENCRYPTED_FLAG:
+        return None
+    file.seek(zip_info.header_offset)
+    header = file.read(LOCAL_FILE_HEADER_SIZE)
+    if header[:4] != LOCAL_FILE_HEADER_SIGNATURE:
+        raise BadZipFile(f"Bad local file header for file {zip_info.filename!r}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    file.seek(
+        zip_info.header_offset + LOCAL_FILE_HEADER_SIZE + name_length + extra_length
+    )
+    return CompressedZipEntry(
+        compressed_content=file.read(zip_info.compress_size),
+        crc=zip_info.CRC,
+        file_size=zip_info.file_size,
+    )
@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import json
+
+from opossum_lib.shared.entities.compressed_zip_entry import CompressedZipEntry
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+from opossum_lib.shared.services.validate_model import validate_model
+
+OUTPUT_RECORD_FIELDS = ("resources_to_attributions",)
+
+
+def load_output_file(
+    output_file: OpossumOutputFileModel | RawOpossumOutputFileModel,
+) -> OpossumOutputFileModel:
+    # Parses review results that were kept as read, with their validation
+    # policy. The result is shared by all callers, which copy it to modify it.
+    if isinstance(output_file, OpossumOutputFileModel):
+        return output_file
+    return output_file._loaded.get(
+        None,
+        lambda: validate_model(
+            OpossumOutputFileModel,
+            json.loads(get_raw_content(output_file)),
+            output_file.validation,
+            output_file.sample_percentage,
+            record_fields=OUTPUT_RECORD_FIELDS,
+        ),
+    )
+
+
+def get_raw_content(output_file: RawOpossumOutputFileModel) -> bytes:
+    # the uncompressed content of output.json
+    if isinstance(output_file.content, CompressedZipEntry):
+        return output_file.content.decompress()
+    return output_file.content
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import bz2
+import gzip
+import io
+import lzma
+import sys
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any, TextIO
+
+from opossum_lib.shared.constants import STANDARD_STREAM_PATH
+
+
+class Bz2DecompressionError(OSError):
+    # Like gzip.BadGzipFile, but for corrupt bzip2 data, for which bz2 raises
+    # a plain OSError that is easily confused with errors of the file system.
+    pass
+
+
+class _Bz2Reader(io.RawIOBase):
+    # Reads a file opened with bz2.open, but raises Bz2DecompressionError for
+    # corrupt data. The file is closed with the reader.
+    def __init__(self, file: bz2.BZ2File):
+        self._file = file
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        try:
+            return self._file.readinto(buffer)
+        except OSError as error:
+            # errors of the file system have an error number
+            if error.errno is not None:
+                raise
+            raise Bz2DecompressionError(*error.args) from error
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def _open_bz2(source: Path | IO[bytes], mode: str) -> TextIO:
+    return io.TextIOWrapper(io.BufferedReader(_Bz2Reader(bz2.open(source, "rb"))))
+
+
+# the formats are detected by their magic bytes, independent of the file name
+COMPRESSION_MAGIC_BYTES: dict[bytes, Callable[..., Any]] = {
+    b"\x1f\x8b": gzip.open,
+    b"BZh": _open_bz2,
+    b"\xfd7zXZ\x00": lzma.open,
+}
+# raised while reading corrupt or truncated compressed data, other errors
+# like those of the file system are not caught
+DECOMPRESSION_ERRORS = (
+    gzip.BadGzipFile,
+    zlib.error,
+    Bz2DecompressionError,
+    lzma.LZMAError,
+    EOFError,
+)
+
+
+class _PrefixedStream(io.RawIOBase):
+    # Returns the already consumed bytes before the rest of a stream that
+    # cannot seek back. The stream itself is not closed.
+    def __init__(self, prefix: bytes, stream: IO[bytes]):
+        self._prefix = prefix
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._prefix:
+            size = min(len(buffer), len(self._prefix))
+            buffer[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def open_decompressed(path: Path) -> TextIO:
+    # Opens a text file that may be compressed with gzip, bzip2 or xz. The
+    # content is decompressed while it is read, so it is never written to disk.
+    # The path "-" reads from standard input.
+    magic_length = max(map(len, COMPRESSION_MAGIC_BYTES))
+    source: Path | IO[bytes]
+    if Path(path) == STANDARD_STREAM_PATH:
+        magic_bytes = sys.stdin.buffer.read(magic_length)
+        source = io.BufferedReader(_PrefixedStream(magic_bytes, sys.stdin.buffer))
+    else:
+        with open(path, "rb") as input_file:
+            magic_bytes = input_file.read(magic_length)
+        source = Path(path)
+    for magic, open_compressed in COMPRESSION_MAGIC_BYTES.items():
+        if magic_bytes.startswith(magic):
+            text_file: TextIO = open_compressed(source, "rt")
+            return text_file
+    if isinstance(source, Path):
+        return open(source)
+    return io.TextIOWrapper(source)
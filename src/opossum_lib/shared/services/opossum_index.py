@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from types import TracebackType
+
+from opossum_lib.shared.entities.opossum_input_file_model import (
+    OpossumInputFileModel,
+    OpossumPackageIdentifierModel,
+    OpossumPackageModel,
+    ResourceInFileModel,
+    ResourcePathModel,
+)
+
+# incremented whenever the schema changes incompatibly
+INDEX_SCHEMA_VERSION = 1
+
+INDEX_SCHEMA = f"""
+PRAGMA user_version = {INDEX_SCHEMA_VERSION};
+CREATE TABLE resources (
+    path TEXT PRIMARY KEY,
+    is_file INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE attributions (
+    id TEXT PRIMARY KEY,
+    license_name TEXT,
+    attribution TEXT NOT NULL
+);
+CREATE TABLE resources_to_attributions (
+    path TEXT NOT NULL,
+    attribution_id TEXT NOT NULL
+);
+CREATE INDEX attributions_license_name ON attributions (license_name);
+CREATE INDEX resources_to_attributions_path ON resources_to_attributions (path);
+CREATE INDEX resources_to_attributions_attribution_id
+    ON resources_to_attributions (attribution_id);
+"""
+
+
+def build_opossum_index(input_file: OpossumInputFileModel) -> bytes:
+    # returns an sqlite database file with the resources and attributions
+    # of input.json that can be stored as an additional zip entry
+    database = sqlite3.connect(":memory:")
+    try:
+        database.executescript(INDEX_SCHEMA)
+        with database:
+            database.executemany(
+                "INSERT INTO resources VALUES (?, ?)",
+                _iterate_resources(input_file.resources),
+            )
+            database.executemany(
+                "INSERT INTO attributions VALUES (?, ?, ?)",
+                (
+                    (
+                        id,
+                        attribution.license_name,
+                        attribution.model_dump_json(exclude_none=True, by_alias=True),
+                    )
+                    for id, attribution in input_file.external_attributions.items()
+                ),
+            )
+            database.executemany(
+                "INSERT INTO resources_to_attributions VALUES (?, ?)",
+                (
+                    (_normalize_path(path), id)
+                    for path, ids in input_file.resources_to_attributions.items()
+                    for id in ids
+                ),
+            )
+        return database.serialize()
+    finally:
+        database.close()
+
+
+def _iterate_resources(resources: ResourceInFileModel) -> Iterator[tuple[str, bool]]:
+    stack: list[tuple[str, ResourceInFileModel]] = [("", resources)]
+    while stack:
+        path, resource = stack.pop()
+        if isinstance(resource, int):
+            yield path, True
+            continue
+        if path:
+            yield path, False
+        for name, child in resource.items():
+            stack.append((_normalize_path(f"{path}/{name}"), child))
+
+
+def _normalize_path(path: ResourcePathModel) -> str:
+    # folders have a trailing slash in .opossum files, the index omits it
+    return "/" + path.strip("/")
+
+
+class OpossumIndex:
+    # Answers queries about a .opossum file from its index database
+    # without parsing input.json.
+
+    def __init__(self, index_content: bytes):
+        self._database = sqlite3.connect(":memory:")
+        self._database.deserialize(index_content)
+        (version,) = self._database.execute("PRAGMA user_version").fetchone()
+        if version != INDEX_SCHEMA_VERSION:
+            self._database.close()
+            raise ValueError(f"Unsupported index schema version {version}")
+
+    def attributions_for_path(
+        self, path: ResourcePathModel
+    ) -> dict[OpossumPackageIdentifierModel, OpossumPackageModel]:
+        rows = self._database.execute(
+            "SELECT a.id, a.attribution FROM resources_to_attributions r "
+            "JOIN attributions a ON a.id = r.attribution_id "
+            "WHERE r.path = ? ORDER BY r.rowid",
+            (_normalize_path(path),),
+        )
+        return {
+            id: OpossumPackageModel.model_validate_json(attribution)
+            for id, attribution in rows
+        }
+
+    def licenses(self) -> list[str]:
+        rows = self._database.execute(
+            "SELECT DISTINCT license_name FROM attributions "
+            "WHERE license_name IS NOT NULL ORDER BY license_name"
+        )
+        return [license_name for (license_name,) in rows]
+
+    def paths_with_license(self, license_name: str) -> list[ResourcePathModel]:
+        rows = self._database.execute(
+            "SELECT DISTINCT r.path FROM attributions a "
+            "JOIN resources_to_attributions r ON r.attribution_id = a.id "
+            "WHERE a.license_name = ? ORDER BY r.path",
+            (license_name,),
+        )
+        return [path for (path,) in rows]
+
+    def is_file(self, path: ResourcePathModel) -> bool | None:
+        # None if the path is not part of the resources
+        row = self._database.execute(
+            "SELECT is_file FROM resources WHERE path = ?", (_normalize_path(path),)
+        ).fetchone()
+        return None if row is None else bool(row[0])
+
+    def close(self) -> None:
+        self._database.close()
+
+    def __enter__(self) -> OpossumIndex:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import random
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+
+# share of the records that are validated with ValidationPolicy.SAMPLE
+DEFAULT_SAMPLE_PERCENTAGE = 10.0
+# the records are sampled reproducibly
+SAMPLE_SEED = 0
+
+
+def validate_model[M: BaseModel](
+    model_type: type[M],
+    data: Any,
+    validation: ValidationPolicy,
+    sample_percentage: float = DEFAULT_SAMPLE_PERCENTAGE,
+    record_fields: Iterable[str] = (),
+) -> M:
+    # The record fields are dicts or lists of plain JSON data, like the
+    # resources of an input.json. Unless validation is FULL, they are used as
+    # they are, except for a random share of their elements that is validated
+    # with SAMPLE. Everything else is validated in every mode, as pydantic
+    # creates models faster by validating them than model_construct does.
+    if validation == ValidationPolicy.FULL or not isinstance(data, Mapping):
+        # data that is not a mapping is rejected in every mode
+        return model_type.model_validate(data)
+    if validation == ValidationPolicy.TRUSTED:
+        sample_percentage = 0
+    sample = random.Random(SAMPLE_SEED)
+    records = {}
+    top_level = dict(data)
+    for name in record_fields:
+        field = model_type.model_fields[name]
+        key = field.alias if field.alias in top_level else name
+        if key in top_level:
+            records[name] = top_level[key]
+            top_level[key] = type(top_level[key])()
+            adapter: TypeAdapter[Any] = TypeAdapter(field.rebuild_annotation())
+            adapter.validate_python(
+                _sample_collection(records[name], sample_percentage, sample)
+            )
+    model = model_type.model_validate(top_level)
+    return model.model_copy(update=records)
+
+
+def _sample_collection(
+    value: Any, sample_percentage: float, sample: random.Random
+) -> Any:
+    # a collection of the same type with a random share of the elements
+    if isinstance(value, dict):
+        return {
+            key: element
+            for key, element in value.items()
+            if sample.random() * 100 < sample_percentage
+        }
+    if isinstance(value, list):
+        return [
+            element for element in value if sample.random() * 100 < sample_percentage
+        ]
+    return value
@@ -0,0 +1,294 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import struct
+import time
+import zlib
+from types import TracebackType
+from typing import IO
+from zipfile import ZIP_DEFLATED
+
+from opossum_lib.shared.entities.compressed_zip_entry import CompressedZipEntry
+from opossum_lib.shared.services.compressed_zip_entry import (
+    LOCAL_FILE_HEADER_SIGNATURE,
+)
+
+CENTRAL_DIRECTORY_SIGNATURE = b"PK\x01\x02"
+END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x05\x06"
+ZIP64_END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\x06\x06"
+ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE = b"PK\x06\x07"
+DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+ZIP64_EXTRA_FIELD_ID = 0x0001
+DATA_DESCRIPTOR_FLAG = 0x08
+UTF8_FLAG = 0x800
+DEFLATE_VERSION = 20
+ZIP64_VERSION = 45
+# made on unix, so that the permissions in the external attributes are used
+CREATE_SYSTEM = 3
+EXTERNAL_ATTRIBUTES = 0o600 << 16
+SIZE_PLACEHOLDER = 0xFFFFFFFF
+COUNT_PLACEHOLDER = 0xFFFF
+
+
+class _CentralDirectoryEntry:
+    def __init__(
+        self,
+        name: bytes,
+        flags: int,
+        dos_time: int,
+        dos_date: int,
+        header_offset: int,
+    ):
+        self.name = name
+        self.flags = flags
+        self.dos_time = dos_time
+        self.dos_date = dos_date
+        self.header_offset = header_offset
+        self.crc = 0
+        self.compress_size = 0
+        self.file_size = 0
+        # whether the local header has a zip64 extra field
+        self.zip64 = False
+
+
+# Writes zip archives with deflated entries from data that is compressed
+# beforehand, possibly in parallel or copied from another archive, or that is
+# streamed. ZipFile can only write data it compresses itself, so the headers
+# and the central directory are written here. The file is only appended to and
+# does not need to be seekable.
+class ZipWriter:
+    def __init__(self, file: IO[bytes]):
+        self._file = file
+        self._offset = 0
+        self._entries: list[_CentralDirectoryEntry] = []
+        self._is_writing_entry = False
+        self.comment = b""
+
+    def __enter__(self) -> ZipWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        # incomplete archives are discarded by the caller
+        if exc_type is None:
+            self.close()
+
+    def write(self, sub_file_name: str, entry: CompressedZipEntry) -> None:
+        central_directory_entry = self._start_entry(sub_file_name, 0)
+        central_directory_entry.crc = entry.crc
+        central_directory_entry.compress_size = len(entry.compressed_content)
+        central_directory_entry.file_size = entry.file_size
+        zip64 = max(entry.file_size, len(entry.compressed_content)) >= SIZE_PLACEHOLDER
+        self._write_local_header(central_directory_entry, zip64)
+        self._write(entry.compressed_content)
+        self._entries.append(central_directory_entry)
+
+    def open(self, sub_file_name: str, compresslevel: int) -> ZipEntryWriter:
+        # streams an entry of unknown size, which is deflated while writing
+        central_directory_entry = self._start_entry(sub_file_name, DATA_DESCRIPTOR_FLAG)
+        self._write_local_header(central_directory_entry, zip64=True)
+        self._is_writing_entry = True
+        return ZipEntryWriter(self, central_directory_entry, compresslevel)
+
+    def close(self) -> None:
+        central_directory_offset = self._offset
+        for entry in self._entries:
+            self._write_central_directory_entry(entry)
+        central_directory_size = self._offset - central_directory_offset
+        entry_count = len(self._entries)
+        if (
+            entry_count >= COUNT_PLACEHOLDER
+            or central_directory_offset >= SIZE_PLACEHOLDER
+            or central_directory_size >= SIZE_PLACEHOLDER
+        ):
+            zip64_end_offset = self._offset
+            self._write(
+                ZIP64_END_OF_CENTRAL_DIRECTORY_SIGNATURE
+                + struct.pack(
+                    "<QHHIIQQQQ",
+                    44,
+                    CREATE_SYSTEM << 8 | ZIP64_VERSION,
+                    ZIP64_VERSION,
+                    0,
+                    0,
+                    entry_count,
+                    entry_count,
+                    central_directory_size,
+                    central_directory_offset,
+                )
+            )
+            self._write(
+                ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR_SIGNATURE
+                + struct.pack("<IQI", 0, zip64_end_offset, 1)
+            )
+            entry_count = min(entry_count, COUNT_PLACEHOLDER)
+            central_directory_offset = min(central_directory_offset, SIZE_PLACEHOLDER)
+            central_directory_size = min(central_directory_size, SIZE_PLACEHOLDER)
+        self._write(
+            END_OF_CENTRAL_DIRECTORY_SIGNATURE
+            + struct.pack(
+                "<HHHHIIH",
+                0,
+                0,
+                entry_count,
+                entry_count,
+                central_directory_size,
+                central_directory_offset,
+                len(self.comment),
+            )
+            + self.comment
+        )
+
+    def _start_entry(self, sub_file_name: str, flags: int) -> _CentralDirectoryEntry:
+        if self._is_writing_entry:
+            raise ValueError("Cannot write an entry while another one is open")
+        if sub_file_name.isascii():
+            name = sub_file_name.encode("ascii")
+        else:
+            name = sub_file_name.encode()
+            flags |= UTF8_FLAG
+        year, month, day, hours, minutes, seconds = time.localtime(time.time())[:6]
+        return _CentralDirectoryEntry(
+            name=name,
+            flags=flags,
+            dos_time=hours << 11 | minutes << 5 | seconds // 2,
+            dos_date=(year - 1980) << 9 | month << 5 | day,
+            header_offset=self._offset,
+        )
+
+    def _write_local_header(self, entry: _CentralDirectoryEntry, zip64: bool) -> None:
+        crc, compress_size, file_size = entry.crc, entry.compress_size, entry.file_size
+        entry.zip64 = zip64
+        extra = b""
+        if zip64:
+            extra = struct.pack(
+                "<HHQQ", ZIP64_EXTRA_FIELD_ID, 16, file_size, compress_size
+            )
+            compress_size = file_size = SIZE_PLACEHOLDER
+        self._write(
+            LOCAL_FILE_HEADER_SIGNATURE
+            + struct.pack(
+                "<HHHHHIIIHH",
+                ZIP64_VERSION if zip64 else DEFLATE_VERSION,
+                entry.flags,
+                ZIP_DEFLATED,
+                entry.dos_time,
+                entry.dos_date,
+                crc,
+                compress_size,
+                file_size,
+                len(entry.name),
+                len(extra),
+            )
+            + entry.name
+            + extra
+        )
+
+    def _write_central_directory_entry(self, entry: _CentralDirectoryEntry) -> None:
+        # sizes and offsets that do not fit move to the zip64 extra field, the
+        # sizes also do if the local header has one, so that both headers match
+        compress_size, file_size = entry.compress_size, entry.file_size
+        header_offset = entry.header_offset
+        zip64_values = []
+        if entry.zip64 or file_size >= SIZE_PLACEHOLDER:
+            zip64_values.append(file_size)
+            file_size = SIZE_PLACEHOLDER
+        if entry.zip64 or compress_size >= SIZE_PLACEHOLDER:
+            zip64_values.append(compress_size)
+            compress_size = SIZE_PLACEHOLDER
+        if header_offset >= SIZE_PLACEHOLDER:
+            zip64_values.append(header_offset)
+            header_offset = SIZE_PLACEHOLDER
+        extra = b""
+        if zip64_values:
+            extra = struct.pack(
+                f"<HH{len(zip64_values)}Q",
+                ZIP64_EXTRA_FIELD_ID,
+                8 * len(zip64_values),
+                *zip64_values,
+            )
+        version = ZIP64_VERSION if zip64_values else DEFLATE_VERSION
+        self._write(
+            CENTRAL_DIRECTORY_SIGNATURE
+            + struct.pack(
+                "<HHHHHHIIIHHHHHII",
+                CREATE_SYSTEM << 8 | version,
+                version,
+                entry.flags,
+                ZIP_DEFLATED,
+                entry.dos_time,
+                entry.dos_date,
+                entry.crc,
+                compress_size,
+                file_size,
+                len(entry.name),
+                len(extra),
+                0,
+                0,
+                0,
+                EXTERNAL_ATTRIBUTES,
+                header_offset,
+            )
+            + entry.name
+            + extra
+        )
+
+    def _finish_streamed_entry(self, entry: _CentralDirectoryEntry) -> None:
+        self._write(
+            DATA_DESCRIPTOR_SIGNATURE
+            + struct.pack("<IQQ", entry.crc, entry.compress_size, entry.file_size)
+        )
+        self._entries.append(entry)
+        self._is_writing_entry = False
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._offset += len(data)
+
+
+class ZipEntryWriter:
+    # returned by ZipWriter.open, the entry is complete once it is closed
+    def __init__(
+        self, zip_writer: ZipWriter, entry: _CentralDirectoryEntry, compresslevel: int
+    ):
+        self._zip_writer = zip_writer
+        self._entry = entry
+        self._compressor = zlib.compressobj(
+            compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS
+        )
+        self._is_closed = False
+
+    def __enter__(self) -> ZipEntryWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+
+    def write(self, data: bytes | bytearray) -> int:
+        self._entry.crc = zlib.crc32(data, self._entry.crc)
+        self._entry.file_size += len(data)
+        self._write_compressed(self._compressor.compress(data))
+        return len(data)
+
+    def close(self) -> None:
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._write_compressed(self._compressor.flush())
+        self._zip_writer._finish_streamed_entry(self._entry)
+
+    def _write_compressed(self, data: bytes) -> None:
+        self._entry.compress_size += len(data)
+        self._zip_writer._write(data)
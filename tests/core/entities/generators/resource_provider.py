@@ -45,10 +45,17 @@ class ResourceProvider(BaseProvider):
         )
 
     def resource_tree(
-        self, max_depth: int = 4, max_files_per_level: int = 3, max_subfolders: int = 3
+        self,
+        max_depth: int = 4,
+        max_files_per_level: int = 3,
+        max_subfolders: int = 3,
+        root_path: PurePath | None = None,
     ) -> Resource:
         root_node = self._sub_tree(
-            max_depth, max_files_per_level, max_subfolders, current_path=PurePath("")
+            max_depth,
+            max_files_per_level,
+            max_subfolders,
+            current_path=root_path or PurePath(""),
         )
 
         return root_node
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+
+import pytest
+
+from opossum_lib.core.entities.ingest_filter import IngestFilter
+
+
+class TestIncludesPath:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("project/src/main.py", True),
+            ("/project/src/lib/", True),
+            ("project/src", True),
+            ("project/README.md", False),
+            ("project/src/node_modules/a/test/a.js", False),
+            ("project/src/node_modules/a/test", False),
+            ("project/src/node_modules/a/index.js", True),
+        ],
+    )
+    def test_matches_paths_and_their_folders(self, path: str, expected: bool) -> None:
+        ingest_filter = IngestFilter(
+            include_paths=("project/src/**",),
+            exclude_paths=("**/node_modules/**/test/**",),
+        )
+
+        assert ingest_filter.includes_path(path) == expected
+        # the second lookup uses the cached results of the folders
+        assert ingest_filter.includes_path(PurePath(path)) == expected
+
+    def test_includes_everything_without_patterns(self) -> None:
+        ingest_filter = IngestFilter(min_score=50)
+
+        assert ingest_filter.includes_path("any/path")
+        assert not ingest_filter.filters_paths
+        assert ingest_filter.is_active
+
+
+class TestIncludesAttribution:
+    @pytest.mark.parametrize(
+        ("license_name", "score", "expected"),
+        [
+            ("MIT", 80.0, True),
+            ("MIT", 49.9, False),
+            ("MIT", None, True),
+            ("Apache-2.0", 80.0, True),
+            ("GPL-3.0-only", 80.0, False),
+            ("BSD-3-Clause", 80.0, False),
+            (None, 80.0, False),
+        ],
+    )
+    def test_filters_by_license_and_score(
+        self, license_name: str | None, score: float | None, expected: bool
+    ) -> None:
+        ingest_filter = IngestFilter(
+            min_score=50,
+            allowed_licenses=("MIT", "Apache-2.0", "GPL-3.0-only"),
+            denied_licenses=("GPL-3.0-only",),
+        )
+
+        assert ingest_filter.includes_attribution(license_name, score) == expected
+
+    def test_is_inactive_without_criteria(self) -> None:
+        assert not IngestFilter().is_active
@@ -7,7 +7,14 @@ from copy import deepcopy
 from opossum_lib.input_formats.opossum.services.convert_to_opossum import (
     convert_to_opossum,
 )
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    ManualAttributions,
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.services.compact_attribution_ids import compact_attribution_id
+from opossum_lib.shared.services.load_output_file import load_output_file
 from tests.setup.opossum_faker_setup import OpossumFaker
+from tests.setup.sample_entities import output_metadata
 
 
 class TestOpossumToOpossumModelConversion:
@@ -57,3 +64,36 @@ class TestOpossumToOpossumModelConversion:
         result = convert_to_opossum(opossum_file)
 
         assert result == expected_result
+
+
+class TestCompactIds:
+    def test_rewrites_references_of_review_results(
+        self, opossum_faker: OpossumFaker
+    ) -> None:
+        scan_results = opossum_faker.scan_results(generate_attribution_to_id=True)
+        original_ids = dict(scan_results.attribution_to_id)
+        review_results = OpossumOutputFileModel(
+            metadata=output_metadata(),
+            manual_attributions={"manual": ManualAttributions(package_name="name")},
+            resources_to_attributions={"/file": ["manual"]},
+            resolved_external_attributions=list(original_ids.values()),
+        )
+        opossum = opossum_faker.opossum(
+            scan_results=scan_results, review_results=review_results
+        )
+
+        result = opossum.to_opossum_file_model(compact_ids=True)
+
+        compact_ids = opossum.scan_results.compact_attribution_ids()
+        manual_id = compact_attribution_id(len(compact_ids))
+        assert result.output_file is not None
+        output_file = load_output_file(result.output_file)
+        assert output_file.manual_attributions == {
+            manual_id: ManualAttributions(package_name="name")
+        }
+        assert output_file.resources_to_attributions == {"/file": [manual_id]}
+        assert output_file.resolved_external_attributions == [
+            compact_ids[attribution] for attribution in original_ids
+        ]
+        assert set(result.input_file.external_attributions) == set(compact_ids.values())
+        assert opossum.scan_results.attribution_to_id == original_ids
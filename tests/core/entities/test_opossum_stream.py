@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.opossum_stream import OpossumStream
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import ScanResults
+from tests.setup.sample_entities import MIT, metadata
+
+
+def _resource(
+    path: str, type: ResourceType, attributions: list[OpossumPackage] | None = None
+) -> Resource:
+    return Resource(path=PurePath(path), type=type, attributions=attributions or [])
+
+
+class TestOpossumStream:
+    def test_collects_the_tree_it_was_created_from(self) -> None:
+        root = _resource("project", ResourceType.FOLDER)
+        root.add_resource(_resource("project/lib/a.py", ResourceType.FILE, [MIT]))
+        root.add_resource(_resource("project/b.py", ResourceType.FILE))
+        opossum = Opossum(
+            scan_results=ScanResults(
+                metadata=metadata(), resources=[root], unassigned_attributions=[MIT]
+            )
+        )
+
+        stream = OpossumStream.from_opossum(opossum)
+
+        assert stream.scan_results.resources == []
+        assert stream.collect() == opossum
+
+    def test_yields_flat_resources_in_tree_order(self) -> None:
+        root = _resource("project", ResourceType.FOLDER)
+        root.add_resource(_resource("project/lib/a.py", ResourceType.FILE, [MIT]))
+        root.add_resource(_resource("project/b.py", ResourceType.FILE))
+        opossum = Opossum(
+            scan_results=ScanResults(metadata=metadata(), resources=[root])
+        )
+
+        resources = list(OpossumStream.from_opossum(opossum).resources)
+
+        assert [str(resource.path) for resource in resources] == [
+            "project",
+            "project/lib",
+            "project/lib/a.py",
+            "project/b.py",
+        ]
+        assert all(not resource.children for resource in resources)
+
+    def test_creates_missing_folders(self) -> None:
+        stream = OpossumStream(
+            scan_results=ScanResults(metadata=metadata(), resources=[]),
+            resources=iter(
+                [
+                    _resource("project/lib/a.py", ResourceType.FILE, [MIT]),
+                    _resource("project", ResourceType.FOLDER, [MIT]),
+                ]
+            ),
+        )
+
+        (project,) = stream.collect().scan_results.resources
+
+        assert project.attributions == [MIT]
+        assert project.children == {
+            "lib": Resource(
+                path=PurePath("project/lib"),
+                type=ResourceType.FOLDER,
+                children={
+                    "a.py": _resource("project/lib/a.py", ResourceType.FILE, [MIT])
+                },
+            )
+        }
@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from copy import deepcopy
+from pathlib import PurePath
+
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from tests.setup.sample_entities import APACHE, MIT, file_resource
+
+
+def _tree(root: str, files: dict[str, list[OpossumPackage]]) -> Resource:
+    resource = Resource(path=PurePath(root), type=ResourceType.FOLDER)
+    for path, attributions in files.items():
+        resource.add_resource(file_resource(f"{root}/{path}", *attributions))
+    return resource
+
+
+class TestSubtreeDigest:
+    def test_ignores_own_path_and_attribution_order(self) -> None:
+        first = _tree("project", {"lib/a.py": [MIT, APACHE], "b.py": []})
+        second = _tree("vendored", {"b.py": [], "lib/a.py": [APACHE, MIT]})
+
+        assert first.subtree_digest() == second.subtree_digest()
+        assert first.has_same_content(second)
+
+    def test_covers_names_types_and_attributions(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+
+        assert not tree.has_same_content(_tree("project", {"lib/b.py": [MIT]}))
+        assert not tree.has_same_content(_tree("project", {"lib/a.py": [APACHE]}))
+        assert not tree.has_same_content(_tree("project", {"lib/a.py/x": [MIT]}))
+        assert not tree.has_same_content(_tree("project", {"lib/a.py": []}))
+
+    def test_is_invalidated_for_the_ancestors_on_modification(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+        digest = tree.subtree_digest()
+        file = tree.children["lib"].children["a.py"]
+
+        file.attributions = [APACHE]
+
+        assert tree.subtree_digest() != digest
+        assert (
+            tree.subtree_digest()
+            == _tree("other", {"lib/a.py": [APACHE]}).subtree_digest()
+        )
+
+    def test_is_invalidated_by_adding_and_removing_resources(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+        lib = tree.children["lib"]
+        digest = tree.subtree_digest()
+
+        lib.add_resource(
+            Resource(path=PurePath("project/lib/b/c.py"), type=ResourceType.FILE)
+        )
+        assert tree.subtree_digest() != digest
+
+        lib.remove_resource(PurePath("project/lib/b"))
+        assert tree.subtree_digest() == digest
+
+    def test_other_trees_keep_their_digests(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+        other = _tree("other", {"lib/a.py": [MIT]})
+        digest = other.subtree_digest()
+
+        tree.add_resource(
+            Resource(path=PurePath("project/b.py"), type=ResourceType.FILE)
+        )
+
+        assert other._digest.peek(None) == digest
+
+    def test_is_invalidated_by_changes_in_place(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+        digest = tree.subtree_digest()
+        lib = tree.children["lib"]
+
+        lib.children["a.py"].attributions.append(APACHE)
+        assert tree.subtree_digest() != digest
+        lib.children["a.py"].attributions.remove(APACHE)
+        assert tree.subtree_digest() == digest
+
+        lib.children["b.py"] = Resource(
+            path=PurePath("project/lib/b.py"), type=ResourceType.FILE
+        )
+        assert tree.subtree_digest() != digest
+        del lib.children["b.py"]
+        assert tree.subtree_digest() == digest
+
+        lib.type = ResourceType.FILE
+        assert tree.subtree_digest() != digest
+
+    def test_copies_are_tracked_independently(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+        copy = deepcopy(tree)
+        digest = copy.subtree_digest()
+        tree.subtree_digest()
+
+        copy.children["lib"].children["a.py"].attributions.append(APACHE)
+
+        assert copy.subtree_digest() != digest
+        assert tree.subtree_digest() == digest
+
+
+class TestAddResource:
+    def test_extends_attributions_of_existing_resources(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT], "lib/b.py": [APACHE]})
+
+        tree.add_resource(_tree("project/lib", {"a.py": [MIT], "b.py": [MIT]}))
+
+        lib = tree.children["lib"]
+        assert lib.type == ResourceType.FOLDER
+        assert lib.children["a.py"].attributions == [MIT, MIT]
+        assert lib.children["b.py"].attributions == [APACHE, MIT]
+
+    def test_skips_identical_subtrees_on_request(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT], "lib/b.py": [APACHE]})
+
+        tree.add_resource(
+            _tree("project/lib", {"a.py": [MIT], "b.py": [APACHE]}),
+            skip_identical=True,
+        )
+
+        assert tree.children["lib"].children == {
+            "a.py": Resource(
+                path=PurePath("project/lib/a.py"),
+                type=ResourceType.FILE,
+                attributions=[MIT],
+            ),
+            "b.py": Resource(
+                path=PurePath("project/lib/b.py"),
+                type=ResourceType.FILE,
+                attributions=[APACHE],
+            ),
+        }
+
+    def test_merges_differing_subtrees_on_request_to_skip(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT], "lib/b.py": [APACHE]})
+
+        tree.add_resource(
+            _tree("project/lib", {"a.py": [MIT], "b.py": [MIT]}), skip_identical=True
+        )
+
+        lib = tree.children["lib"]
+        assert lib.children["a.py"].attributions == [MIT]
+        assert lib.children["b.py"].attributions == [APACHE, MIT]
+
+    def test_merges_subtrees_modified_after_their_digest(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+        tree.subtree_digest()
+
+        tree.children["lib"].children["a.py"].attributions = []
+        tree.add_resource(_tree("project", {"lib/a.py": [MIT]}), skip_identical=True)
+
+        assert tree.children["lib"].children["a.py"].attributions == [MIT]
+
+
+class TestResourceModel:
+    def test_dumps_and_validates_attributions_and_children(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+
+        dumped = tree.model_dump()
+
+        assert set(dumped) == {"path", "type", "attributions", "children"}
+        assert Resource.model_validate(dumped) == tree
+        assert Resource.model_validate_json(tree.model_dump_json()) == tree
+
+    def test_copies_with_updated_children(self) -> None:
+        tree = _tree("project", {"lib/a.py": [MIT]})
+
+        copy = tree.model_copy(update={"children": {}})
+
+        assert copy.children == {}
+        assert copy.attributions == tree.attributions
@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from copy import deepcopy
+from pathlib import PurePath
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import (
+    ContentAttributionIds,
+    ScanResults,
+    content_attribution_id,
+)
+from opossum_lib.core.entities.source_info import SourceInfo
+from tests.setup.sample_entities import APACHE, MIT, file_resource, metadata, package
+
+MANUAL = OpossumPackage(source=SourceInfo(name="manual"), license_name="MIT")
+UNASSIGNED = package("GPL-2.0")
+
+
+def _scan_results() -> ScanResults:
+    root = Resource(path=PurePath("project"), type=ResourceType.FOLDER)
+    for path, attributions in [
+        ("project/vendor/lib/a.py", [MIT]),
+        ("project/vendor/lib/b.py", [MIT, MANUAL]),
+        ("project/vendor2/c.py", [MIT]),
+        ("project/src/d.py", [APACHE]),
+    ]:
+        root.add_resource(file_resource(path, *attributions))
+    return ScanResults(metadata=metadata(), resources=[root])
+
+
+def _paths(resources: list[Resource]) -> list[str]:
+    return [resource.path.as_posix() for resource in resources]
+
+
+class TestScanResultsIndexes:
+    def test_resources_under_prefix(self) -> None:
+        scan_results = _scan_results()
+
+        result = scan_results.resources_under("/project/vendor/")
+
+        assert _paths(result) == [
+            "project/vendor",
+            "project/vendor/lib",
+            "project/vendor/lib/a.py",
+            "project/vendor/lib/b.py",
+        ]
+
+    def test_resources_with_license_under_prefix(self) -> None:
+        scan_results = _scan_results()
+
+        assert len(scan_results.resources_with_license("MIT")) == 3
+        result = scan_results.resources_with_license(
+            "MIT", path_prefix="/project/vendor"
+        )
+        assert _paths(result) == ["project/vendor/lib/a.py", "project/vendor/lib/b.py"]
+
+    def test_attributions_from_source(self) -> None:
+        scan_results = _scan_results()
+
+        assert set(scan_results.attributions_from_source("SC")) == {MIT, APACHE}
+        assert scan_results.attributions_from_source("manual") == [MANUAL]
+        assert scan_results.attributions_from_source("unknown") == []
+
+    def test_resources_for_attribution(self) -> None:
+        scan_results = _scan_results()
+
+        result = scan_results.resources_for_attribution(MANUAL)
+
+        assert _paths(result) == ["project/vendor/lib/b.py"]
+
+    def test_indexes_are_invalidated_on_modification(self) -> None:
+        scan_results = _scan_results()
+        assert scan_results.resources_for_attribution(APACHE) != []
+
+        scan_results.resources[0].add_resource(
+            Resource(
+                path=PurePath("project/src/e.py"),
+                type=ResourceType.FILE,
+                attributions=[APACHE],
+            )
+        )
+        scan_results.resources[0].remove_resource(PurePath("project/src/d.py"))
+
+        result = scan_results.resources_for_attribution(APACHE)
+        assert _paths(result) == ["project/src/e.py"]
+
+    def test_indexes_are_invalidated_by_assigning_attributions(self) -> None:
+        scan_results = _scan_results()
+        assert scan_results.resources_with_license("Apache-2.0") != []
+        file = scan_results.resources_under("/project/src")[-1]
+
+        file.attributions = [MIT]
+
+        assert scan_results.resources_with_license("Apache-2.0") == []
+        assert "project/src/d.py" in _paths(scan_results.resources_for_attribution(MIT))
+
+    def test_indexes_are_invalidated_by_changing_children(self) -> None:
+        scan_results = _scan_results()
+        assert scan_results.resources_for_attribution(APACHE) != []
+        src = scan_results.resources_under("/project/src")[0]
+
+        src.children["d.py"] = Resource(
+            path=PurePath("project/src/d.py"), type=ResourceType.FILE
+        )
+        src.children["e.py"] = Resource(
+            path=PurePath("project/src/e.py"),
+            type=ResourceType.FILE,
+            attributions=[APACHE],
+        )
+
+        result = scan_results.resources_for_attribution(APACHE)
+        assert _paths(result) == ["project/src/e.py"]
+
+    def test_indexes_are_kept_on_modification_of_other_trees(self) -> None:
+        scan_results = _scan_results()
+        index = scan_results._get_index()
+
+        _scan_results().resources[0].add_resource(
+            Resource(path=PurePath("project/e.py"), type=ResourceType.FILE)
+        )
+
+        assert scan_results._get_index() is index
+
+    def test_indexes_do_not_affect_equality(self) -> None:
+        scan_results = _scan_results()
+        expected = deepcopy(scan_results)
+
+        scan_results.resources_under("/")
+
+        assert scan_results == expected
+
+
+class TestAttributionIds:
+    def test_mappers_are_kept(self) -> None:
+        scan_results = ScanResults(
+            metadata=metadata(),
+            resources=[],
+            attribution_to_id=ContentAttributionIds(),
+        )
+
+        assert isinstance(scan_results.attribution_to_id, ContentAttributionIds)
+        assert scan_results.attribution_to_id[MIT] == content_attribution_id(MIT)
+
+    def test_mappers_are_validated(self) -> None:
+        invalid_ids: dict[Any, Any] = {MIT: 1}
+
+        with pytest.raises(ValidationError):
+            ScanResults(
+                metadata=metadata(),
+                resources=[],
+                attribution_to_id=ContentAttributionIds(invalid_ids),
+            )
+
+
+class TestCompactIds:
+    def test_numbers_attributions_in_order_of_the_resources(self) -> None:
+        scan_results = _scan_results().model_copy(
+            update={"unassigned_attributions": [APACHE, UNASSIGNED]}
+        )
+
+        file_model = scan_results.to_opossum_file_model(compact_ids=True)
+
+        assert list(file_model.external_attributions) == ["0", "1", "2", "3"]
+        assert file_model.external_attributions["0"] == MIT.to_opossum_file_model()
+        assert file_model.external_attributions["3"] == (
+            UNASSIGNED.to_opossum_file_model()
+        )
+        assert file_model.resources_to_attributions == {
+            "/project/vendor/lib/a.py": ["0"],
+            "/project/vendor/lib/b.py": ["0", "1"],
+            "/project/vendor2/c.py": ["0"],
+            "/project/src/d.py": ["2"],
+        }
+
+    def test_ids_are_stable_and_keep_the_original_ids(self) -> None:
+        scan_results = _scan_results()
+        original_ids = scan_results.to_opossum_file_model().resources_to_attributions
+
+        first = scan_results.to_opossum_file_model(compact_ids=True)
+        second = scan_results.to_opossum_file_model(compact_ids=True)
+
+        assert first == second
+        assert (
+            scan_results.to_opossum_file_model().resources_to_attributions
+            == original_ids
+        )
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+
+from opossum_lib.core.services.generate_impl import generate_impl_async
+from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
+    OpossumFileReader,
+)
+from opossum_lib.input_formats.scancode.services.scancode_file_reader import (
+    ScancodeFileReader,
+)
+from opossum_lib.shared.constants import INPUT_JSON_NAME
+
+test_data_path = Path(__file__).resolve().parents[2] / "data"
+
+
+class TestAsyncApi:
+    @pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+    def test_runs_conversions_concurrently(
+        self,
+        tmp_path: Path,
+        executor_type: type[ThreadPoolExecutor] | type[ProcessPoolExecutor],
+    ) -> None:
+        output_files = [tmp_path / f"output_{index}.opossum" for index in range(3)]
+
+        async def convert_all() -> None:
+            with executor_type(max_workers=3) as executor:
+                await asyncio.gather(
+                    *(
+                        generate_impl_async(
+                            [
+                                ScancodeFileReader(
+                                    test_data_path / "scancode_input.json"
+                                )
+                            ],
+                            output_file,
+                            executor=executor,
+                        )
+                        for output_file in output_files
+                    )
+                )
+
+        asyncio.run(convert_all())
+
+        for output_file in output_files:
+            with ZipFile(output_file, "r") as zip_file:
+                assert zip_file.namelist() == [INPUT_JSON_NAME]
+
+    def test_read_async_returns_opossum(self) -> None:
+        reader = OpossumFileReader(test_data_path / "opossum_input.opossum")
+
+        result = asyncio.run(reader.read_async())
+
+        assert result == reader.read()
+
+    def test_errors_are_raised_instead_of_exiting(self, tmp_path: Path) -> None:
+        invalid_file = tmp_path / "invalid.json"
+        invalid_file.write_text("no json")
+        reader = ScancodeFileReader(invalid_file)
+
+        with pytest.raises(RuntimeError, match="exit code 1"):
+            asyncio.run(reader.read_async())
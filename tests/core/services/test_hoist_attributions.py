@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.core.services.hoist_attributions import hoist_attributions
+from tests.setup.sample_entities import APACHE, MIT, file_resource, metadata
+
+
+def _scan_results(
+    files: dict[str, list[OpossumPackage]],
+    attribution_breakpoints: list[str],
+) -> ScanResults:
+    root = Resource(path=PurePath("project"), type=ResourceType.FOLDER)
+    for path, attributions in files.items():
+        root.add_resource(file_resource(path, *attributions))
+    return ScanResults(
+        metadata=metadata(),
+        resources=[root],
+        attribution_breakpoints=attribution_breakpoints,
+    )
+
+
+def _resources_to_attributions(scan_results: ScanResults) -> dict[str, set[str]]:
+    result = {}
+    stack = list(scan_results.resources)
+    while stack:
+        resource = stack.pop()
+        if resource.attributions:
+            result["/" + str(resource.path)] = {
+                attribution.license_name or "" for attribution in resource.attributions
+            }
+        stack.extend(resource.children.values())
+    return result
+
+
+class TestHoistAttributions:
+    def test_hoists_shared_attributions_bottom_up(self) -> None:
+        scan_results = _scan_results(
+            {
+                "project/vendor/lib/a.py": [MIT, APACHE],
+                "project/vendor/lib/b.py": [APACHE, MIT],
+                "project/vendor/lib/sub/c.py": [MIT, APACHE],
+                "project/vendor/other.py": [MIT, APACHE],
+                "project/main.py": [MIT],
+            },
+            attribution_breakpoints=[],
+        )
+
+        removed_references = hoist_attributions(scan_results)
+
+        assert _resources_to_attributions(scan_results) == {
+            "/project/vendor": {"MIT", "Apache-2.0"},
+            "/project/main.py": {"MIT"},
+        }
+        assert removed_references == 6
+
+    def test_keeps_attributions_of_mixed_folders(self) -> None:
+        scan_results = _scan_results(
+            {"project/src/a.py": [MIT], "project/src/b.py": [APACHE]},
+            attribution_breakpoints=[],
+        )
+
+        assert hoist_attributions(scan_results) == 0
+        assert _resources_to_attributions(scan_results) == {
+            "/project/src/a.py": {"MIT"},
+            "/project/src/b.py": {"Apache-2.0"},
+        }
+
+    def test_respects_attribution_breakpoints(self) -> None:
+        scan_results = _scan_results(
+            {
+                "project/node_modules/lib/a.js": [MIT],
+                "project/node_modules/lib/b.js": [MIT],
+                "project/node_modules/other/c.js": [MIT],
+            },
+            attribution_breakpoints=["/project/node_modules/"],
+        )
+
+        removed_references = hoist_attributions(scan_results)
+
+        assert _resources_to_attributions(scan_results) == {
+            "/project/node_modules/lib": {"MIT"},
+            "/project/node_modules/other": {"MIT"},
+        }
+        assert removed_references == 1
+
+    def test_does_not_hoist_into_files_with_children(self) -> None:
+        archive = Resource(path=PurePath("pkg.jar"), type=ResourceType.FOLDER)
+        for name in ("a.class", "b.class"):
+            archive.add_resource(file_resource(f"pkg.jar/{name}", MIT))
+        scan_results = ScanResults(
+            metadata=metadata(),
+            resources=[archive],
+            files_with_children=["/pkg.jar/"],
+        )
+
+        assert hoist_attributions(scan_results) == 0
+        assert _resources_to_attributions(scan_results) == {
+            "/pkg.jar/a.class": {"MIT"},
+            "/pkg.jar/b.class": {"MIT"},
+        }
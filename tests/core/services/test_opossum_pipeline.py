@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from collections.abc import Generator, Iterator
+
+import pytest
+
+from opossum_lib.core.entities.opossum_stream import OpossumStream
+from opossum_lib.core.entities.resource import Resource
+from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.core.services.opossum_pipeline import (
+    READ_AHEAD_BATCH_SIZE,
+    hoist_stream_attributions,
+    read_ahead,
+    run_pipeline,
+)
+from tests.setup.sample_entities import file_resource, metadata, package
+
+MIT = package("MIT", attribution_confidence=90)
+WEAK = package("Apache-2.0", attribution_confidence=20)
+
+
+def _stream(resources: Iterator[Resource]) -> OpossumStream:
+    return OpossumStream(
+        scan_results=ScanResults(metadata=metadata(), resources=[]),
+        resources=resources,
+    )
+
+
+def _files(*paths: str) -> Iterator[Resource]:
+    for path in paths:
+        yield file_resource(path, MIT, WEAK)
+
+
+class TestRunPipeline:
+    def test_reads_ahead_and_hoists_lazily(self) -> None:
+        stream = run_pipeline(
+            _stream(_files("project/lib/a.py", "project/lib/b.py")),
+            [read_ahead(), hoist_stream_attributions],
+        )
+
+        resources = {str(resource.path): resource for resource in stream.resources}
+
+        assert list(resources) == [
+            "project",
+            "project/lib",
+            "project/lib/a.py",
+            "project/lib/b.py",
+        ]
+        assert resources["project"].attributions == [MIT, WEAK]
+        assert resources["project/lib/a.py"].attributions == []
+
+
+class TestReadAhead:
+    @pytest.mark.parametrize("number_of_files", [0, 1, 1000])
+    def test_keeps_the_order(self, number_of_files: int) -> None:
+        paths = [f"project/{index}.py" for index in range(number_of_files)]
+
+        stream = read_ahead(max_batches=2)(_stream(_files(*paths)))
+
+        assert [str(resource.path) for resource in stream.resources] == paths
+
+    def test_raises_errors_of_the_previous_stages(self) -> None:
+        def failing_resources() -> Iterator[Resource]:
+            yield from _files("project/a.py")
+            raise SystemExit(1)
+
+        stream = read_ahead()(_stream(failing_resources()))
+
+        with pytest.raises(SystemExit):
+            list(stream.resources)
+
+    def test_stops_the_producer_if_the_consumer_stops(self) -> None:
+        number_of_produced = 0
+
+        def endless_resources() -> Iterator[Resource]:
+            nonlocal number_of_produced
+            while True:
+                yield from _files(f"project/{number_of_produced}.py")
+                number_of_produced += 1
+
+        resources = read_ahead(max_batches=1)(_stream(endless_resources())).resources
+        next(resources)
+        assert isinstance(resources, Generator)
+        resources.close()
+
+        # the queue and the batch that was waiting for a free slot
+        assert number_of_produced <= 3 * READ_AHEAD_BATCH_SIZE
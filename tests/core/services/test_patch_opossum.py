@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.core.services.patch_opossum import patch_opossum
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    ManualAttributions,
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.services.load_output_file import load_output_file
+from tests.setup.sample_entities import (
+    file_resource,
+    metadata,
+    output_metadata,
+    package,
+)
+
+
+def _base_opossum() -> Opossum:
+    root = Resource(path=PurePath("project"), type=ResourceType.FOLDER)
+    root.add_resource(file_resource("project/a.py", package("MIT")))
+    root.add_resource(file_resource("project/b.py", package("Apache-2.0")))
+    root.add_resource(file_resource("project/sub/c.py", package("GPL-2.0")))
+    review_results = OpossumOutputFileModel(
+        metadata=output_metadata(),
+        manual_attributions={
+            "manual-a": ManualAttributions(package_name="a"),
+            "manual-b": ManualAttributions(package_name="b"),
+        },
+        resources_to_attributions={
+            "/project/a.py": ["manual-a"],
+            "/project/b.py": ["manual-b"],
+        },
+    )
+    return Opossum(
+        scan_results=ScanResults(
+            metadata=metadata(),
+            resources=[root],
+            attribution_to_id={package("GPL-2.0"): "gpl-id"},
+        ),
+        review_results=review_results,
+    )
+
+
+def _changes() -> ScanResults:
+    root = Resource(path=PurePath("project"), type=ResourceType.FOLDER)
+    root.add_resource(file_resource("project/a.py", package("BSD-3-Clause")))
+    root.add_resource(file_resource("project/new.py", package("MIT")))
+    return ScanResults(metadata=metadata(), resources=[root])
+
+
+class TestPatchOpossum:
+    def test_replaces_changed_and_adds_new_resources(self) -> None:
+        base = _base_opossum()
+        unchanged_subtree = base.scan_results.resources[0].children["sub"]
+
+        result = patch_opossum(base, _changes(), [])
+
+        root = result.scan_results.resources[0]
+        assert root.children["a.py"].attributions == [package("BSD-3-Clause")]
+        assert root.children["new.py"].attributions == [package("MIT")]
+        assert root.children["b.py"].attributions == [package("Apache-2.0")]
+        assert root.children["sub"] is unchanged_subtree
+
+    def test_removes_deleted_resources_and_their_review_results(self) -> None:
+        result = patch_opossum(_base_opossum(), None, ["/project/b.py", ""])
+
+        root = result.scan_results.resources[0]
+        assert set(root.children) == {"a.py", "sub"}
+        assert result.review_results is not None
+        review_results = load_output_file(result.review_results)
+        assert review_results.resources_to_attributions == {
+            "/project/a.py": ["manual-a"]
+        }
+        assert set(review_results.manual_attributions) == {"manual-a"}
+
+    def test_keeps_existing_attribution_ids(self) -> None:
+        result = patch_opossum(_base_opossum(), _changes(), ["project/b.py"])
+
+        input_file = result.to_opossum_file_model().input_file
+        assert input_file.resources_to_attributions["/project/sub/c.py"] == ["gpl-id"]
+        assert len(input_file.external_attributions) == 3
+
+    def test_drops_resolved_ids_of_removed_attributions(self) -> None:
+        base = _base_opossum()
+        assert isinstance(base.review_results, OpossumOutputFileModel)
+        base = Opossum(
+            scan_results=base.scan_results.model_copy(
+                update={
+                    "attribution_to_id": {
+                        package("MIT"): "mit-id",
+                        package("Apache-2.0"): "apache-id",
+                        package("GPL-2.0"): "gpl-id",
+                    }
+                }
+            ),
+            review_results=base.review_results.model_copy(
+                update={
+                    "resolved_external_attributions": [
+                        "mit-id",
+                        "apache-id",
+                        "gpl-id",
+                        "unknown-id",
+                    ]
+                }
+            ),
+        )
+
+        result = patch_opossum(base, _changes(), ["project/b.py"])
+
+        assert result.review_results is not None
+        review_results = load_output_file(result.review_results)
+        # MIT is still assigned to the new file
+        assert review_results.resolved_external_attributions == ["mit-id", "gpl-id"]
@@ -0,0 +1,140 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import json
+from pathlib import Path, PurePath
+
+from opossum_lib.core.entities.opossum import Opossum
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.scan_results import ScanResults
+from opossum_lib.core.services.shard_opossum import OpossumShard, shard_opossum
+from opossum_lib.core.services.write_opossum_shards import write_opossum_shards
+from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
+    OpossumFileReader,
+)
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    ManualAttributions,
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.services.load_output_file import load_output_file
+from tests.setup.sample_entities import (
+    APACHE,
+    MIT,
+    file_resource,
+    metadata,
+    output_metadata,
+)
+
+
+def _opossum() -> Opossum:
+    root = Resource(
+        path=PurePath("project"), type=ResourceType.FOLDER, attributions=[APACHE]
+    )
+    for path, attributions in [
+        ("project/a.py", [MIT]),
+        ("project/src/x.py", [MIT]),
+        ("project/src/y.py", [APACHE]),
+        ("project/vendor/lib/z.py", [MIT]),
+    ]:
+        root.add_resource(file_resource(path, *attributions))
+    review_results = OpossumOutputFileModel(
+        metadata=output_metadata(),
+        manual_attributions={
+            "manual-src": ManualAttributions(package_name="src"),
+            "manual-vendor": ManualAttributions(package_name="vendor"),
+        },
+        resources_to_attributions={
+            "/project/src/x.py": ["manual-src"],
+            "/project/vendor/": ["manual-vendor"],
+        },
+    )
+    return Opossum(
+        scan_results=ScanResults(metadata=metadata(), resources=[root]),
+        review_results=review_results,
+    )
+
+
+def _resources_to_attributions(shard: OpossumShard) -> dict[str, list[str]]:
+    return shard.opossum.scan_results.to_opossum_file_model().resources_to_attributions
+
+
+class TestShardOpossum:
+    def test_splits_by_top_level_directory(self) -> None:
+        shards = shard_opossum(_opossum())
+
+        assert [shard.paths for shard in shards] == [
+            [PurePath("project"), PurePath("project/a.py")],
+            [PurePath("project/src")],
+            [PurePath("project/vendor")],
+        ]
+        assert [set(_resources_to_attributions(shard)) for shard in shards] == [
+            {"/project", "/project/a.py"},
+            {"/project/src/x.py", "/project/src/y.py"},
+            {"/project/vendor/lib/z.py"},
+        ]
+        review_results = [shard.opossum.review_results for shard in shards]
+        assert [
+            set(load_output_file(r).manual_attributions)
+            for r in review_results
+            if r is not None
+        ] == [set(), {"manual-src"}, {"manual-vendor"}]
+
+    def test_attribution_ids_are_consistent_across_shards(self) -> None:
+        shards = shard_opossum(_opossum())
+
+        mit_ids = {
+            ids[0]
+            for shard in shards
+            for path, ids in _resources_to_attributions(shard).items()
+            if path.endswith(("a.py", "x.py", "z.py"))
+        }
+        assert len(mit_ids) == 1
+
+    def test_splits_by_node_count(self) -> None:
+        shards = shard_opossum(_opossum(), max_nodes=3)
+
+        assert all(shard.number_of_resources <= 3 for shard in shards)
+        assert sorted(
+            path for shard in shards for path in _resources_to_attributions(shard)
+        ) == sorted(
+            _opossum().to_opossum_file_model().input_file.resources_to_attributions
+        )
+
+
+class TestWriteOpossumShards:
+    def test_writes_shards_and_manifest(self, tmp_path: Path) -> None:
+        shards = shard_opossum(_opossum())
+
+        manifest_path = write_opossum_shards(shards, tmp_path / "output", workers=2)
+
+        assert manifest_path == tmp_path / "output.manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        assert [shard["fileName"] for shard in manifest["shards"]] == [
+            "output-001.opossum",
+            "output-002.opossum",
+            "output-003.opossum",
+        ]
+        assert manifest["shards"][1]["paths"] == ["/project/src"]
+        vendor = OpossumFileReader(tmp_path / "output-003.opossum").read()
+        assert vendor.scan_results.resources[0].children["vendor"] is not None
+
+    def test_removes_shards_of_previous_runs(self, tmp_path: Path) -> None:
+        for name in ["output-004.opossum", "output-1000.opossum"]:
+            (tmp_path / name).write_bytes(b"stale shard")
+        unrelated_paths = [
+            tmp_path / "output-old.opossum",
+            tmp_path / "other-004.opossum",
+        ]
+        for path in unrelated_paths:
+            path.write_bytes(b"unrelated")
+
+        write_opossum_shards(shard_opossum(_opossum()), tmp_path / "output")
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "other-004.opossum",
+            "output-001.opossum",
+            "output-002.opossum",
+            "output-003.opossum",
+            "output-old.opossum",
+            "output.manifest.json",
+        ]
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import Path, PurePath
+from zipfile import ZipFile
+
+import pytest
+
+from opossum_lib.core.entities.scan_results import ContentAttributionIds
+from opossum_lib.core.services.attribution_store import ROOT_NODE, AttributionStore
+from opossum_lib.core.services.stream_opossum_file import stream_opossum_file
+from opossum_lib.core.services.write_opossum_file import (
+    _read_content_hash,
+    write_opossum_file,
+)
+from tests.core.entities.generators.resource_provider import ResourceProvider
+from tests.setup.opossum_faker_setup import OpossumFaker
+
+
+class TestAttributionStore:
+    def test_keeps_data_in_memory_within_budget(self) -> None:
+        with AttributionStore(max_memory=1024) as store:
+            store.add_attribution("id-1", b"digest-1", '{"a":1}')
+            store.add_resource_attributions("/a", ["id-1"])
+
+            assert not store.is_spilled
+            assert store.get_attribution_id(b"digest-1") == "id-1"
+            assert store.get_attribution_id(b"digest-2") is None
+            assert list(store.attributions()) == [("id-1", '{"a":1}')]
+            assert list(store.resources_to_attributions()) == [("/a", ["id-1"])]
+
+    def test_spills_to_disk_and_keeps_order(self) -> None:
+        with AttributionStore(max_memory=64) as store:
+            for index in range(20):
+                digest = f"digest-{index}".encode()
+                store.add_attribution(f"id-{index}", digest, f'{{"a":{index}}}')
+                store.add_attribution(f"id-{index}", digest, "duplicate")
+                store.add_resource_attributions(f"/{index}", [f"id-{index}"])
+
+            assert store.is_spilled
+            assert store.attribution_count == 20
+            assert store.get_attribution_id(b"digest-3") == "id-3"
+            assert list(store.attributions()) == [
+                (f"id-{index}", f'{{"a":{index}}}') for index in range(20)
+            ]
+            assert list(store.resources_to_attributions()) == [
+                (f"/{index}", [f"id-{index}"]) for index in range(20)
+            ]
+
+    @pytest.mark.parametrize("max_memory", [0, 1024])
+    def test_builds_the_resource_tree(self, max_memory: int) -> None:
+        with AttributionStore(max_memory) as store:
+            store.add_resource(("a", "b", "file"), is_folder=False)
+            store.add_resource(("c",), is_folder=False)
+            store.add_resource(("a", "empty"), is_folder=True)
+            store.add_resource(("a",), is_folder=True)
+            store.add_resource(("c", "child"), is_folder=False)
+
+            def collect(node: int) -> dict[str, object]:
+                return {
+                    name: collect(child) if is_folder else 1
+                    for child, name, is_folder in store.resource_children(node)
+                }
+
+            assert store.is_spilled == (max_memory == 0)
+            assert collect(ROOT_NODE) == {
+                "a": {"b": {"file": 1}, "empty": {}},
+                "c": {"child": 1},
+            }
+
+
+class TestStreamOpossumFile:
+    @pytest.mark.parametrize("max_memory", [0, 1024**3])
+    @pytest.mark.parametrize("compact_ids", [False, True])
+    def test_streamed_file_has_same_content_as_written_file(
+        self,
+        tmp_path: Path,
+        opossum_faker: OpossumFaker,
+        max_memory: int,
+        compact_ids: bool,
+    ) -> None:
+        # streams identify resources by their path, so the root needs a name
+        resource_provider = ResourceProvider(opossum_faker)
+        scan_results = opossum_faker.scan_results(
+            resources=[resource_provider.resource_tree(root_path=PurePath("root"))]
+        )
+        # the stream does not keep new ids, so they need to be reproducible
+        opossum = opossum_faker.opossum(
+            scan_results=scan_results.model_copy(
+                update={"attribution_to_id": ContentAttributionIds()}
+            )
+        )
+        streamed_path = tmp_path / "streamed.opossum"
+        written_path = tmp_path / "written.opossum"
+
+        stream_opossum_file(
+            opossum, streamed_path, max_memory=max_memory, compact_ids=compact_ids
+        )
+        write_opossum_file(
+            opossum.to_opossum_file_model(compact_ids=compact_ids), written_path
+        )
+
+        with (
+            ZipFile(streamed_path, "r") as streamed,
+            ZipFile(written_path, "r") as written,
+        ):
+            assert streamed.namelist() == written.namelist()
+            for name in written.namelist():
+                assert streamed.read(name) == written.read(name)
+        assert _read_content_hash(streamed_path) == _read_content_hash(written_path)
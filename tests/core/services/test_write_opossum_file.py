@@ -1,19 +1,39 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
-
+import io
+import os
+import sys
 from pathlib import Path
+from typing import Any
 from zipfile import ZipFile
 
+import pytest
+
 from opossum_lib.core.services.write_opossum_file import write_opossum_file
 from opossum_lib.shared.constants import (
     INPUT_JSON_NAME,
     OUTPUT_JSON_NAME,
+    STANDARD_STREAM_PATH,
 )
 from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
+from opossum_lib.shared.services.zip_writer import ZipWriter
 from tests.setup.opossum_file_faker_setup import OpossumFileFaker
 
 
+class _PipeWriter(io.RawIOBase):
+    # like the standard output of a pipeline, which cannot seek
+    def __init__(self) -> None:
+        self.content = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.content += data
+        return len(data)
+
+
 class TestWriteOpossumFile:
     def test_only_input_information_available_writes_only_input_information(
         self, tmp_path: Path, opossum_file_faker: OpossumFileFaker
@@ -39,3 +59,86 @@ class TestWriteOpossumFile:
         with ZipFile(output_path, "r") as zip_file:
             assert INPUT_JSON_NAME in zip_file.namelist()
             assert OUTPUT_JSON_NAME in zip_file.namelist()
+
+    def test_parallel_writing_matches_sequential_writing(
+        self, tmp_path: Path, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        opossum_file_content = opossum_file_faker.opossum_file_content()
+        sequential_path = tmp_path / "sequential.opossum"
+        parallel_path = tmp_path / "parallel.opossum"
+
+        write_opossum_file(opossum_file_content, sequential_path)
+        write_opossum_file(opossum_file_content, parallel_path, workers=3)
+
+        with (
+            ZipFile(sequential_path, "r") as sequential,
+            ZipFile(parallel_path, "r") as parallel,
+        ):
+            assert parallel.testzip() is None
+            assert parallel.namelist() == sequential.namelist()
+            for name in sequential.namelist():
+                assert parallel.read(name) == sequential.read(name)
+
+    def test_skip_unchanged_does_not_rewrite_identical_file(
+        self, tmp_path: Path, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        opossum_file_content = opossum_file_faker.opossum_file_content()
+        output_path = tmp_path / "output.opossum"
+        write_opossum_file(opossum_file_content, output_path)
+        os.utime(output_path, ns=(0, 0))
+
+        write_opossum_file(opossum_file_content, output_path, skip_unchanged=True)
+
+        assert output_path.stat().st_mtime_ns == 0
+
+    def test_skip_unchanged_rewrites_changed_file(
+        self, tmp_path: Path, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        output_path = tmp_path / "output.opossum"
+        write_opossum_file(opossum_file_faker.opossum_file_content(), output_path)
+        os.utime(output_path, ns=(0, 0))
+
+        write_opossum_file(
+            opossum_file_faker.opossum_file_content(), output_path, skip_unchanged=True
+        )
+
+        assert output_path.stat().st_mtime_ns != 0
+
+    def test_failed_write_keeps_existing_file(
+        self,
+        tmp_path: Path,
+        opossum_file_faker: OpossumFileFaker,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        output_path = tmp_path / "output.opossum"
+        write_opossum_file(opossum_file_faker.opossum_file_content(), output_path)
+        existing_content = output_path.read_bytes()
+
+        def fail(*args: Any) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(ZipWriter, "write", fail)
+        with pytest.raises(OSError, match="disk full"):
+            write_opossum_file(
+                opossum_file_faker.opossum_file_content(), output_path, workers=2
+            )
+
+        assert output_path.read_bytes() == existing_content
+        assert list(tmp_path.iterdir()) == [output_path]
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_writes_to_non_seekable_standard_output(
+        self,
+        opossum_file_faker: OpossumFileFaker,
+        monkeypatch: pytest.MonkeyPatch,
+        workers: int,
+    ) -> None:
+        pipe = _PipeWriter()
+        monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(io.BufferedWriter(pipe)))
+        opossum_file_content = opossum_file_faker.opossum_file_content()
+
+        write_opossum_file(opossum_file_content, STANDARD_STREAM_PATH, workers=workers)
+
+        with ZipFile(io.BytesIO(pipe.content), "r") as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.namelist() == [INPUT_JSON_NAME, OUTPUT_JSON_NAME]
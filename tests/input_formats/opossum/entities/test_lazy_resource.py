@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import json
+import pickle
+from copy import deepcopy
+from pathlib import Path, PurePath
+from zipfile import ZipFile
+
+import pytest
+
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.input_formats.opossum.entities.lazy_resource import LazyResource
+from opossum_lib.input_formats.opossum.services.convert_to_opossum import (
+    convert_to_opossum,
+)
+from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
+    OpossumFileReader,
+)
+from opossum_lib.shared.constants import INPUT_JSON_NAME
+from tests.setup.opossum_file_faker_setup import OpossumFileFaker
+
+test_data_path = Path(__file__).resolve().parents[3] / "data"
+
+
+def _no_attributions(path: PurePath) -> list[OpossumPackage]:
+    return []
+
+
+def _lazy_resource() -> LazyResource:
+    return LazyResource.from_file_model(
+        PurePath("root"),
+        {"a": {"b.py": 1}, "c.py": 1},
+        _no_attributions,
+    )
+
+
+class TestLazyResource:
+    def test_children_are_loaded_on_access(self) -> None:
+        resource = _lazy_resource()
+        assert not resource.is_loaded
+
+        child = resource.children["a"]
+
+        assert not resource.is_loaded
+        assert resource.attributions == []
+        assert resource.is_loaded
+        assert isinstance(child, LazyResource)
+        assert not child.is_loaded
+        assert child.type == ResourceType.FOLDER
+        assert child.children["b.py"].type == ResourceType.FILE
+
+    def test_assigned_values_are_kept(self) -> None:
+        resource = _lazy_resource()
+        resource.children = {}
+
+        assert resource.children == {}
+        assert resource.attributions == []
+
+    def test_equals_eager_resource(self) -> None:
+        eager = Resource(path=PurePath("root"), type=ResourceType.FOLDER)
+        eager.add_resource(
+            Resource(path=PurePath("root/a/b.py"), type=ResourceType.FILE)
+        )
+        eager.add_resource(Resource(path=PurePath("root/c.py"), type=ResourceType.FILE))
+        eager.children["a"].type = ResourceType.FOLDER
+
+        assert eager == _lazy_resource()
+        assert _lazy_resource() == eager
+
+    def test_dump_loads_the_subtree(self) -> None:
+        resource = _lazy_resource()
+
+        dumped = resource.model_dump()
+
+        assert list(dumped["children"]["a"]["children"]) == ["b.py"]
+        assert Resource.model_validate(dumped) == resource
+
+    def test_copy_and_pickle_keep_the_content(self) -> None:
+        resource = _lazy_resource()
+
+        assert deepcopy(resource) == resource
+        assert pickle.loads(pickle.dumps(_lazy_resource())) == resource
+        assert pickle.loads(pickle.dumps(resource)) == resource
+
+    def test_invalid_nodes_are_only_reported_when_visited(self) -> None:
+        resource = LazyResource.from_file_model(
+            PurePath("root"), json.loads('{"a": {"b": "invalid"}}'), _no_attributions
+        )
+
+        child = resource.children["a"]
+
+        with pytest.raises(RuntimeError, match="Invalid resource at root/a/b"):
+            _ = child.children
+
+
+class TestLazyConversion:
+    def test_lazy_reading_equals_eager_reading(self) -> None:
+        path = test_data_path / "opossum_input_with_result.opossum"
+
+        lazy = OpossumFileReader(path, lazy=True).read()
+
+        assert lazy == OpossumFileReader(path).read()
+
+    def test_lazy_reading_only_validates_visited_resources(
+        self, tmp_path: Path
+    ) -> None:
+        with ZipFile(test_data_path / "opossum_input_with_result.opossum") as source:
+            input_json = json.loads(source.read(INPUT_JSON_NAME))
+        input_json["resources"]["unvisited"] = {"invalid": "resource"}
+        path = tmp_path / "invalid.opossum"
+        with ZipFile(path, "w") as zip_file:
+            zip_file.writestr(INPUT_JSON_NAME, json.dumps(input_json))
+
+        lazy = OpossumFileReader(path, lazy=True).read()
+
+        assert lazy.scan_results.resources
+        with pytest.raises(SystemExit):
+            OpossumFileReader(path).read()
+
+    def test_lazy_conversion_roundtrip(
+        self, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        opossum_file = opossum_file_faker.opossum_file_content()
+
+        eager = convert_to_opossum(opossum_file).to_opossum_file_model()
+        lazy = convert_to_opossum(opossum_file, lazy=True).to_opossum_file_model()
+
+        assert lazy.input_file.resources == eager.input_file.resources
+        assert (
+            lazy.input_file.resources_to_attributions
+            == eager.input_file.resources_to_attributions
+        )
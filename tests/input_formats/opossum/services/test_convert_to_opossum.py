@@ -1,14 +1,24 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+from typing import Any
+
 import pytest
 
+from opossum_lib.core.entities.ingest_filter import IngestFilter
+from opossum_lib.core.entities.resource import Resource, ResourceType
 from opossum_lib.input_formats.opossum.services.convert_to_opossum import (
+    _convert_package,
     convert_to_opossum,
 )
+from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
 from opossum_lib.shared.entities.opossum_input_file_model import (
+    MetadataModel,
+    OpossumInputFileModel,
     OpossumPackageIdentifierModel,
     OpossumPackageModel,
+    SourceInfoModel,
 )
 from tests.setup.opossum_file_faker_setup import OpossumFileFaker
 
@@ -36,6 +46,102 @@ class TestConvertToOpossum:
         with pytest.raises(RuntimeError, match=r".*attribution was duplicated.*"):
             convert_to_opossum(input_file)
 
+    def test_converts_deep_trees(self) -> None:
+        resources: dict[str, Any] = {}
+        node = resources
+        for _ in range(5_000):
+            node["folder"] = {}
+            node = node["folder"]
+        node["file"] = 1
+        input_file = OpossumInputFileModel(
+            metadata=MetadataModel(
+                project_id="id", file_creation_date="now", project_title="title"
+            ),
+            resources=resources,
+            external_attributions={},
+            resources_to_attributions={},
+        )
+
+        result = convert_to_opossum(OpossumFileModel(input_file=input_file))
+
+        assert result.scan_results.resources[0].path.parts == ("folder",)
+
+    def test_throws_on_invalid_resources_of_unvalidated_files(
+        self, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        # e.g. read with ValidationPolicy.TRUSTED
+        file_information = opossum_file_faker.opossum_file_information().model_copy(
+            update={
+                "resources": {"project": {"a.py": "not a file"}},
+                "resources_to_attributions": {},
+            }
+        )
+        input_file = opossum_file_faker.opossum_file_content(in_file=file_information)
+
+        with pytest.raises(RuntimeError, match="Invalid resource at project/a.py"):
+            convert_to_opossum(input_file)
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_drops_excluded_resources_and_attributions(self, lazy: bool) -> None:
+        mit = OpossumPackageModel(
+            source=SourceInfoModel(name="SC"),
+            license_name="MIT",
+            attribution_confidence=90,
+        )
+        weak = OpossumPackageModel(
+            source=SourceInfoModel(name="SC"),
+            license_name="Apache-2.0",
+            attribution_confidence=30,
+        )
+        gpl = OpossumPackageModel(
+            source=SourceInfoModel(name="SC"), license_name="GPL-3.0-only"
+        )
+        in_test = mit.model_copy(update={"comment": "test"})
+        input_file = OpossumInputFileModel(
+            metadata=MetadataModel(
+                project_id="id", file_creation_date="now", project_title="title"
+            ),
+            resources={
+                "project": {
+                    "src": {"main.py": 1, "test": {"test.py": 1}},
+                    "docs": {"index.md": 1},
+                    "README.md": 1,
+                }
+            },
+            external_attributions={"1": mit, "2": weak, "3": gpl, "4": in_test},
+            resources_to_attributions={
+                "/project/src/main.py": ["1", "2", "3"],
+                "/project/src/test/test.py": ["4"],
+            },
+        )
+        ingest_filter = IngestFilter(
+            include_paths=("project/src/**",),
+            exclude_paths=("**/test/**",),
+            min_score=50,
+            denied_licenses=("GPL-3.0-only",),
+        )
+
+        result = convert_to_opossum(
+            OpossumFileModel(input_file=input_file),
+            lazy=lazy,
+            ingest_filter=ingest_filter,
+        )
+
+        (project,) = result.scan_results.resources
+        folders = ["src"] if not lazy else ["src", "docs"]
+        assert list(project.children) == folders
+        assert project.children["src"].children == {
+            "main.py": Resource(
+                path=PurePath("project/src/main.py"),
+                type=ResourceType.FILE,
+                attributions=[_convert_package(mit)],
+            )
+        }
+        if lazy:
+            # folders that are not included are kept empty without loading
+            assert project.children["docs"].children == {}
+        assert result.scan_results.unassigned_attributions == []
+
     @staticmethod
     def _fake_duplicate_external_attributions(
         opossum_file_faker: OpossumFileFaker,
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import Path
+
+from opossum_lib.core.services.write_opossum_file import write_opossum_file
+from opossum_lib.input_formats.opossum.services.diff_opossum_files import (
+    diff_opossum_files,
+)
+from opossum_lib.shared.entities.opossum_diff_model import (
+    DiffChangeModel,
+    OpossumDiffEntryModel,
+)
+from opossum_lib.shared.entities.opossum_file_model import OpossumFileModel
+from opossum_lib.shared.entities.opossum_input_file_model import (
+    OpossumInputFileModel,
+    OpossumPackageModel,
+    ResourceInFileModel,
+)
+from tests.setup.sample_entities import APACHE_MODEL, MIT_MODEL, metadata_model
+
+
+def _write_opossum_file(
+    path: Path,
+    resources: ResourceInFileModel,
+    external_attributions: dict[str, OpossumPackageModel],
+    resources_to_attributions: dict[str, list[str]],
+) -> Path:
+    write_opossum_file(
+        OpossumFileModel(
+            input_file=OpossumInputFileModel(
+                metadata=metadata_model(),
+                resources=resources,
+                external_attributions=external_attributions,
+                resources_to_attributions=resources_to_attributions,
+            )
+        ),
+        path,
+    )
+    return path
+
+
+def _attribution_id(entries: list[OpossumDiffEntryModel], license_name: str) -> str:
+    return next(
+        entry.attribution_id
+        for entry in entries
+        if entry.attribution is not None
+        and entry.attribution["licenseName"] == license_name
+        and entry.attribution_id is not None
+    )
+
+
+class TestDiffOpossumFiles:
+    def test_identical_content_with_other_ids_has_no_changes(
+        self, tmp_path: Path
+    ) -> None:
+        resources: ResourceInFileModel = {"project": {"a.py": 1, "sub": {"b.py": 1}}}
+        old = _write_opossum_file(
+            tmp_path / "old.opossum",
+            resources,
+            {"1": MIT_MODEL, "2": APACHE_MODEL},
+            {"/project/a.py": ["1", "2"], "/project/sub/": ["2"]},
+        )
+        new = _write_opossum_file(
+            tmp_path / "new.opossum",
+            resources,
+            {"x": APACHE_MODEL, "y": MIT_MODEL},
+            {"/project/a.py": ["y", "x"], "/project/sub": ["x"]},
+        )
+
+        assert list(diff_opossum_files(old, new)) == []
+
+    def test_reports_changed_resources_and_attributions(self, tmp_path: Path) -> None:
+        old = _write_opossum_file(
+            tmp_path / "old.opossum",
+            {"project": {"a.py": 1, "removed.py": 1, "sub": {"b.py": 1}}},
+            {"1": MIT_MODEL},
+            {"/project/a.py": ["1"], "/project/removed.py": ["1"]},
+        )
+        new = _write_opossum_file(
+            tmp_path / "new.opossum",
+            {"project": {"a.py": 1, "added.py": 1, "sub": 1}},
+            {"1": APACHE_MODEL},
+            {"/project/a.py": ["1"]},
+        )
+
+        entries = list(diff_opossum_files(old, new))
+
+        mit = _attribution_id(entries, "MIT")
+        apache = _attribution_id(entries, "Apache-2.0")
+        assert [
+            (entry.change, entry.attribution_id) for entry in entries[:2]
+        ] == sorted(
+            [(DiffChangeModel.REMOVED, mit), (DiffChangeModel.ADDED, apache)],
+            key=lambda change: change[1],
+        )
+        assert entries[2:] == [
+            OpossumDiffEntryModel(
+                change=DiffChangeModel.CHANGED,
+                path="/project/a.py",
+                is_file=True,
+                added_attribution_ids=[apache],
+                removed_attribution_ids=[mit],
+            ),
+            OpossumDiffEntryModel(
+                change=DiffChangeModel.ADDED, path="/project/added.py", is_file=True
+            ),
+            OpossumDiffEntryModel(
+                change=DiffChangeModel.REMOVED,
+                path="/project/removed.py",
+                is_file=True,
+                removed_attribution_ids=[mit],
+            ),
+            OpossumDiffEntryModel(
+                change=DiffChangeModel.CHANGED, path="/project/sub", is_file=True
+            ),
+            OpossumDiffEntryModel(
+                change=DiffChangeModel.REMOVED, path="/project/sub/b.py", is_file=True
+            ),
+        ]
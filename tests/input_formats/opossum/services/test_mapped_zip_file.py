@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZIP_STORED, BadZipFile, ZipFile
+
+import pytest
+
+from opossum_lib.input_formats.opossum.services.mapped_zip_file import MappedZipFile
+
+
+class TestMappedZipFile:
+    @pytest.mark.parametrize("compression", [ZIP_STORED, ZIP_DEFLATED])
+    def test_reads_entries_like_zip_file(
+        self, tmp_path: Path, compression: int
+    ) -> None:
+        path = tmp_path / "archive.zip"
+        with ZipFile(path, "w", compression=compression) as zip_file:
+            zip_file.writestr("first.json", '{"some": "content"}' * 100)
+            zip_file.writestr("second.json", "")
+
+        with MappedZipFile(path) as mapped_zip_file, ZipFile(path) as zip_file:
+            assert mapped_zip_file.namelist() == zip_file.namelist()
+            for name in zip_file.namelist():
+                assert mapped_zip_file.read(name) == zip_file.read(name)
+
+    def test_detects_corrupted_entry(self, tmp_path: Path) -> None:
+        path = tmp_path / "archive.zip"
+        with ZipFile(path, "w", compression=ZIP_STORED) as zip_file:
+            zip_file.writestr("file.json", "some content")
+        content = path.read_bytes()
+        path.write_bytes(content.replace(b"some content", b"some CONTENT"))
+
+        with MappedZipFile(path) as mapped_zip_file, pytest.raises(BadZipFile):
+            mapped_zip_file.read("file.json")
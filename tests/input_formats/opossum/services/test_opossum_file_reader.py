@@ -3,34 +3,190 @@
 #  SPDX-License-Identifier: Apache-2.0
 #
 # SPDX-License-Identifier: Apache-2.0
+import json
 from pathlib import Path
+from zipfile import ZipFile
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 
+from opossum_lib.core.entities.ingest_filter import IngestFilter
+from opossum_lib.core.services.write_opossum_file import write_opossum_file
 from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
     OpossumFileReader,
 )
+from opossum_lib.shared.constants import INPUT_JSON_NAME, OUTPUT_JSON_NAME
+from opossum_lib.shared.entities.compressed_zip_entry import CompressedZipEntry
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.raw_opossum_output_file_model import (
+    RawOpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+from opossum_lib.shared.services.load_output_file import load_output_file
+from tests.setup.sample_entities import input_file_json
 
 TEST_DATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / "data"
 
 
 class TestOpossumFileReader:
-    def test_read_corrupted_file_exits_1(self, caplog: LogCaptureFixture) -> None:
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_read_corrupted_file_exits_1(
+        self, caplog: LogCaptureFixture, use_mmap: bool
+    ) -> None:
         input_path = TEST_DATA_DIR / "opossum_input_corrupt.opossum"
-        opossum_format_reader = OpossumFileReader(input_path)
+        opossum_format_reader = OpossumFileReader(input_path, use_mmap=use_mmap)
 
         with pytest.raises(SystemExit) as system_exit:
             opossum_format_reader.read()
         assert system_exit.value.code == 1
         assert "is corrupt and does not contain 'input.json'" in caplog.messages[0]
 
-    def test_read_with_output_json(self) -> None:
+    def test_read_invalid_file_logs_the_error(
+        self,
+        tmp_path: Path,
+        caplog: LogCaptureFixture,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        input_path = tmp_path / "invalid.opossum"
+        with ZipFile(input_path, "w") as zip_file:
+            zip_file.writestr(INPUT_JSON_NAME, json.dumps({"resources": {}}))
+
+        with pytest.raises(SystemExit) as system_exit:
+            OpossumFileReader(input_path).read()
+
+        assert system_exit.value.code == 1
+        assert caplog.messages[0].startswith(f"Error reading file {input_path}:")
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_read_with_output_json(self, use_mmap: bool) -> None:
         input_path = TEST_DATA_DIR / "opossum_input_with_result.opossum"
-        opossum_format_reader = OpossumFileReader(input_path)
+        opossum_format_reader = OpossumFileReader(input_path, use_mmap=use_mmap)
 
         result = opossum_format_reader.read()
 
         assert result is not None
         assert result.scan_results is not None
         assert result.review_results is not None
+
+    def test_read_with_mmap_matches_regular_read(self) -> None:
+        input_path = TEST_DATA_DIR / "opossum_input_with_result.opossum"
+
+        result = OpossumFileReader(input_path, use_mmap=True).read()
+
+        assert result == OpossumFileReader(input_path).read()
+
+    @pytest.mark.parametrize(
+        "ingest_filter",
+        [
+            None,
+            IngestFilter(
+                include_paths=("**/*.ts",),
+                exclude_paths=("**/__tests__/**",),
+                min_score=50,
+            ),
+        ],
+    )
+    def test_stream_matches_regular_read(
+        self, ingest_filter: IngestFilter | None
+    ) -> None:
+        input_path = TEST_DATA_DIR / "opossum_input_with_result.opossum"
+        reader = OpossumFileReader(input_path, ingest_filter=ingest_filter)
+
+        result = reader.stream().collect()
+
+        assert result == reader.read()
+
+    @pytest.mark.parametrize("method", ["read", "stream"])
+    def test_read_invalid_resources_exits_1(
+        self, tmp_path: Path, caplog: LogCaptureFixture, method: str
+    ) -> None:
+        input_path = tmp_path / "invalid.opossum"
+        with ZipFile(input_path, "w") as zip_file:
+            zip_file.writestr(
+                INPUT_JSON_NAME,
+                json.dumps(input_file_json({"project": {"a.py": "not a file"}})),
+            )
+        reader = OpossumFileReader(input_path)
+
+        with pytest.raises(SystemExit) as system_exit:
+            if method == "read":
+                reader.read()
+            else:
+                reader.stream().collect()
+
+        assert system_exit.value.code == 1
+        assert caplog.messages == [
+            f"Error reading file {input_path}: Invalid resource at project/a.py"
+        ]
+
+
+class TestRawReviewResults:
+    input_path = TEST_DATA_DIR / "opossum_input_with_result.opossum"
+
+    def test_review_results_are_parsed_when_loaded(self) -> None:
+        review_results = (
+            OpossumFileReader(self.input_path, validation=ValidationPolicy.TRUSTED)
+            .read()
+            .review_results
+        )
+
+        assert isinstance(review_results, RawOpossumOutputFileModel)
+        assert isinstance(review_results.content, CompressedZipEntry)
+        with ZipFile(self.input_path) as zip_file:
+            expected = OpossumOutputFileModel.model_validate_json(
+                zip_file.read(OUTPUT_JSON_NAME)
+            )
+        assert load_output_file(review_results) == expected
+
+    def test_review_results_are_parsed_once(self) -> None:
+        review_results = OpossumFileReader(self.input_path).read().review_results
+        assert isinstance(review_results, RawOpossumOutputFileModel)
+
+        loaded = load_output_file(review_results)
+
+        # parsed and validated while reading
+        assert review_results._loaded.peek(None) is loaded
+        assert load_output_file(review_results) is loaded
+        assert review_results == review_results.model_copy()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_unchanged_review_results_are_copied(
+        self, tmp_path: Path, workers: int, use_mmap: bool
+    ) -> None:
+        opossum = OpossumFileReader(
+            self.input_path, use_mmap=use_mmap, validation=ValidationPolicy.TRUSTED
+        ).read()
+        output_path = tmp_path / "output.opossum"
+
+        write_opossum_file(
+            opossum.to_opossum_file_model(), output_path, workers=workers
+        )
+
+        assert isinstance(opossum.review_results, RawOpossumOutputFileModel)
+        with ZipFile(self.input_path) as input_file, ZipFile(output_path) as output:
+            assert output.testzip() is None
+            assert output.read(OUTPUT_JSON_NAME) == input_file.read(OUTPUT_JSON_NAME)
+
+    def test_modified_review_results_are_serialized(self, tmp_path: Path) -> None:
+        opossum = OpossumFileReader(self.input_path).read()
+        assert opossum.review_results is not None
+        review_results = load_output_file(opossum.review_results).model_copy(
+            update={"resolved_external_attributions": ["some-id"]}
+        )
+        output_path = tmp_path / "output.opossum"
+
+        write_opossum_file(
+            opossum.model_copy(
+                update={"review_results": review_results}
+            ).to_opossum_file_model(),
+            output_path,
+        )
+
+        assert type(review_results) is OpossumOutputFileModel
+        result = OpossumFileReader(output_path).read().review_results
+        assert result is not None
+        assert load_output_file(result) == review_results
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import Path
+
+import pytest
+
+from opossum_lib.core.services.write_opossum_file import write_opossum_file
+from opossum_lib.input_formats.opossum.services.opossum_file_reader import (
+    OpossumFileReader,
+)
+from opossum_lib.input_formats.opossum.services.opossum_index_reader import (
+    read_opossum_index,
+)
+from tests.setup.opossum_file_faker_setup import OpossumFileFaker
+
+
+class TestReadOpossumIndex:
+    def test_index_matches_input_json(
+        self, tmp_path: Path, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        opossum_file_content = opossum_file_faker.opossum_file_content()
+        input_file = opossum_file_content.input_file
+        output_path = tmp_path / "output.opossum"
+
+        write_opossum_file(opossum_file_content, output_path, with_index=True)
+
+        with read_opossum_index(output_path) as index:
+            for path, ids in input_file.resources_to_attributions.items():
+                assert list(index.attributions_for_path(path)) == list(
+                    dict.fromkeys(ids)
+                )
+            assert index.licenses() == sorted(
+                {
+                    attribution.license_name
+                    for attribution in input_file.external_attributions.values()
+                    if attribution.license_name is not None
+                }
+            )
+        # the additional entry does not affect reading the file
+        assert OpossumFileReader(output_path).read() is not None
+
+    def test_missing_index_exits(
+        self, tmp_path: Path, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        output_path = tmp_path / "output.opossum"
+        write_opossum_file(opossum_file_faker.opossum_file_content(), output_path)
+
+        with pytest.raises(SystemExit):
+            read_opossum_index(output_path)
@@ -1,12 +1,13 @@
 # SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
 #
 # SPDX-License-Identifier: Apache-2.0
-
+from typing import Any
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 
-from opossum_lib.core.entities.resource import Resource
+from opossum_lib.core.entities.ingest_filter import IngestFilter
+from opossum_lib.core.entities.resource import Resource, ResourceType
 from opossum_lib.input_formats.scancode.services.convert_to_opossum import (
     convert_to_opossum,
 )
@@ -86,3 +87,166 @@ class TestConvertToOpossumFull:
             len(f.license_detections) for f in scancode_data.files
         )
         assert num_attributions == num_license_detections
+
+    def test_repeated_conversion_gives_the_same_ids(
+        self, scancode_faker: ScanCodeFaker
+    ) -> None:
+        scancode_data = scancode_faker.scancode_data()
+
+        first = convert_to_opossum(scancode_data).to_opossum_file_model()
+        second = convert_to_opossum(scancode_data).to_opossum_file_model()
+
+        assert first == second
+
+    def test_different_scans_get_different_project_ids(
+        self, scancode_faker: ScanCodeFaker
+    ) -> None:
+        first = convert_to_opossum(scancode_faker.scancode_data())
+        second = convert_to_opossum(scancode_faker.scancode_data())
+
+        assert (
+            first.scan_results.metadata.project_id
+            != second.scan_results.metadata.project_id
+        )
+
+
+class TestConvertToOpossumParallel:
+    @pytest.mark.parametrize("workers", [2, 3])
+    def test_parallel_conversion_matches_sequential_conversion(
+        self, scancode_faker: ScanCodeFaker, workers: int
+    ) -> None:
+        scancode_data = scancode_faker.scancode_data()
+
+        sequential = convert_to_opossum(scancode_data)
+        parallel = convert_to_opossum(scancode_data, workers=workers)
+
+        assert parallel.scan_results.resources == sequential.scan_results.resources
+
+
+class TestConvertToOpossumDeduplicated:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_deduplicated_conversion_matches_regular_conversion(
+        self, scancode_faker: ScanCodeFaker, workers: int
+    ) -> None:
+        library = scancode_faker.single_file(path="library.py")
+        copies = [
+            library.model_copy(update={"path": f"vendor/copy_{index}/library.py"})
+            for index in range(5)
+        ]
+        other_file = scancode_faker.single_file(path="vendor/other.py")
+        scancode_data = scancode_faker.scancode_data(
+            files=[library, *copies[:3], other_file, *copies[3:]]
+        )
+
+        regular = convert_to_opossum(scancode_data)
+        deduplicated = convert_to_opossum(
+            scancode_data, workers=workers, deduplicate=True
+        )
+
+        assert deduplicated.scan_results.resources == regular.scan_results.resources
+
+    def test_copies_share_their_packages(self, scancode_faker: ScanCodeFaker) -> None:
+        library = scancode_faker.single_file(path="a/library.py")
+        copy = library.model_copy(update={"path": "b/library.py"})
+        scancode_data = scancode_faker.scancode_data(files=[library, copy])
+
+        opossum = convert_to_opossum(scancode_data, deduplicate=True)
+
+        folder_a, folder_b = opossum.scan_results.resources
+        attributions_a = folder_a.children["library.py"].attributions
+        attributions_b = folder_b.children["library.py"].attributions
+        assert attributions_a == attributions_b
+        assert attributions_a is not attributions_b
+        assert all(
+            package_a is package_b
+            for package_a, package_b in zip(attributions_a, attributions_b, strict=True)
+        )
+
+    def test_files_with_different_license_detections_are_not_merged(
+        self, scancode_faker: ScanCodeFaker
+    ) -> None:
+        library = scancode_faker.single_file(path="library.py")
+        modified = library.model_copy(
+            update={"path": "modified.py", "license_detections": []}
+        )
+        scancode_data = scancode_faker.scancode_data(files=[library, modified])
+
+        opossum = convert_to_opossum(scancode_data, deduplicate=True)
+
+        resources = {str(r.path): r for r in opossum.scan_results.resources}
+        assert resources["modified.py"].attributions == []
+        assert len(resources["library.py"].attributions) == len(
+            library.license_detections
+        )
+
+
+class TestConvertToOpossumFiltered:
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("deduplicate", [False, True])
+    def test_drops_excluded_files_and_attributions(
+        self, scancode_faker: ScanCodeFaker, workers: int, deduplicate: bool
+    ) -> None:
+        def license_detection(license_name: str, score: float) -> Any:
+            return scancode_faker.license_detection(
+                license_expression_spdx=license_name,
+                matches=[scancode_faker.match(from_file="", score=score)],
+            )
+
+        scancode_data = scancode_faker.scancode_data(
+            files=[
+                scancode_faker.single_file(
+                    path="project/src/main.py",
+                    license_detections=[
+                        license_detection("MIT", 90),
+                        license_detection("Apache-2.0", 30),
+                        license_detection("GPL-3.0-only", 100),
+                    ],
+                ),
+                scancode_faker.single_file(path="project/src/test/test.py"),
+                scancode_faker.single_file(path="project/README.md"),
+            ]
+        )
+        ingest_filter = IngestFilter(
+            include_paths=("project/src/**",),
+            exclude_paths=("**/test/**",),
+            min_score=50,
+            denied_licenses=("GPL-3.0-only",),
+        )
+
+        opossum = convert_to_opossum(
+            scancode_data,
+            workers=workers,
+            deduplicate=deduplicate,
+            ingest_filter=ingest_filter,
+        )
+
+        (project,) = opossum.scan_results.resources
+        assert list(project.children) == ["src"]
+        (main,) = project.children["src"].children.values()
+        assert [package.license_name for package in main.attributions] == ["MIT"]
+
+    @pytest.mark.parametrize("folders_first", [False, True])
+    def test_keeps_the_type_of_folders_of_included_files(
+        self, scancode_faker: ScanCodeFaker, folders_first: bool
+    ) -> None:
+        folders = [
+            scancode_faker.single_folder(path="project"),
+            scancode_faker.single_folder(path="project/src"),
+            scancode_faker.single_folder(path="project/docs"),
+        ]
+        files = [
+            scancode_faker.single_file(path="project/src/main.py"),
+            scancode_faker.single_file(path="project/docs/index.md"),
+        ]
+        scancode_data = scancode_faker.scancode_data(
+            files=folders + files if folders_first else files + folders
+        )
+        ingest_filter = IngestFilter(include_paths=("**/*.py",))
+
+        opossum = convert_to_opossum(scancode_data, ingest_filter=ingest_filter)
+
+        (project,) = opossum.scan_results.resources
+        assert project.type == ResourceType.FOLDER
+        assert list(project.children) == ["src"]
+        assert project.children["src"].type == ResourceType.FOLDER
+        assert list(project.children["src"].children) == ["main.py"]
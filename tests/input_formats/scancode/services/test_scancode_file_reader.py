@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import bz2
+import gzip
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from opossum_lib.input_formats.scancode.services.scancode_file_reader import (
+    ScancodeFileReader,
+)
+
+test_data_path = Path(__file__).resolve().parents[3] / "data"
+
+
+class TestCompressedInput:
+    @pytest.mark.parametrize(
+        "input_file_name", ["scancode_input.json", "scancode_input.jsonl"]
+    )
+    @pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+    def test_reads_compressed_files_like_uncompressed_ones(
+        self,
+        tmp_path: Path,
+        input_file_name: str,
+        compress: Callable[[bytes], bytes],
+    ) -> None:
+        input_path = test_data_path / input_file_name
+        compressed_path = tmp_path / f"{input_file_name}.compressed"
+        compressed_path.write_bytes(compress(input_path.read_bytes()))
+
+        result = ScancodeFileReader(compressed_path).read()
+
+        expected = ScancodeFileReader(input_path).read()
+        assert result.scan_results.resources == expected.scan_results.resources
+
+    def test_exits_on_corrupt_compressed_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "scancode.json.gz"
+        path.write_bytes(gzip.compress(b'{"files": []}')[:-8])
+
+        with pytest.raises(SystemExit):
+            ScancodeFileReader(path).read()
+
+
+class TestStream:
+    @pytest.mark.parametrize(
+        "input_file_name", ["scancode_input.json", "scancode_input.jsonl"]
+    )
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_streams_the_resources_that_are_read(
+        self, input_file_name: str, workers: int
+    ) -> None:
+        reader = ScancodeFileReader(test_data_path / input_file_name, workers=workers)
+
+        result = reader.stream().collect()
+
+        expected = reader.read()
+        assert result.scan_results.resources == expected.scan_results.resources
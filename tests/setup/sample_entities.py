@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from pathlib import PurePath
+from typing import Any
+
+from opossum_lib.core.entities.metadata import Metadata
+from opossum_lib.core.entities.opossum_package import OpossumPackage
+from opossum_lib.core.entities.resource import Resource, ResourceType
+from opossum_lib.core.entities.source_info import SourceInfo
+from opossum_lib.shared.entities.opossum_input_file_model import (
+    MetadataModel,
+    OpossumPackageModel,
+    SourceInfoModel,
+)
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    Metadata as OutputMetadata,
+)
+
+# Entities with fixed content for tests that check exact results, unlike the
+# random entities of the fakers. Entities created with the same arguments
+# are equal.
+
+SOURCE_NAME = "SC"
+
+
+def package(license_name: str, **fields: Any) -> OpossumPackage:
+    return OpossumPackage(
+        source=SourceInfo(name=SOURCE_NAME), license_name=license_name, **fields
+    )
+
+
+MIT = package("MIT")
+APACHE = package("Apache-2.0")
+
+
+def metadata() -> Metadata:
+    return Metadata(project_id="id", file_creation_date="now", project_title="title")
+
+
+def file_resource(path: str, *attributions: OpossumPackage) -> Resource:
+    return Resource(
+        path=PurePath(path), type=ResourceType.FILE, attributions=list(attributions)
+    )
+
+
+def output_metadata() -> OutputMetadata:
+    return OutputMetadata(project_id="id", file_creation_date="now")
+
+
+def package_model(license_name: str, **fields: Any) -> OpossumPackageModel:
+    return OpossumPackageModel(
+        source=SourceInfoModel(name=SOURCE_NAME), license_name=license_name, **fields
+    )
+
+
+MIT_MODEL = package_model("MIT")
+APACHE_MODEL = package_model("Apache-2.0")
+
+
+def metadata_model() -> MetadataModel:
+    return MetadataModel(
+        project_id="id", file_creation_date="now", project_title="title"
+    )
+
+
+def input_file_json(resources: Any) -> dict[str, Any]:
+    # an input.json as read from a file, without attributions
+    return {
+        "metadata": metadata_model().model_dump(by_alias=True, exclude_none=True),
+        "resources": resources,
+        "externalAttributions": {},
+        "resourcesToAttributions": {},
+    }
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from opossum_lib.shared.entities.opossum_input_file_model import (
+    OpossumInputFileModel,
+    validate_resource_tree,
+)
+from tests.setup.sample_entities import input_file_json
+
+DEPTH = 10_000
+
+
+def _deep_tree() -> dict[str, Any]:
+    tree: dict[str, Any] = {}
+    node = tree
+    for _ in range(DEPTH):
+        node["folder"] = {}
+        node = node["folder"]
+    node["file"] = 1
+    return tree
+
+
+class TestValidateResourceTree:
+    def test_returns_valid_tree_unchanged(self) -> None:
+        resources = {"project": {"a.py": 1, "sub": {}}}
+
+        assert validate_resource_tree(resources) is resources
+
+    def test_validates_deep_trees(self) -> None:
+        model = OpossumInputFileModel.model_validate(input_file_json(_deep_tree()))
+
+        assert isinstance(model.resources, dict)
+
+    @pytest.mark.parametrize(
+        ("resources", "message"),
+        [
+            ({"project": {"a.py": "1"}}, "Invalid resource /project/a.py"),
+            ({"project": {"a.py": True}}, "Invalid resource /project/a.py"),
+            ({"project": [1]}, "Invalid resource /project"),
+            ({1: 1}, "Invalid resource name 1 in /"),
+        ],
+    )
+    def test_rejects_invalid_nodes(self, resources: Any, message: str) -> None:
+        with pytest.raises(ValidationError, match=message):
+            OpossumInputFileModel.model_validate(input_file_json(resources))
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+from _pytest.logging import LogCaptureFixture
+
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    ManualAttributions,
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.services.compact_attribution_ids import (
+    compact_attribution_id,
+    compact_output_file_ids,
+)
+from tests.setup.sample_entities import output_metadata
+
+
+@pytest.mark.parametrize(
+    ("number", "expected"),
+    [(0, "0"), (9, "9"), (10, "a"), (35, "z"), (36, "10"), (36**4 - 1, "zzzz")],
+)
+def test_compact_attribution_id(number: int, expected: str) -> None:
+    assert compact_attribution_id(number) == expected
+
+
+class TestCompactOutputFileIds:
+    def test_rewrites_all_references(self) -> None:
+        output_file = OpossumOutputFileModel(
+            metadata=output_metadata(),
+            manual_attributions={
+                "manual-1": ManualAttributions(package_name="first"),
+                "manual-2": ManualAttributions(package_name="second"),
+            },
+            resources_to_attributions={
+                "/a": ["manual-2", "manual-1"],
+                "/b": ["manual-2", "missing"],
+            },
+            resolved_external_attributions=["external-2", "missing"],
+        )
+
+        result = compact_output_file_ids(
+            output_file,
+            {"external-1": "0", "external-2": "1"},
+            first_manual_number=2,
+        )
+
+        assert result.manual_attributions == {
+            "2": ManualAttributions(package_name="first"),
+            "3": ManualAttributions(package_name="second"),
+        }
+        assert result.resources_to_attributions == {"/a": ["3", "2"], "/b": ["3"]}
+        assert result.resolved_external_attributions == ["1"]
+        assert result.metadata == output_file.metadata
+
+    def test_drops_unknown_fields_and_the_input_file_checksum(
+        self, caplog: LogCaptureFixture
+    ) -> None:
+        output_file = OpossumOutputFileModel.model_validate(
+            {
+                "metadata": {
+                    **output_metadata().model_dump(by_alias=True, exclude_none=True),
+                    "inputFileMd5Checksum": "checksum",
+                },
+                "manualAttributions": {"manual-1": {"packageName": "first"}},
+                "resourcesToAttributions": {"/a": ["manual-1"]},
+                "linkedAttributionIds": {"manual-1": ["external-1"]},
+            }
+        )
+
+        result = compact_output_file_ids(
+            output_file, {"external-1": "0"}, first_manual_number=1
+        )
+
+        assert result.model_extra == {}
+        assert "linkedAttributionIds" in caplog.text
+        assert result.metadata == output_metadata()
+        assert result.resources_to_attributions == {"/a": ["1"]}
@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from opossum_lib.shared.services.compressed_zip_entry import (
+    compress_zip_entry,
+    deflate_zip_entry,
+    read_compressed_zip_entry,
+)
+from opossum_lib.shared.services.zip_writer import ZipWriter
+
+
+class TestCompressedZipEntry:
+    @pytest.mark.parametrize("content", [b"", b"short", b"some content\n" * 1000])
+    def test_entries_compressed_in_blocks_can_be_read(
+        self, tmp_path: Path, content: bytes
+    ) -> None:
+        path = tmp_path / "archive.zip"
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            entry = compress_zip_entry(content, 5, executor, block_size=100)
+        with open(path, "wb") as file, ZipWriter(file) as zip_writer:
+            zip_writer.write("first.json", entry)
+            zip_writer.write("second.json", deflate_zip_entry(b"regular entry", 5))
+
+        with ZipFile(path, "r") as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.read("first.json") == content
+            assert zip_file.read("second.json") == b"regular entry"
+
+    def test_read_entries_can_be_copied(self, tmp_path: Path) -> None:
+        content = b"some content\n" * 1000
+        with ZipFile(tmp_path / "source.zip", "w") as zip_file:
+            zip_file.writestr("deflated.json", content, compress_type=ZIP_DEFLATED)
+            zip_file.writestr("stored.json", content, compress_type=ZIP_STORED)
+
+        with (
+            open(tmp_path / "source.zip", "rb") as source,
+            ZipFile(source, "r") as zip_file,
+        ):
+            entry = read_compressed_zip_entry(source, zip_file.getinfo("deflated.json"))
+            stored_info = zip_file.getinfo("stored.json")
+            assert read_compressed_zip_entry(source, stored_info) is None
+        assert entry is not None
+        assert entry.decompress() == content
+        with open(tmp_path / "copy.zip", "wb") as file, ZipWriter(file) as zip_writer:
+            zip_writer.write("copy.json", entry)
+
+        with ZipFile(tmp_path / "copy.zip", "r") as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.read("copy.json") == content
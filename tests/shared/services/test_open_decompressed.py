@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import bz2
+import gzip
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from opossum_lib.shared.services.open_decompressed import (
+    DECOMPRESSION_ERRORS,
+    open_decompressed,
+)
+
+CONTENT = '{"headers": []}\n{"files": []}\n'
+
+
+class TestOpenDecompressed:
+    @pytest.mark.parametrize(
+        "compress", [gzip.compress, bz2.compress, lzma.compress, bytes]
+    )
+    def test_detects_compression_by_content(
+        self, tmp_path: Path, compress: Callable[[bytes], bytes]
+    ) -> None:
+        path = tmp_path / "scan.json"
+        path.write_bytes(compress(CONTENT.encode()))
+
+        with open_decompressed(path) as input_file:
+            assert input_file.readline() == '{"headers": []}\n'
+            assert input_file.read() == '{"files": []}\n'
+
+    @pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+    def test_corrupt_data_raises_decompression_error(
+        self, tmp_path: Path, compress: Callable[[bytes], bytes]
+    ) -> None:
+        compressed = compress(CONTENT.encode() * 100)
+        path = tmp_path / "scan.json"
+        path.write_bytes(compressed[:10] + b"\0" * 32 + compressed[42:])
+
+        with (
+            pytest.raises(DECOMPRESSION_ERRORS),
+            open_decompressed(path) as input_file,
+        ):
+            input_file.read()
+
+    @pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+    def test_truncated_data_raises_decompression_error(
+        self, tmp_path: Path, compress: Callable[[bytes], bytes]
+    ) -> None:
+        path = tmp_path / "scan.json"
+        path.write_bytes(compress(CONTENT.encode())[:-8])
+
+        with (
+            pytest.raises(DECOMPRESSION_ERRORS),
+            open_decompressed(path) as input_file,
+        ):
+            input_file.read()
+
+    def test_reads_all_bzip2_streams(self, tmp_path: Path) -> None:
+        path = tmp_path / "scan.json.bz2"
+        path.write_bytes(bz2.compress(b"first\n") + bz2.compress(b"second\n"))
+
+        with open_decompressed(path) as input_file:
+            assert input_file.read() == "first\nsecond\n"
+
+    def test_ignores_trailing_data_after_bzip2_streams(self, tmp_path: Path) -> None:
+        path = tmp_path / "scan.json.bz2"
+        path.write_bytes(bz2.compress(CONTENT.encode()) + b"\0" * 32)
+
+        with open_decompressed(path) as input_file:
+            assert input_file.read() == CONTENT
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+
+from opossum_lib.shared.entities.opossum_input_file_model import OpossumInputFileModel
+from opossum_lib.shared.services.opossum_index import OpossumIndex, build_opossum_index
+from tests.setup.sample_entities import APACHE_MODEL, MIT_MODEL, metadata_model
+
+
+def _input_file() -> OpossumInputFileModel:
+    return OpossumInputFileModel(
+        metadata=metadata_model(),
+        resources={"project": {"a.py": 1, "sub": {"b.py": 1}}},
+        external_attributions={"mit": MIT_MODEL, "apache": APACHE_MODEL},
+        resources_to_attributions={
+            "/project/a.py": ["mit", "apache"],
+            "/project/sub/": ["apache"],
+        },
+    )
+
+
+class TestOpossumIndex:
+    def test_answers_queries_from_index(self) -> None:
+        with OpossumIndex(build_opossum_index(_input_file())) as index:
+            assert index.attributions_for_path("/project/a.py") == {
+                "mit": MIT_MODEL,
+                "apache": APACHE_MODEL,
+            }
+            assert index.attributions_for_path("/project/sub/") == {
+                "apache": APACHE_MODEL
+            }
+            assert index.attributions_for_path("/unknown") == {}
+            assert index.licenses() == ["Apache-2.0", "MIT"]
+            assert index.paths_with_license("Apache-2.0") == [
+                "/project/a.py",
+                "/project/sub",
+            ]
+            assert index.is_file("/project/sub/b.py") is True
+            assert index.is_file("/project/sub/") is False
+            assert index.is_file("/unknown") is None
+
+    def test_rejects_unknown_schema_version(self) -> None:
+        index = OpossumIndex(build_opossum_index(_input_file()))
+        index._database.execute("PRAGMA user_version = 99")
+        content = index._database.serialize()
+        index.close()
+
+        with pytest.raises(ValueError, match="schema version 99"):
+            OpossumIndex(content)
@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+from pydantic import ValidationError
+
+from opossum_lib.shared.entities.opossum_input_file_model import OpossumInputFileModel
+from opossum_lib.shared.entities.opossum_output_file_model import (
+    OpossumOutputFileModel,
+)
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+from opossum_lib.shared.services.validate_model import validate_model
+from tests.setup.opossum_file_faker_setup import OpossumFileFaker
+
+INPUT_RECORD_FIELDS = ("resources", "resources_to_attributions")
+OUTPUT_RECORD_FIELDS = ("resources_to_attributions",)
+
+
+class TestValidateModel:
+    @pytest.mark.parametrize("validation", list(ValidationPolicy))
+    @pytest.mark.parametrize("sample_percentage", [0, 50, 100])
+    def test_opossum_data_matches_full_validation(
+        self,
+        opossum_file_faker: OpossumFileFaker,
+        validation: ValidationPolicy,
+        sample_percentage: float,
+    ) -> None:
+        opossum_file = opossum_file_faker.opossum_file_content()
+        input_data = opossum_file.input_file.model_dump(mode="json", by_alias=True)
+        assert opossum_file.output_file is not None
+        output_data = opossum_file.output_file.model_dump(mode="json", by_alias=True)
+
+        input_file = validate_model(
+            OpossumInputFileModel,
+            input_data,
+            validation,
+            sample_percentage,
+            INPUT_RECORD_FIELDS,
+        )
+        output_file = validate_model(
+            OpossumOutputFileModel,
+            output_data,
+            validation,
+            sample_percentage,
+            OUTPUT_RECORD_FIELDS,
+        )
+
+        assert input_file == OpossumInputFileModel.model_validate(input_data)
+        assert output_file == OpossumOutputFileModel.model_validate(output_data)
+        assert (
+            output_file.model_dump_json() == opossum_file.output_file.model_dump_json()
+        )
+
+    def test_sample_of_100_percent_detects_invalid_records(
+        self, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        input_file = opossum_file_faker.opossum_file_content().input_file
+        data = input_file.model_dump(mode="json", by_alias=True)
+        data["resourcesToAttributions"]["/invalid"] = "not a list"
+
+        with pytest.raises(ValidationError):
+            validate_model(
+                OpossumInputFileModel,
+                data,
+                ValidationPolicy.SAMPLE,
+                100,
+                INPUT_RECORD_FIELDS,
+            )
+
+    @pytest.mark.parametrize("validation", list(ValidationPolicy))
+    def test_fields_outside_of_records_are_validated(
+        self, opossum_file_faker: OpossumFileFaker, validation: ValidationPolicy
+    ) -> None:
+        input_file = opossum_file_faker.opossum_file_content().input_file
+        data = input_file.model_dump(mode="json", by_alias=True)
+        data["metadata"] = "invalid"
+
+        with pytest.raises(ValidationError):
+            validate_model(
+                OpossumInputFileModel, data, validation, 0, INPUT_RECORD_FIELDS
+            )
+
+    @pytest.mark.parametrize("validation", list(ValidationPolicy))
+    def test_data_that_is_not_a_mapping_is_rejected(
+        self, validation: ValidationPolicy
+    ) -> None:
+        with pytest.raises(ValidationError):
+            validate_model(
+                OpossumInputFileModel, [], validation, 50, INPUT_RECORD_FIELDS
+            )
+
+    def test_trusted_skips_validation_of_records(
+        self, opossum_file_faker: OpossumFileFaker
+    ) -> None:
+        input_file = opossum_file_faker.opossum_file_content().input_file
+        data = input_file.model_dump(mode="json", by_alias=True)
+        data["resourcesToAttributions"]["/invalid"] = "not a list"
+
+        result = validate_model(
+            OpossumInputFileModel,
+            data,
+            ValidationPolicy.TRUSTED,
+            record_fields=INPUT_RECORD_FIELDS,
+        )
+
+        assert result.resources_to_attributions["/invalid"] == "not a list"
+
+    def test_sample_is_reproducible(self, opossum_file_faker: OpossumFileFaker) -> None:
+        input_file = opossum_file_faker.opossum_file_content().input_file
+        data = input_file.model_dump(mode="json", by_alias=True)
+        data["resourcesToAttributions"] = {f"/file{index}": [] for index in range(100)}
+        data["resourcesToAttributions"]["/file50"] = "not a list"
+
+        def is_rejected() -> bool:
+            try:
+                validate_model(
+                    OpossumInputFileModel,
+                    data,
+                    ValidationPolicy.SAMPLE,
+                    50,
+                    INPUT_RECORD_FIELDS,
+                )
+            except ValidationError:
+                return True
+            return False
+
+        assert len({is_rejected() for _ in range(5)}) == 1
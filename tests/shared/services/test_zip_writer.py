@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import io
+import struct
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import pytest
+
+from opossum_lib.shared.services.compressed_zip_entry import deflate_zip_entry
+from opossum_lib.shared.services.zip_writer import (
+    COUNT_PLACEHOLDER,
+    ZIP64_EXTRA_FIELD_ID,
+    ZIP64_VERSION,
+    ZipWriter,
+)
+
+
+class TestZipWriter:
+    def test_written_archive_can_be_read(self) -> None:
+        file = io.BytesIO()
+        streamed_content = b"streamed content\n" * 10000
+
+        with ZipWriter(file) as zip_writer:
+            zip_writer.write("first.json", deflate_zip_entry(b"first", 5))
+            with zip_writer.open("streamed.json", 5) as entry:
+                for line in streamed_content.splitlines(keepends=True):
+                    entry.write(line)
+            zip_writer.write("dä.json", deflate_zip_entry(b"", 5))
+            zip_writer.comment = b"some comment"
+
+        with ZipFile(file, "r") as zip_file:
+            assert zip_file.testzip() is None
+            assert zip_file.namelist() == ["first.json", "streamed.json", "dä.json"]
+            assert zip_file.read("first.json") == b"first"
+            assert zip_file.read("streamed.json") == streamed_content
+            assert zip_file.read("dä.json") == b""
+            assert zip_file.getinfo("streamed.json").compress_type == ZIP_DEFLATED
+            assert zip_file.comment == b"some comment"
+
+    def test_many_entries_are_written_with_zip64_records(self) -> None:
+        file = io.BytesIO()
+        entry = deflate_zip_entry(b"content", 5)
+
+        with ZipWriter(file) as zip_writer:
+            for index in range(COUNT_PLACEHOLDER + 1):
+                zip_writer.write(f"{index}.json", entry)
+
+        with ZipFile(file, "r") as zip_file:
+            assert len(zip_file.infolist()) == COUNT_PLACEHOLDER + 1
+            assert zip_file.read(f"{COUNT_PLACEHOLDER}.json") == b"content"
+
+    def test_headers_of_streamed_entries_match(self) -> None:
+        file = io.BytesIO()
+
+        with (
+            ZipWriter(file) as zip_writer,
+            zip_writer.open("streamed.json", 5) as entry,
+        ):
+            entry.write(b"streamed content")
+
+        with ZipFile(file, "r") as zip_file:
+            info = zip_file.getinfo("streamed.json")
+            assert zip_file.read(info) == b"streamed content"
+        # the version needed to extract and the length of the extra field
+        (local_version,) = struct.unpack_from("<H", file.getvalue(), 4)
+        (local_extra_length,) = struct.unpack_from("<H", file.getvalue(), 28)
+        assert info.extract_version == local_version == ZIP64_VERSION
+        assert struct.unpack_from("<HH", info.extra) == (ZIP64_EXTRA_FIELD_ID, 16)
+        assert len(info.extra) == local_extra_length
+
+    def test_entries_cannot_be_written_while_streaming(self) -> None:
+        with ZipWriter(io.BytesIO()) as zip_writer:
+            entry = zip_writer.open("streamed.json", 5)
+            with pytest.raises(ValueError, match="another one is open"):
+                zip_writer.write("other.json", deflate_zip_entry(b"", 5))
+            entry.close()
@@ -3,17 +3,22 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import gzip
+import io
 import json
 from pathlib import Path
 from typing import Any
 from zipfile import ZipFile
 
+import click
 import pytest
 from _pytest.logging import LogCaptureFixture
 from click.testing import CliRunner, Result
 
-from opossum_lib.cli import generate
+from opossum_lib.cli import compact_ids, diff, generate, patch, submit
+from opossum_lib.core.entities.ingest_filter import IngestFilter
 from opossum_lib.core.services.write_opossum_file import write_opossum_file
+from opossum_lib.daemon import GenerateJob, JobResult
 from opossum_lib.shared.constants import (
     INPUT_JSON_NAME,
     OUTPUT_JSON_NAME,
@@ -52,8 +57,17 @@ class TestConvertOpossumFiles:
         # in case of errors
         _assert_expected_file_equals_generated_file(expected_opossum_dict, opossum_dict)
 
+    @pytest.mark.parametrize(
+        "options",
+        [
+            [],
+            ["--max-memory", "1K"],
+            ["--validation", "sample"],
+            ["--validation", "trusted"],
+        ],
+    )
     def test_successful_conversion_of_input_and_output_opossum_file(
-        self, tmp_path: Path
+        self, tmp_path: Path, options: list[str]
     ) -> None:
         output_file = str(tmp_path / "output_opossum.opossum")
         result = run_with_command_line_arguments(
@@ -62,6 +76,7 @@ class TestConvertOpossumFiles:
                 str(test_data_path / "opossum_input_with_result.opossum"),
                 "-o",
                 output_file,
+                *options,
             ],
         )
 
@@ -86,14 +101,23 @@ class TestConvertOpossumFiles:
 
 
 class TestConvertScancodeFiles:
-    def test_successful_conversion_of_scancode_file(self, tmp_path: Path) -> None:
+    @pytest.mark.parametrize(
+        "input_file_name", ["scancode_input.json", "scancode_input.jsonl"]
+    )
+    @pytest.mark.parametrize(
+        "options", [[], ["--max-memory", "1K"], ["--max-memory", "1K", "-w", "2"]]
+    )
+    def test_successful_conversion_of_scancode_file(
+        self, tmp_path: Path, input_file_name: str, options: list[str]
+    ) -> None:
         output_file = str(tmp_path / "output_scancode.opossum")
         result = run_with_command_line_arguments(
             [
                 "--scan-code-json",
-                str(test_data_path / "scancode_input.json"),
+                str(test_data_path / input_file_name),
                 "-o",
                 output_file,
+                *options,
             ],
         )
 
@@ -125,6 +149,27 @@ class TestConvertScancodeFiles:
         assert resources_inlined == expected_resources_inlined
         _assert_expected_file_equals_generated_file(expected_opossum_dict, opossum_dict)
 
+    @pytest.mark.parametrize("validation", ["sample", "trusted"])
+    def test_partial_validation_of_scancode_file_fails(
+        self, tmp_path: Path, validation: str, caplog: LogCaptureFixture
+    ) -> None:
+        result = run_with_command_line_arguments(
+            [
+                "--scan-code-json",
+                str(test_data_path / "scancode_input.json"),
+                "-o",
+                str(tmp_path / "output_scancode.opossum"),
+                "--validation",
+                validation,
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert caplog.messages == [
+            "ScanCode files can only be read with --validation full!"
+        ]
+        assert list(tmp_path.iterdir()) == []
+
     @staticmethod
     def _inline_attributions_into_resources(
         *, resources_with_ids: dict[str, list[str]], all_attributions: dict[str, Any]
@@ -173,6 +218,272 @@ def _assert_expected_file_equals_generated_file(
         assert opossum_dict.get(field, None) == expected_opossum_dict.get(field, None)
 
 
+class TestIngestFilter:
+    @pytest.mark.parametrize(
+        "input_option", ["--scan-code-json", "--opossum"], ids=["scancode", "opossum"]
+    )
+    def test_filters_resources_and_attributions(
+        self, tmp_path: Path, input_option: str
+    ) -> None:
+        input_file = str(tmp_path / "input.opossum")
+        run_with_command_line_arguments(
+            [
+                "--scan-code-json",
+                str(test_data_path / "scancode_input.json"),
+                "-o",
+                input_file,
+            ]
+        )
+        input_path = (
+            input_file
+            if input_option == "--opossum"
+            else str(test_data_path / "scancode_input.json")
+        )
+        output_file = str(tmp_path / "output.opossum")
+
+        result = run_with_command_line_arguments(
+            [
+                input_option,
+                input_path,
+                "-o",
+                output_file,
+                "--include",
+                "src/**",
+                "--exclude",
+                "**/__tests__/**",
+                "--allow-license",
+                "Apache-2.0",
+                "--min-score",
+                "90",
+            ]
+        )
+
+        assert result.exit_code == 0
+        opossum_dict = _read_input_json_from_opossum(output_file)
+        assert list(opossum_dict["resources"]) == ["src"]
+        assert "__tests__" not in opossum_dict["resources"]["src"]["e2e-tests"]
+        assert opossum_dict["resourcesToAttributions"]
+        assert {
+            (attribution["licenseName"], attribution["attributionConfidence"])
+            for attribution in opossum_dict["externalAttributions"].values()
+        } == {("Apache-2.0", 100)}
+
+
+class TestStandardStreams:
+    def test_converts_opossum_file_from_standard_input_to_standard_output(
+        self, tmp_path: Path
+    ) -> None:
+        input_path = test_data_path / "opossum_input_with_result.opossum"
+
+        result = CliRunner().invoke(
+            generate, ["--opossum", "-", "-o", "-"], input=input_path.read_bytes()
+        )
+
+        assert result.exit_code == 0
+        output_file = tmp_path / "output.opossum"
+        output_file.write_bytes(result.stdout_bytes)
+        TestConvertOpossumFiles._assert_input_json_matches_expectations(
+            str(output_file)
+        )
+        TestConvertOpossumFiles._assert_output_json_matches_expectations(
+            str(output_file)
+        )
+
+    @pytest.mark.parametrize(
+        "input_file_name", ["scancode_input.json", "scancode_input.jsonl"]
+    )
+    def test_converts_compressed_scancode_file_from_standard_input(
+        self, tmp_path: Path, input_file_name: str
+    ) -> None:
+        input_path = test_data_path / input_file_name
+        expected_file = str(tmp_path / "expected.opossum")
+        run_with_command_line_arguments(
+            ["--scan-code-json", str(input_path), "-o", expected_file]
+        )
+
+        result = CliRunner().invoke(
+            generate,
+            ["--scan-code-json", "-", "-o", "-"],
+            input=gzip.compress(input_path.read_bytes()),
+        )
+
+        assert result.exit_code == 0
+        with ZipFile(io.BytesIO(result.stdout_bytes), "r") as zip_file:
+            opossum_dict = json.loads(zip_file.read(INPUT_JSON_NAME))
+        assert (
+            opossum_dict["resources"]
+            == (_read_input_json_from_opossum(expected_file)["resources"])
+        )
+
+    def test_sharding_to_standard_output_fails(self, caplog: LogCaptureFixture) -> None:
+        result = run_with_command_line_arguments(
+            ["--opossum", str(test_data_path / "opossum_input.opossum"), "-o", "-"]
+            + ["--shard"]
+        )
+
+        assert result.exit_code == 1
+        assert caplog.messages == [
+            "--skip-unchanged and sharding cannot be combined with writing to "
+            "standard output!"
+        ]
+
+
+class TestCompactIds:
+    @pytest.mark.parametrize(
+        ("command", "options"),
+        [
+            (compact_ids, []),
+            (generate, ["--compact-ids"]),
+            (generate, ["--compact-ids", "--max-memory", "1K"]),
+        ],
+    )
+    def test_renumbers_attributions_consistently(
+        self, tmp_path: Path, command: click.Command, options: list[str]
+    ) -> None:
+        input_path = str(test_data_path / "opossum_input_with_result.opossum")
+        original_file = str(tmp_path / "original.opossum")
+        output_file = str(tmp_path / "compact.opossum")
+        run_with_command_line_arguments(["--opossum", input_path, "-o", original_file])
+
+        result = CliRunner().invoke(
+            command, ["--opossum", input_path, "-o", output_file, *options]
+        )
+
+        assert result.exit_code == 0
+        original_input = _read_input_json_from_opossum(original_file)
+        original_output = _read_output_json_from_opossum(original_file)
+        compact_input = _read_input_json_from_opossum(output_file)
+        compact_output = _read_output_json_from_opossum(output_file)
+        external_ids = set(compact_input["externalAttributions"])
+        manual_ids = set(compact_output["manualAttributions"])
+        assert all(len(id) == 1 for id in external_ids | manual_ids)
+        assert external_ids.isdisjoint(manual_ids)
+        assert TestCompactIds._inline(compact_input, "externalAttributions") == (
+            TestCompactIds._inline(original_input, "externalAttributions")
+        )
+        assert TestCompactIds._inline(compact_output, "manualAttributions") == (
+            TestCompactIds._inline(original_output, "manualAttributions")
+        )
+
+    @staticmethod
+    def _inline(file: dict[str, Any], attributions_key: str) -> dict[str, Any]:
+        return {
+            path: [file[attributions_key][id] for id in ids]
+            for path, ids in file["resourcesToAttributions"].items()
+        }
+
+
+class TestPatch:
+    def test_overwrites_the_input_by_default(self, tmp_path: Path) -> None:
+        opossum_file = tmp_path / "input.opossum"
+        opossum_file.write_bytes(
+            (test_data_path / "opossum_input.opossum").read_bytes()
+        )
+        deleted_paths = tmp_path / "deleted.txt"
+        deleted_paths.write_text("/Frontend/\n")
+
+        result = CliRunner().invoke(
+            patch,
+            ["--opossum", str(opossum_file), "--deleted-paths", str(deleted_paths)],
+        )
+
+        assert result.exit_code == 0
+        assert sorted(tmp_path.iterdir()) == [deleted_paths, opossum_file]
+        resources = _read_input_json_from_opossum(str(opossum_file))["resources"]
+        assert "ElectronBackend" in resources
+        assert "Frontend" not in resources
+
+
+class TestDiff:
+    def test_diff_of_identical_scan_results_is_empty(self) -> None:
+        result = CliRunner().invoke(
+            diff,
+            [
+                "--old",
+                str(test_data_path / "opossum_input.opossum"),
+                "--new",
+                str(test_data_path / "opossum_input.opossum"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.output == ""
+
+    def test_diff_writes_json_lines(self, tmp_path: Path) -> None:
+        scancode_file = tmp_path / "scancode.opossum"
+        run_with_command_line_arguments(
+            [
+                "--scan-code-json",
+                str(test_data_path / "scancode_input.json"),
+                "-o",
+                str(scancode_file),
+            ]
+        )
+
+        result = CliRunner().invoke(
+            diff,
+            [
+                "--old",
+                str(test_data_path / "opossum_input.opossum"),
+                "--new",
+                str(scancode_file),
+            ],
+        )
+
+        assert result.exit_code == 0
+        entries = [json.loads(line) for line in result.output.splitlines()]
+        assert entries
+        assert {entry["change"] for entry in entries} <= {
+            "added",
+            "removed",
+            "changed",
+        }
+
+
+class TestSubmit:
+    def test_submits_the_options_of_generate(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        socket_path = tmp_path / "opossum.sock"
+        socket_path.touch()
+        submitted: list[GenerateJob] = []
+
+        def submit_impl(path: Path, job: GenerateJob) -> JobResult:
+            submitted.append(job)
+            return JobResult(id=job.id, outfile="output.manifest.json")
+
+        monkeypatch.setattr("opossum_lib.cli.submit_impl", submit_impl)
+        result = CliRunner().invoke(
+            submit,
+            [
+                "--socket",
+                str(socket_path),
+                "--scan-code-json",
+                str(test_data_path / "scancode_input.json"),
+                "--shard-max-nodes",
+                "10",
+                "--deduplicate",
+                "--hoist-attributions",
+                "--compact-ids",
+                "--exclude",
+                "**/test/**",
+                "--min-score",
+                "50",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert result.output == "output.manifest.json\n"
+        (job,) = submitted
+        assert job.shard_max_nodes == 10
+        assert job.deduplicate
+        assert job.hoist
+        assert job.compact_ids
+        assert job.ingest_filter == IngestFilter(
+            exclude_paths=("**/test/**",), min_score=50
+        )
+
+
 class TestCliValidations:
     @staticmethod
     def generate_valid_scan_code_argument(
@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: TNG Technology Consulting GmbH <https://www.tngtech.com>
+#
+# SPDX-License-Identifier: Apache-2.0
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+
+from opossum_lib.daemon import (
+    GenerateJob,
+    JobResult,
+    _ResultWriter,
+    _serve_socket,
+    _serve_stdin,
+    _serve_stream,
+    run_job,
+    submit,
+)
+from opossum_lib.shared.constants import INPUT_JSON_NAME
+from opossum_lib.shared.entities.validation_policy import ValidationPolicy
+
+test_data_path = Path(__file__).resolve().parent / "data"
+
+
+class TestServe:
+    def test_stream_jobs_are_converted(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        jobs = [
+            {
+                "id": index,
+                "scancode_json_files": [str(test_data_path / "scancode_input.json")],
+                "outfile": str(tmp_path / f"output_{index}"),
+            }
+            for index in range(3)
+        ]
+        lines = [json.dumps(job) for job in jobs] + ["", '{"unknown": 1}']
+
+        async def serve_lines() -> None:
+            reader = asyncio.StreamReader()
+            reader.feed_data("\n".join(lines).encode() + b"\n")
+            reader.feed_eof()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                await _serve_stream(reader, _ResultWriter(), executor)
+
+        asyncio.run(serve_lines())
+
+        output = capsys.readouterr().out.splitlines()
+        results = [JobResult.model_validate_json(line) for line in output]
+        assert sorted(result.id for result in results if result.id is not None) == [
+            0,
+            1,
+            2,
+        ]
+        assert sum(result.error is not None for result in results) == 1
+        for index in range(3):
+            with ZipFile(tmp_path / f"output_{index}.opossum", "r") as zip_file:
+                assert zip_file.namelist() == [INPUT_JSON_NAME]
+
+    def test_jobs_are_read_from_a_file_on_standard_input(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        job = {
+            "id": "from-file",
+            "scancode_json_files": [str(test_data_path / "scancode_input.json")],
+            "outfile": str(tmp_path / "output"),
+        }
+        jobs_path = tmp_path / "jobs.jsonl"
+        jobs_path.write_text(json.dumps(job) + "\n")
+
+        with open(jobs_path) as jobs_file, ThreadPoolExecutor(1) as executor:
+            monkeypatch.setattr(sys, "stdin", jobs_file)
+            asyncio.run(_serve_stdin(executor))
+
+        result = JobResult.model_validate_json(capsys.readouterr().out)
+        assert result.id == "from-file"
+        assert result.error is None
+        assert (tmp_path / "output.opossum").exists()
+
+    def test_submit_to_socket(self, tmp_path: Path) -> None:
+        socket_path = tmp_path / "opossum.sock"
+        job = GenerateJob(
+            id="job",
+            opossum_files=[str(test_data_path / "opossum_input.opossum")],
+            outfile=str(tmp_path / "output"),
+        )
+        invalid_job = GenerateJob(id="invalid", outfile=str(tmp_path / "invalid"))
+
+        async def serve_and_submit() -> list[JobResult]:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                server = asyncio.create_task(_serve_socket(socket_path, executor))
+                while not socket_path.exists():
+                    await asyncio.sleep(0.01)
+                results = [
+                    await asyncio.to_thread(submit, socket_path, job),
+                    await asyncio.to_thread(submit, socket_path, invalid_job),
+                ]
+                server.cancel()
+                return results
+
+        result, invalid_result = asyncio.run(serve_and_submit())
+
+        assert result == JobResult(id="job", outfile=str(tmp_path / "output.opossum"))
+        assert invalid_result.id == "invalid"
+        assert invalid_result.error is not None
+        assert not socket_path.exists()
+
+
+class TestRunJob:
+    def test_rejects_options_that_generate_rejects(self, tmp_path: Path) -> None:
+        job = GenerateJob(
+            id="job",
+            scancode_json_files=[str(test_data_path / "scancode_input.json")],
+            outfile=str(tmp_path / "output"),
+            max_memory=1024,
+            shard=True,
+        )
+
+        result = run_job(job)
+
+        assert result.outfile is None
+        assert result.error is not None
+        assert "--max-memory" in result.error
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rejects_partial_validation_of_scancode_files(self, tmp_path: Path) -> None:
+        job = GenerateJob(
+            id="job",
+            scancode_json_files=[str(test_data_path / "scancode_input.json")],
+            outfile=str(tmp_path / "output"),
+            validation=ValidationPolicy.SAMPLE,
+        )
+
+        result = run_job(job)
+
+        assert result == JobResult(
+            id="job", error="ScanCode files can only be read with --validation full!"
+        )
+        assert list(tmp_path.iterdir()) == []
+
+    def test_returns_the_manifest_of_sharded_output(self, tmp_path: Path) -> None:
+        job = GenerateJob(
+            id="job",
+            opossum_files=[str(test_data_path / "opossum_input.opossum")],
+            outfile=str(tmp_path / "output"),
+            shard=True,
+        )
+
+        result = run_job(job)
+
+        assert result == JobResult(
+            id="job", outfile=str(tmp_path / "output.manifest.json")
+        )
+        assert (tmp_path / "output.manifest.json").exists()